@@ -1,8 +1,16 @@
-import React from "react";
+import React, { Suspense, lazy, useEffect } from "react";
 import { Routes, Route, Navigate } from "react-router-dom";
-import K99R00Slides from "./grants/k99r00-slide-deck";
-import NSFCareerSlides from "./grants/nsf-career-slide-deck";
-import McKnightScholarsSlides from "./grants/mcknight-scholars-slide-deck";
+
+// Each deck is its own chunk, loaded by its route; the dashboard preloads the selected one with the page
+const decks = {
+  "k99r00": () => import("./grants/k99r00-slide-deck"),
+  "nsf-career": () => import("./grants/nsf-career-slide-deck"),
+  "mcknight-scholars": () => import("./grants/mcknight-scholars-slide-deck"),
+};
+
+const K99R00Slides = lazy(decks["k99r00"]);
+const NSFCareerSlides = lazy(decks["nsf-career"]);
+const McKnightScholarsSlides = lazy(decks["mcknight-scholars"]);
 
 function Home() {
   return (
@@ -14,13 +22,22 @@ function Home() {
 }
 
 export default function App() {
+  // Once the current deck is shown, fetch the others while idle so switching decks needs no download
+  useEffect(() => {
+    const prefetch = () => Object.values(decks).forEach((load) => load());
+    const idle = window.requestIdleCallback ?? ((callback: () => void) => window.setTimeout(callback, 200));
+    idle(prefetch);
+  }, []);
+
   return (
-    <Routes>
-      <Route path="/" element={<Home />} />
-      <Route path="/k99r00" element={<K99R00Slides />} />
-      <Route path="/nsf-career" element={<NSFCareerSlides />} />
-      <Route path="/mcknight-scholars" element={<McKnightScholarsSlides />} />
-      <Route path="*" element={<Navigate to="/" replace />} />
-    </Routes>
+    <Suspense fallback={null}>
+      <Routes>
+        <Route path="/" element={<Home />} />
+        <Route path="/k99r00" element={<K99R00Slides />} />
+        <Route path="/nsf-career" element={<NSFCareerSlides />} />
+        <Route path="/mcknight-scholars" element={<McKnightScholarsSlides />} />
+        <Route path="*" element={<Navigate to="/" replace />} />
+      </Routes>
+    </Suspense>
   );
 }
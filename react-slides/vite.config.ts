@@ -6,4 +6,8 @@ export default defineConfig({
   server: {
     port: 3000,
   },
+  build: {
+    // dist/.vite/manifest.json maps each deck to its hashed chunk, so the dashboard can preload it
+    manifest: true,
+  },
 });
@@ -0,0 +1,84 @@
+"""
+Micro-benchmark the vectorized attention map builder against the original nested loops
+
+Usage:
+    python scripts/benchmarks/bench_attention_map.py [--repeats 3] [--legacy-max-cells 2000000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Make the dashboard's utils package importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+
+from utils.attention import build_attention_map
+
+
+def generate_attention_data_legacy(channels, seconds, sample_rate=250):
+    """Double-loop generator as originally written in src/app.py"""
+    time_bins = int(seconds / 0.2)
+    attention_data = np.zeros((len(channels), time_bins))
+
+    f3_idx = channels.index('F3') if 'F3' in channels else 0
+    f4_idx = channels.index('F4') if 'F4' in channels else 1
+
+    high_attn_start = int(15 / 0.2)
+    high_attn_end = int(20 / 0.2)
+    attention_data[f3_idx, high_attn_start:high_attn_end] = np.random.uniform(0.7, 0.9, high_attn_end-high_attn_start)
+    attention_data[f4_idx, high_attn_start:high_attn_end] = np.random.uniform(0.3, 0.5, high_attn_end-high_attn_start)
+
+    for i in range(len(channels)):
+        for j in range(time_bins):
+            if attention_data[i, j] == 0:
+                attention_data[i, j] = np.random.uniform(0, 0.3)
+
+    return attention_data
+
+
+def best_of(fn, repeats):
+    """Minimum wall time over ``repeats`` runs, after one warm-up call"""
+    fn()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--legacy-max-cells", type=int, default=2_000_000,
+                        help="Skip the nested-loop version above this many cells")
+    args = parser.parse_args()
+
+    windows = [("30 s", 30), ("5 min", 300), ("1 h", 3600), ("24 h", 86400)]
+
+    print(f"{'channels':>8} {'window':>7} {'bins':>8} {'legacy (s)':>11} {'f32 (s)':>9} {'f16 (s)':>9} {'speedup':>8} {'f16 MB':>8}")
+    for n_channels in (12, 64, 256):
+        channels = ['F3', 'F4'] + [f"Ch{i}" for i in range(2, n_channels)]
+        for label, seconds in windows:
+            n_bins = int(seconds / 0.2)
+            repeats = args.repeats if n_channels * n_bins < 10_000_000 else 1
+
+            f32 = best_of(lambda: build_attention_map(channels, seconds, seed=0), repeats)
+            f16 = best_of(lambda: build_attention_map(channels, seconds, seed=0, dtype=np.float16), repeats)
+
+            if n_channels * n_bins <= args.legacy_max_cells:
+                legacy = best_of(lambda: generate_attention_data_legacy(channels, seconds), 1)
+                legacy_col = f"{legacy:>11.3f}"
+                speedup_col = f"{legacy / f32:>7.0f}x"
+            else:
+                legacy_col = f"{'skipped':>11}"
+                speedup_col = f"{'-':>8}"
+
+            megabytes = n_channels * n_bins * 2 / 1e6
+            print(f"{n_channels:>8} {label:>7} {n_bins:>8} {legacy_col} {f32:>9.4f} {f16:>9.4f} {speedup_col} {megabytes:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Measure attention-model inference latency and the cost of switching layers
+
+Usage:
+    python scripts/benchmarks/bench_attention_model.py [--seconds 300] [--channels 12] [--model PATH]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Make the dashboard's utils package importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+
+from utils.inference import WINDOW_TOKENS, TOKEN_SECONDS, load_model, run_attention
+
+SAMPLE_RATE = 250
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=300)
+    parser.add_argument("--channels", type=int, default=12)
+    parser.add_argument("--model", default=os.environ.get("MODEL_PATH"))
+    args = parser.parse_args()
+
+    model = load_model(args.model, token_samples=int(TOKEN_SECONDS * SAMPLE_RATE))
+    samples = np.random.default_rng(0).standard_normal((args.channels, int(args.seconds * SAMPLE_RATE)),
+                                                       dtype=np.float32)
+    n_windows = -(-int(args.seconds / TOKEN_SECONDS) // WINDOW_TOKENS)
+    print(f"{type(model).__name__}, {model.n_layers} layers, {args.channels} channels x {args.seconds:.0f} s "
+          f"= {n_windows} windows of {WINDOW_TOKENS * TOKEN_SECONDS:.0f} s")
+
+    print(f"{'batch':>6} {'ms/window':>10} {'total (s)':>10}")
+    for batch_windows in (16, 64, 256, 1024):
+        start = time.perf_counter()
+        result = run_attention(model, samples, SAMPLE_RATE, batch_windows=batch_windows)
+        print(f"{batch_windows:>6} {result['window_ms']:>10.2f} {time.perf_counter() - start:>10.2f}")
+
+    # With every layer captured in one pass, a layer switch is an index; without, it is a forward pass
+    start = time.perf_counter()
+    for layer in range(model.n_layers):
+        np.ascontiguousarray(result["attention"][layer])
+    lookup_ms = (time.perf_counter() - start) * 1e3 / model.n_layers
+    start = time.perf_counter()
+    run_attention(model, samples, SAMPLE_RATE)
+    recompute_ms = (time.perf_counter() - start) * 1e3
+    print(f"layer switch: {lookup_ms:.3f} ms from the cached pass vs {recompute_ms:.0f} ms recomputing")
+
+
+if __name__ == "__main__":
+    main()
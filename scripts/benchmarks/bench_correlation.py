@@ -0,0 +1,60 @@
+"""
+Measure streaming correlation throughput, incremental updates and accuracy against in-memory pandas
+
+Usage:
+    python scripts/benchmarks/bench_correlation.py [--patients 1000000] [--chunk 100000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Make the dashboard's utils package importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+
+from utils.correlation import STATISTICS, CorrelationAccumulator, synthetic_cohort_chunks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--patients", type=int, default=1_000_000)
+    parser.add_argument("--chunk", type=int, default=100_000)
+    args = parser.parse_args()
+
+    chunks = list(synthetic_cohort_chunks(args.patients, args.chunk, seed=0))
+    accumulator = CorrelationAccumulator()
+    start = time.perf_counter()
+    for chunk in chunks:
+        accumulator.update(chunk)
+    elapsed = time.perf_counter() - start
+    state_bytes = sum(value.nbytes for value in vars(accumulator).values() if isinstance(value, np.ndarray))
+    print(f"{args.patients:,} patients in chunks of {args.chunk:,}: {args.patients / elapsed:,.0f} rows/s, "
+          f"accumulator state {state_bytes / 1e6:.1f} MB vs {sum(c.nbytes for c in chunks) / 1e6:.0f} MB of rows")
+
+    for statistic in STATISTICS:
+        start = time.perf_counter()
+        accumulator.matrix(statistic)
+        print(f"{statistic:>22}: {(time.perf_counter() - start) * 1e3:.2f} ms from the accumulators")
+
+    # New patients are folded in; the alternative is recomputing over the whole cohort
+    new_rows = next(synthetic_cohort_chunks(1000, seed=1))
+    start = time.perf_counter()
+    accumulator.update(new_rows)
+    accumulator.matrix("Spearman Correlation")
+    incremental_ms = (time.perf_counter() - start) * 1e3
+    frame = pd.DataFrame(np.concatenate(chunks + [new_rows]))
+    start = time.perf_counter()
+    exact_spearman = frame.corr(method="spearman").to_numpy()
+    recompute_ms = (time.perf_counter() - start) * 1e3
+    print(f"add 1,000 patients: {incremental_ms:.1f} ms incremental vs {recompute_ms:.0f} ms pandas Spearman recompute")
+
+    exact_pearson = frame.corr().to_numpy()
+    print(f"max |error| vs pandas: Pearson {np.abs(accumulator.pearson() - exact_pearson).max():.1e}, "
+          f"Spearman {np.abs(accumulator.spearman() - exact_spearman).max():.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Measure streaming decode throughput of a locally generated EDF file
+
+Reports MB/s and the peak Python allocation, which stays at one block regardless of
+file size. The round-trip correctness checks live in tests/test_edf_reader.py.
+
+Usage:
+    python scripts/benchmarks/bench_edf_reader.py [--minutes 60] [--channels 32]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Make the dashboard's utils package importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+
+from utils.edf_reader import EDFReader, write_edf
+from utils.eeg_generator import generate_eeg_batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--minutes", type=float, default=60)
+    parser.add_argument("--channels", type=int, default=32)
+    parser.add_argument("--block-seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        channels = [f"Ch{i}" for i in range(args.channels)]
+        path = os.path.join(tmp, "long.edf")
+        _, data = generate_eeg_batch(channels, args.minutes * 60, seed=0)
+        write_edf(path, data, channels, 250)
+        del data
+        size_mb = os.path.getsize(path) / 1e6
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        with EDFReader(path) as reader:
+            total = 0.0
+            for _, block in reader.iter_blocks(block_seconds=args.block_seconds):
+                total += float(block[:, ::100].sum())
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(f"streamed {size_mb:.0f} MB in {elapsed:.2f} s ({size_mb / elapsed:.0f} MB/s), "
+              f"peak Python allocations {peak / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Measure EEG figure build time and JSON payload size with and without decimation
+
+Usage:
+    python scripts/benchmarks/bench_eeg_downsampling.py [--width 1000] [--max-seconds 3600]
+"""
+import argparse
+import os
+import sys
+import time
+
+# Make the dashboard's utils package importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+
+from utils.downsample import points_for_width
+from utils.eeg_generator import generate_eeg_batch
+from utils.figures import build_eeg_figure
+
+CHANNELS = ['Fp1', 'Fp2', 'F3', 'F4', 'C3', 'C4', 'P3', 'P4', 'O1', 'O2', 'T3', 'T4']
+
+
+def measure(time_array, eeg_data, max_points, mode):
+    """Figure build plus JSON serialization time, and the serialized size in MB"""
+    start = time.perf_counter()
+    fig = build_eeg_figure(time_array, eeg_data, CHANNELS, max_points=max_points, downsampling=mode)
+    payload = fig.to_json()
+    return time.perf_counter() - start, len(payload) / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--width", type=int, default=1000, help="Rendered plot width in pixels")
+    parser.add_argument("--max-seconds", type=float, default=3600)
+    parser.add_argument("--raw-max-seconds", type=float, default=600,
+                        help="Skip the undecimated figure above this duration")
+    args = parser.parse_args()
+
+    max_points = points_for_width(args.width)
+    print(f"point budget per trace: {max_points}")
+    print(f"{'seconds':>8} {'mode':>7} {'build+json (s)':>15} {'payload (MB)':>13}")
+
+    for seconds in (30, 120, 600, 3600):
+        if seconds > args.max_seconds:
+            continue
+        time_array, eeg_data = generate_eeg_batch(CHANNELS, seconds, seed=0)
+
+        for mode in (None, "minmax", "lttb"):
+            if mode is None and seconds > args.raw_max_seconds:
+                continue
+            elapsed, megabytes = measure(time_array, eeg_data, max_points, mode)
+            print(f"{seconds:>8} {str(mode):>7} {elapsed:>15.3f} {megabytes:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark the batched EEG generator against the original dict-of-arrays version
+
+Usage:
+    python scripts/benchmarks/bench_eeg_generation.py [--repeats 3] [--max-seconds 3600]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Make the dashboard's utils package importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+
+from utils.eeg_generator import BASE_FREQS, generate_eeg_batch
+
+
+def generate_eeg_data_legacy(channels, seconds, sample_rate=250):
+    """Per-channel loop generator as originally written in src/app.py"""
+    time_axis = np.arange(0, seconds, 1/sample_rate)
+    eeg_data = {}
+
+    for channel in channels:
+        base_freq = BASE_FREQS.get(channel, 10)
+        signal = np.sin(2 * np.pi * base_freq * time_axis)
+        signal += 0.3 * np.sin(2 * np.pi * (base_freq*2) * time_axis)
+        signal += 0.2 * np.sin(2 * np.pi * (base_freq/2) * time_axis)
+        signal += 0.1 * np.random.randn(len(time_axis))
+
+        if channel == 'F3' and seconds > 20:
+            spike_start = int(15 * sample_rate)
+            spike_end = int(20 * sample_rate)
+
+            for i in range(spike_start, spike_end, int(0.3 * sample_rate)):
+                if i + int(0.05 * sample_rate) < len(signal):
+                    signal[i:i+int(0.05*sample_rate)] = 2 * np.sin(2 * np.pi * 30 * time_axis[0:int(0.05*sample_rate)])
+                    wave_length = int(0.2*sample_rate) - int(0.05*sample_rate)
+                    if i + int(0.2*sample_rate) <= len(signal) and wave_length <= len(time_axis):
+                        signal[i+int(0.05*sample_rate):i+int(0.2*sample_rate)] = -1 * np.sin(2 * np.pi * 3 * time_axis[0:wave_length])
+
+        eeg_data[channel] = signal
+
+    return time_axis, eeg_data
+
+
+def make_channels(n):
+    """Standard 10-20 names first, then numbered extras"""
+    names = list(BASE_FREQS)
+    return names[:n] + [f"Ch{i}" for i in range(len(names), n)]
+
+
+def best_of(fn, repeats):
+    """Minimum wall time over ``repeats`` runs, after one warm-up call"""
+    fn()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--max-seconds", type=float, default=3600)
+    args = parser.parse_args()
+
+    cases = [
+        (12, 30, 250),
+        (12, 600, 250),
+        (64, 600, 250),
+        (64, 600, 1000),
+        (64, 3600, 250),
+        (64, 3600, 1000),
+    ]
+
+    print(f"{'channels':>8} {'seconds':>8} {'rate':>6} {'legacy (s)':>11} {'batch (s)':>10} {'speedup':>8} {'MB':>8}")
+    for n_channels, seconds, rate in cases:
+        if seconds > args.max_seconds:
+            continue
+        channels = make_channels(n_channels)
+
+        batch = best_of(lambda: generate_eeg_batch(channels, seconds, rate, seed=0), args.repeats)
+        legacy = best_of(lambda: generate_eeg_data_legacy(channels, seconds, rate), args.repeats)
+        megabytes = n_channels * seconds * rate * 4 / 1e6
+
+        print(f"{n_channels:>8} {seconds:>8} {rate:>6} {legacy:>11.3f} {batch:>10.3f} {legacy / batch:>7.1f}x {megabytes:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
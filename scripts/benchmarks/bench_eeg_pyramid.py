@@ -0,0 +1,97 @@
+"""
+Measure EEG window cost from the min/max/mean pyramid against raw decimation
+
+Builds a synthetic recording, indexes it, then times reading and drawing windows from
+30 s to the full recording, plus an incremental update after appending data.
+
+Usage:
+    python scripts/benchmarks/bench_eeg_pyramid.py [--hours 24] [--width 1000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Make the dashboard's utils package importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+
+from utils.downsample import points_for_width
+from utils.eeg_generator import generate_eeg_batch
+from utils.figures import build_eeg_stacked_figure
+from utils.pyramid import PyramidIndex, pyramid_path
+from utils.recording_store import RecordingReader, RecordingWriter, convert_synthetic_recording
+
+CHANNELS = ['Fp1', 'Fp2', 'F3', 'F4', 'C3', 'C4', 'P3', 'P4', 'O1', 'O2', 'T3', 'T4']
+
+
+def best_of(fn, repeat=5):
+    fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--hours", type=float, default=24)
+    parser.add_argument("--width", type=int, default=1000, help="Rendered plot width in pixels")
+    parser.add_argument("--raw-max-seconds", type=float, default=3600,
+                        help="Skip the raw min/max decimation above this window length")
+    args = parser.parse_args()
+
+    seconds = args.hours * 3600
+    max_points = points_for_width(args.width)
+
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, "recording")
+        start = time.perf_counter()
+        reader = convert_synthetic_recording(path, CHANNELS, seconds, seed=0, block_seconds=600)
+        print(f"wrote {seconds / 3600:.1f} h x {len(CHANNELS)} channels in {time.perf_counter() - start:.1f} s")
+
+        start = time.perf_counter()
+        pyramid = PyramidIndex(pyramid_path(path), len(CHANNELS), reader.sample_rate)
+        pyramid.update(reader)
+        print(f"built pyramid ({len(pyramid.levels)} levels) in {time.perf_counter() - start:.2f} s")
+
+        print(f"{'window (s)':>10} {'level':>5} {'pyramid (ms)':>13} {'raw minmax (ms)':>16} {'points':>7}")
+        for window in (30, 300, 3600, 6 * 3600, 24 * 3600):
+            if window > seconds:
+                continue
+            window_start = seconds - window
+
+            def draw_pyramid():
+                lo, hi = reader.sample_range(window_start, window)
+                envelope = pyramid.envelope(lo, hi, args.width)
+                if envelope is None:
+                    x, y = reader.read_window(window_start, window)
+                    return build_eeg_stacked_figure(x, y, CHANNELS, max_points=max_points, downsampling="minmax")
+                return build_eeg_stacked_figure(envelope[0], envelope[1], CHANNELS, downsampling=None)
+
+            def draw_raw():
+                x, y = reader.read_window(window_start, window)
+                return build_eeg_stacked_figure(x, y, CHANNELS, max_points=max_points, downsampling="minmax")
+
+            lo, hi = reader.sample_range(window_start, window)
+            level = pyramid.choose_level(hi - lo, args.width)
+            envelope = pyramid.envelope(lo, hi, args.width)
+            points = envelope[1].shape[1] if envelope is not None else max_points
+            pyramid_ms = best_of(draw_pyramid) * 1e3
+            raw = f"{best_of(draw_raw, repeat=2) * 1e3:>16.1f}" if window <= args.raw_max_seconds else f"{'-':>16}"
+            print(f"{window:>10} {str(level):>5} {pyramid_ms:>13.1f} {raw} {points:>7}")
+
+        # Append ten minutes and update the index incrementally
+        _, block = generate_eeg_batch(CHANNELS, 600, seed=1, artifacts=[], start=seconds)
+        with RecordingWriter(path, CHANNELS, reader.sample_rate) as writer:
+            writer.append(block)
+        reader = RecordingReader(path)
+        start = time.perf_counter()
+        added = pyramid.update(reader)
+        print(f"incremental update of 600 s: {added} new base buckets in {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
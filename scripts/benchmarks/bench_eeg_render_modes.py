@@ -0,0 +1,59 @@
+"""
+Compare figure-build time and JSON payload of the subplot (SVG) and stacked (WebGL) EEG views
+
+Usage:
+    python scripts/benchmarks/bench_eeg_render_modes.py [--seconds 30] [--repeats 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+# Make the dashboard's utils package importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+
+from utils.downsample import points_for_width
+from utils.eeg_generator import BASE_FREQS, generate_eeg_batch
+from utils.figures import build_eeg_figure, build_eeg_stacked_figure
+
+
+def make_channels(n):
+    """Standard 10-20 names first, then numbered extras"""
+    names = list(BASE_FREQS)
+    return names[:n] + [f"Ch{i}" for i in range(len(names), n)]
+
+
+def measure(build, time_array, eeg_data, channels, max_points, repeats):
+    """Best build and serialization times over ``repeats`` runs, and the payload size in MB"""
+    build_times, json_times = [], []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fig = build(time_array, eeg_data, channels, max_points=max_points, downsampling="minmax")
+        built = time.perf_counter()
+        payload = fig.to_json()
+        build_times.append(built - start)
+        json_times.append(time.perf_counter() - built)
+    return min(build_times), min(json_times), len(payload) / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=30)
+    parser.add_argument("--width", type=int, default=1000, help="Rendered plot width in pixels")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    max_points = points_for_width(args.width)
+    modes = {"subplots": build_eeg_figure, "stacked": build_eeg_stacked_figure}
+
+    print(f"{'channels':>8} {'mode':>9} {'build (s)':>10} {'to_json (s)':>12} {'payload (MB)':>13}")
+    for n_channels in (12, 32, 64):
+        channels = make_channels(n_channels)
+        time_array, eeg_data = generate_eeg_batch(channels, args.seconds, seed=0)
+        for name, build in modes.items():
+            build_s, json_s, megabytes = measure(build, time_array, eeg_data, channels, max_points, args.repeats)
+            print(f"{n_channels:>8} {name:>9} {build_s:>10.3f} {json_s:>12.3f} {megabytes:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
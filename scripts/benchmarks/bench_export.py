@@ -0,0 +1,79 @@
+"""
+Measure export time, file size and peak memory per format against building one DataFrame first
+
+Usage:
+    python scripts/benchmarks/bench_export.py [--seconds 3600] [--channels 12] [--formats CSV,JSON,NPZ,Parquet]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+# Make the dashboard's utils package importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+
+from utils.export import EXPORT_FORMATS, export_tables, write_export
+from utils.recording_store import convert_synthetic_recording
+
+SAMPLE_RATE = 250
+
+
+def measure(fn):
+    """(seconds, peak traced MB) of a call, timed untraced since tracing slows Python-level loops"""
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=int, default=3600)
+    parser.add_argument("--channels", type=int, default=12)
+    parser.add_argument("--formats", default="CSV,JSON,NPZ,Parquet,PDF Report")
+    args = parser.parse_args()
+
+    channels = [f"ch{i}" for i in range(args.channels)]
+    with tempfile.TemporaryDirectory() as tmp:
+        recording = convert_synthetic_recording(os.path.join(tmp, "recording"), channels, args.seconds,
+                                                sample_rate=SAMPLE_RATE, seed=0)
+        attention = np.random.default_rng(0).random((args.channels, args.seconds * 5), dtype=np.float32)
+        forecast = {name: np.linspace(0.1, 0.5, 24) for name in ("risk", "lower", "upper")}
+        n_rows = recording.n_samples
+        print(f"{args.channels} channels x {args.seconds} s = {n_rows:,} EEG rows")
+        print(f"{'format':>12} {'seconds':>8} {'rows/s':>11} {'size (MB)':>10} {'peak (MB)':>10}")
+
+        for export_format in args.formats.split(","):
+            out = os.path.join(tmp, "export" + EXPORT_FORMATS[export_format])
+            tables = export_tables(recording, 0, args.seconds, attention=attention, forecast=forecast)
+            try:
+                elapsed, peak = measure(lambda: write_export(out, export_format, tables, {"benchmark": True}))
+            except ImportError as exc:
+                print(f"{export_format:>12} skipped: {exc}")
+                continue
+            print(f"{export_format:>12} {elapsed:>8.2f} {n_rows / elapsed:>11,.0f} {os.path.getsize(out) / 1e6:>10.1f} "
+                  f"{peak:>10.1f}")
+
+        # The approach the export replaces: the whole window as one DataFrame, then written at once
+        def whole_frame():
+            times, samples = recording.read_window(0, args.seconds)
+            frame = pd.DataFrame(samples.T, columns=channels)
+            frame.insert(0, "time_s", times)
+            frame.to_csv(os.path.join(tmp, "whole.csv"), index=False, float_format="%.6g")
+
+        elapsed, peak = measure(whole_frame)
+        print(f"{'DataFrame CSV':>12} {elapsed:>8.2f} {n_rows / elapsed:>11,.0f} "
+              f"{os.path.getsize(os.path.join(tmp, 'whole.csv')) / 1e6:>10.1f} {peak:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
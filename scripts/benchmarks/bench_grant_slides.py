@@ -0,0 +1,54 @@
+"""
+Measure grant slide render time and payload per rerun, rebuilding every slide against the cached deck
+
+Usage:
+    python scripts/benchmarks/bench_grant_slides.py [--repeats 200]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+# Make the dashboard's utils package importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+
+from utils.elements_renderer import GRANT_DECKS, GRANT_SLIDES_DIR, build_grant_deck, grant_deck
+
+
+def timed(fn, repeats):
+    """Median milliseconds of a call"""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return float(np.median(times))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'grant':>18} {'slides':>7} {'rebuild ms':>11} {'cached ms':>10} {'all kB':>8} {'one slide kB':>13}")
+    for grant_type, file_name in GRANT_DECKS.items():
+        path = os.path.join(GRANT_SLIDES_DIR, file_name)
+
+        # What each rerun did before: build the tree of every slide and send all of them
+        def rebuild():
+            with open(path, encoding="utf-8") as f:
+                return build_grant_deck(json.load(f))
+
+        rebuild_ms = timed(rebuild, args.repeats)
+        grant_deck(grant_type)
+        cached_ms = timed(lambda: grant_deck(grant_type), args.repeats)
+        titles, frames = grant_deck(grant_type)
+        print(f"{grant_type:>18} {len(titles):>7} {rebuild_ms:>11.3f} {cached_ms:>10.4f} "
+              f"{sum(map(len, frames)) / 1e3:>8.1f} {max(map(len, frames)) / 1e3:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Measure the overhead a timed section adds to each call, with and without the optional capture
+
+Usage:
+    python scripts/benchmarks/bench_instrumentation.py [--calls 100000]
+    DASHBOARD_PROFILE=tracemalloc python scripts/benchmarks/bench_instrumentation.py
+"""
+import argparse
+import os
+import sys
+import time
+
+# Make the dashboard's utils package importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+
+from utils.instrumentation import PROFILE_MODES, reset, section_stats, timed
+
+
+def noop():
+    pass
+
+
+@timed("bench.noop")
+def timed_noop():
+    pass
+
+
+def per_call_us(fn, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=100000)
+    args = parser.parse_args()
+
+    print(f"capture: {', '.join(sorted(PROFILE_MODES)) or 'timing only'}")
+    reset()
+    bare = per_call_us(noop, args.calls)
+    instrumented = per_call_us(timed_noop, args.calls)
+    print(f"{'call':>12} {'us/call':>9}")
+    print(f"{'bare':>12} {bare:>9.3f}")
+    print(f"{'timed':>12} {instrumented:>9.3f}")
+    print(f"overhead {instrumented - bare:.3f} us per section; {section_stats()[0]['samples']} samples kept")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Measure the live EEG path: producer throughput, ring buffer memory and per-tick figure cost
+
+Runs the simulated source at 64 channels x 250 Hz, then compares rebuilding the
+subplot figure on every tick against updating the existing figure's trace data.
+
+Usage:
+    python scripts/benchmarks/bench_live_stream.py [--channels 64] [--seconds 5]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Make the dashboard's utils package importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+
+from utils.downsample import points_for_width
+from utils.figures import build_eeg_figure, update_eeg_figure
+from utils.live_stream import SimulatedSource
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--channels", type=int, default=64)
+    parser.add_argument("--rate", type=int, default=250)
+    parser.add_argument("--seconds", type=float, default=5, help="How long to run the producer")
+    parser.add_argument("--ticks", type=int, default=5, help="Figure refreshes to time")
+    args = parser.parse_args()
+
+    channels = [f"Ch{i + 1}" for i in range(args.channels)]
+    source = SimulatedSource(channels, sample_rate=args.rate, seed=0)
+    source.start()
+    time.sleep(args.seconds)
+
+    produced = source.buffer.total / args.rate
+    print(f"{args.channels} channels @ {args.rate} Hz: produced {produced:.1f} s of signal in {args.seconds:.1f} s "
+          f"wall time, ring buffer {source.buffer.nbytes / 1e6:.1f} MB")
+
+    max_points = points_for_width(1000)
+    first, samples, _ = source.buffer.read_latest(30 * args.rate)
+    times = (first + np.arange(samples.shape[1])) / args.rate
+    fig = build_eeg_figure(times, samples, channels, max_points=max_points)
+
+    rebuild, update, latency = [], [], []
+    index = first + samples.shape[1]
+    for _ in range(args.ticks):
+        time.sleep(1.0)
+        first, new, stamp = source.buffer.read_since(index)
+        index = first + new.shape[1]
+        samples = np.concatenate([samples, new], axis=1)[:, -30 * args.rate:]
+        times = (index - samples.shape[1] + np.arange(samples.shape[1])) / args.rate
+
+        start = time.perf_counter()
+        update_eeg_figure(fig, times, samples, channels, max_points=max_points).to_json()
+        update.append(time.perf_counter() - start)
+        latency.append(time.time() - stamp)
+
+        start = time.perf_counter()
+        build_eeg_figure(times, samples, channels, max_points=max_points).to_json()
+        rebuild.append(time.perf_counter() - start)
+
+    source.stop()
+    print(f"rebuild figure per tick: {np.median(rebuild) * 1e3:.0f} ms")
+    print(f"update figure per tick:  {np.median(update) * 1e3:.0f} ms")
+    print(f"sample-to-figure latency (update path): {np.median(latency) * 1e3:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Measure patient registry load, search and update latency on a synthetic registry
+
+Usage:
+    python scripts/benchmarks/bench_patient_search.py [--patients 1000000] [--repeats 20]
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# Make the dashboard's utils package importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+
+from utils.patient_registry import PatientRegistry, synthetic_patients
+
+QUERIES = ["28791", "2879", "1", "levetiracetam", "levtiracetam female", "post seizure f3 spike",
+           "structural lesion", "lamo male 28", "no such word"]
+
+
+def timed(fn, repeats):
+    fn()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return np.median(timings) * 1e3, np.max(timings) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--patients", type=int, default=1_000_000)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    frame = synthetic_patients(args.patients, seed=0)
+    print(f"{args.patients:,} patients")
+
+    with tempfile.TemporaryDirectory() as root:
+        sqlite_file = os.path.join(root, "patients.sqlite")
+        with sqlite3.connect(sqlite_file) as connection:
+            frame.to_sql("patients", connection, index=False)
+        loaders = [("frame", lambda: PatientRegistry.from_frame(frame)),
+                   ("sqlite", lambda: PatientRegistry.from_sqlite(sqlite_file))]
+        try:
+            parquet_file = os.path.join(root, "patients.parquet")
+            frame.to_parquet(parquet_file)
+            loaders.append(("parquet", lambda: PatientRegistry.from_parquet(parquet_file)))
+        except ImportError:
+            print("parquet: skipped (needs pyarrow or fastparquet)")
+        for name, loader in loaders:
+            start = time.perf_counter()
+            registry = loader()
+            print(f"load from {name}: {time.perf_counter() - start:.2f} s")
+
+    print(f"{'query':>24} {'p50 (ms)':>9} {'max (ms)':>9} {'matches':>9}")
+    for query in QUERIES:
+        p50, worst = timed(lambda: registry.search(query), args.repeats)
+        print(f"{query!r:>24} {p50:>9.2f} {worst:>9.2f} {registry.search(query)[1]:>9,}")
+
+    # Incremental changes are searchable immediately, without a rebuild
+    new_ids = iter(range(2_000_000, 3_000_000))
+    p50, _ = timed(lambda: registry.add({"patient_id": str(next(new_ids)), "status": "Routine EEG"}), args.repeats)
+    print(f"add one patient: {p50:.3f} ms")
+    p50, _ = timed(lambda: registry.update("2000000", age=int(np.random.randint(1, 95))), args.repeats)
+    print(f"update one patient: {p50:.3f} ms")
+    p50, _ = timed(lambda: registry.search("2000000"), args.repeats)
+    print(f"search after updates: {p50:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Measure batch precompute scaling with worker count on a synthetic cohort
+
+Usage:
+    python scripts/benchmarks/bench_precompute.py [--patients 16] [--seconds 600] [--max-workers N]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Make the dashboard's utils package importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+
+from utils.eeg_generator import recurring_artifacts
+from utils.precompute import run_precompute
+from utils.recording_store import convert_synthetic_recording
+
+CHANNELS = ['Fp1', 'Fp2', 'F3', 'F4', 'C3', 'C4', 'P3', 'P4', 'O1', 'O2', 'T3', 'T4']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--patients", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=600)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        for i in range(args.patients):
+            convert_synthetic_recording(os.path.join(root, "recordings", f"patient_{i}"), CHANNELS, args.seconds,
+                                        seed=i, artifacts=recurring_artifacts(args.seconds))
+        print(f"{args.patients} patients x {args.seconds:.0f} s x {len(CHANNELS)} channels, "
+              f"{os.cpu_count()} core(s)")
+        print(f"{'workers':>7} {'wall (s)':>9} {'speedup':>8} {'efficiency':>11}")
+
+        workers, baseline = 1, None
+        while workers <= args.max_workers:
+            start = time.perf_counter()
+            run_precompute(root, workers=workers, force=True, log=lambda line: None)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"{workers:>7} {elapsed:>9.2f} {baseline / elapsed:>8.2f} {baseline / elapsed / workers:>11.0%}")
+            workers *= 2
+
+        # A second run with nothing changed only checks the manifest
+        start = time.perf_counter()
+        run_precompute(root, log=lambda line: None)
+        print(f"resume with nothing to do: {(time.perf_counter() - start) * 1e3:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
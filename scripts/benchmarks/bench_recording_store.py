@@ -0,0 +1,64 @@
+"""
+Measure window-read latency and memory of the memory-mapped recording store
+
+Usage:
+    python scripts/benchmarks/bench_recording_store.py [--hours 4] [--channels 64] [--dtype float32]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+# Make the dashboard's utils package importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+
+from utils.recording_store import RecordingReader, convert_synthetic_recording
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--hours", type=float, default=4)
+    parser.add_argument("--channels", type=int, default=64)
+    parser.add_argument("--sample-rate", type=int, default=250)
+    parser.add_argument("--dtype", choices=["float32", "int16"], default="float32")
+    parser.add_argument("--window", type=float, default=30, help="Window length in seconds")
+    parser.add_argument("--reads", type=int, default=200)
+    args = parser.parse_args()
+
+    channels = [f"Ch{i}" for i in range(args.channels)]
+    seconds = args.hours * 3600
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "recording")
+        start = time.perf_counter()
+        convert_synthetic_recording(path, channels, seconds, sample_rate=args.sample_rate, seed=0, dtype=args.dtype)
+        size_mb = os.path.getsize(os.path.join(path, "samples.raw")) / 1e6
+        print(f"wrote {size_mb:.0f} MB in {time.perf_counter() - start:.1f} s")
+
+        reader = RecordingReader(path)
+        rng = np.random.default_rng(0)
+        starts = rng.uniform(0, reader.duration - args.window, args.reads)
+
+        tracemalloc.start()
+        timings = []
+        for window_start in starts:
+            start = time.perf_counter()
+            _, window = reader.read_window(window_start, args.window)
+            # Touch the data the way a plot would, so page faults are included
+            float(window[:, ::10].sum())
+            timings.append(time.perf_counter() - start)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        timings = np.array(timings) * 1000
+        print(f"{args.reads} random {args.window:.0f} s windows of {args.channels} channels ({args.dtype})")
+        print(f"  p50 {np.percentile(timings, 50):.2f} ms  p95 {np.percentile(timings, 95):.2f} ms  max {timings.max():.2f} ms")
+        print(f"  peak Python allocations {peak / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
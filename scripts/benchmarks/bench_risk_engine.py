@@ -0,0 +1,65 @@
+"""
+Measure risk-engine throughput (windows/s) per model type and the cost of bootstrap forecasts
+
+Usage:
+    python scripts/benchmarks/bench_risk_engine.py [--patients 500] [--windows 360] [--bootstrap 2000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Make the dashboard's utils package importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+
+from utils.risk import CLINICAL_FEATURES, MODEL_TYPES, WINDOW_FEATURES, RiskEngine
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--patients", type=int, default=500)
+    parser.add_argument("--windows", type=int, default=360, help="10 s windows per patient (360 = 1 hour)")
+    parser.add_argument("--bootstrap", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    features = rng.standard_normal((args.patients, args.windows, len(WINDOW_FEATURES))).astype(np.float32)
+    clinical = (rng.random((args.patients, len(CLINICAL_FEATURES))) < 0.3).astype(np.float32)
+    n_windows = args.patients * args.windows
+    print(f"{args.patients} patients x {args.windows} windows = {n_windows:,} windows")
+    print(f"{'model':>12} {'build (ms)':>11} {'windows/s':>11} {'forecast (ms)':>14} {'per patient (ms)':>17}")
+
+    for model_type in MODEL_TYPES:
+        start = time.perf_counter()
+        engine = RiskEngine(model_type)
+        build_ms = (time.perf_counter() - start) * 1e3
+
+        start = time.perf_counter()
+        engine.score(features, clinical)
+        throughput = n_windows / (time.perf_counter() - start)
+
+        # Forecast with vectorized bootstrap intervals for one patient, as the dashboard requests it
+        start = time.perf_counter()
+        engine.forecast(features[:1], clinical[:1], level=0.7, n_bootstrap=args.bootstrap)
+        forecast_ms = (time.perf_counter() - start) * 1e3
+
+        start = time.perf_counter()
+        engine.forecast(features[:50], clinical[:50], level=0.7, n_bootstrap=args.bootstrap)
+        per_patient_ms = (time.perf_counter() - start) * 1e3 / 50
+        print(f"{model_type:>12} {build_ms:>11.0f} {throughput:>11,.0f} {forecast_ms:>14.1f} {per_patient_ms:>17.1f}")
+
+    # The same bootstrap as a Python loop over resamples, for comparison
+    engine = RiskEngine("XGBoost")
+    probs = engine.forecast_probabilities(features[:1], clinical[:1])[0]
+    start = time.perf_counter()
+    boot = np.empty((args.bootstrap, probs.shape[1]))
+    for b in range(args.bootstrap):
+        boot[b] = probs[rng.integers(0, len(probs), len(probs))].mean(axis=0)
+    np.percentile(boot, [15, 85], axis=0)
+    print(f"looped bootstrap, one patient: {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Measure similar-case retrieval latency and recall for exact and LSH search
+
+Usage:
+    python scripts/benchmarks/bench_similarity.py [--cases 100000] [--queries 200] [--k 10]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Make the dashboard's utils package importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+
+from utils.similarity import SimilarityIndex, synthetic_embeddings
+
+
+def timed_search(index, queries, k, mode):
+    """Per-query latency in ms (one query at a time, as the dashboard issues them) and the results"""
+    index.search(queries[0], k=k, mode=mode)
+    results, timings = [], []
+    for query in queries:
+        start = time.perf_counter()
+        ids, _ = index.search(query, k=k, mode=mode)
+        timings.append(time.perf_counter() - start)
+        results.append(ids[0])
+    return np.median(timings) * 1e3, np.percentile(timings, 99) * 1e3, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cases", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    ids, vectors = synthetic_embeddings(args.cases, seed=0)
+    rng = np.random.default_rng(1)
+    queries = vectors[rng.integers(0, args.cases, args.queries)]
+    queries = queries + 0.2 * rng.standard_normal(queries.shape).astype(np.float32)
+
+    exact_index = SimilarityIndex()
+    exact_index.add(ids, vectors)
+    p50, p99, truth = timed_search(exact_index.build(), queries, args.k, "exact")
+    print(f"{args.cases:,} cases, top-{args.k}, {args.queries} queries")
+    print(f"{'mode':>16} {'p50 (ms)':>9} {'p99 (ms)':>9} {'recall':>7}")
+    print(f"{'exact':>16} {p50:>9.2f} {p99:>9.2f} {1.0:>7.3f}")
+
+    for n_tables, n_bits in ((4, 16), (8, 16), (4, 14), (8, 14), (8, 12), (16, 14)):
+        index = SimilarityIndex(n_tables=n_tables, n_bits=n_bits)
+        index.add(ids, vectors)
+        start = time.perf_counter()
+        index.build()
+        build_ms = (time.perf_counter() - start) * 1e3
+        p50, p99, found = timed_search(index, queries, args.k, "lsh")
+        recall = np.mean([len(set(a) & set(b)) / args.k for a, b in zip(truth, found)])
+        label = f"lsh {n_tables}x{n_bits}"
+        print(f"{label:>16} {p50:>9.2f} {p99:>9.2f} {recall:>7.3f}   (build {build_ms:.0f} ms)")
+
+    # Batched exact search amortizes the matrix product over many queries
+    start = time.perf_counter()
+    exact_index.search(queries, k=args.k, mode="exact")
+    print(f"batched exact: {(time.perf_counter() - start) * 1e3 / args.queries:.2f} ms per query")
+
+
+if __name__ == "__main__":
+    main()
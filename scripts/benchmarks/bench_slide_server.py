@@ -0,0 +1,117 @@
+"""
+Measure what a browser downloads to open a slide deck and to switch to another one
+
+Loads a deck page and the assets it preloads from the in-process slide server, cold, and
+then switches decks as a browser with a warm cache would, reporting bytes on the wire and
+latency. Uses react-slides/dist when built, otherwise a synthetic build of similar size.
+
+Usage:
+    python scripts/benchmarks/bench_slide_server.py [--dist react-slides/dist] [--repeats 50]
+"""
+import argparse
+import http.client
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# Make the dashboard's utils package importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+
+from utils.slide_server import DIST_DIR, MANIFEST_FILE, SlideServer
+
+ROUTES = ("k99r00", "nsf-career", "mcknight-scholars")
+
+
+def synthetic_dist(root):
+    """Vite-shaped build: a 150 kB entry (React, router), one 20 kB chunk per deck and a stylesheet"""
+    rng = np.random.default_rng(0)
+    words = [f"slide{i}" for i in range(400)]
+
+    def source(kb):
+        return " ".join(rng.choice(words, kb * 140)).encode()
+
+    os.makedirs(os.path.join(root, "assets"))
+    os.makedirs(os.path.join(root, ".vite"))
+    manifest = {"index.html": {"file": "assets/index-a1b2c3d4.js", "isEntry": True, "css": ["assets/index-e5f6a7b8.css"]}}
+    files = {"assets/index-a1b2c3d4.js": source(150), "assets/index-e5f6a7b8.css": source(15)}
+    for i, route in enumerate(ROUTES):
+        name = f"assets/{route}-slide-deck-0000000{i}.js"
+        files[name] = source(20)
+        manifest[f"src/grants/{route}-slide-deck.tsx"] = {"file": name, "isDynamicEntry": True,
+                                                            "imports": ["index.html"]}
+    files["index.html"] = (b'<!DOCTYPE html><html><head><script type="module" crossorigin src="/assets/index-a1b2c3d4.js">'
+                           b'</script><link rel="stylesheet" crossorigin href="/assets/index-e5f6a7b8.css"></head>'
+                           b'<body><div id="root"></div></body></html>')
+    files[MANIFEST_FILE] = json.dumps(manifest).encode()
+    for name, body in files.items():
+        with open(os.path.join(root, name), "wb") as f:
+            f.write(body)
+
+
+def fetch(conn, path, etags, gzip=True):
+    """(bytes on the wire, ms) of one request, revalidating with an ETag already seen for the path"""
+    headers = {"Accept-Encoding": "gzip"} if gzip else {}
+    if path in etags:
+        headers["If-None-Match"] = etags[path]
+    start = time.perf_counter()
+    conn.request("GET", path, headers=headers)
+    response = conn.getresponse()
+    body = response.read()
+    elapsed = (time.perf_counter() - start) * 1000
+    etags[path] = response.getheader("ETag")
+    return len(body), elapsed
+
+
+def open_deck(conn, server, route, etags, gzip=True):
+    total, ms = fetch(conn, f"/{route}", etags, gzip)
+    for asset in server.site.assets(route):
+        size, elapsed = fetch(conn, f"/{asset}", etags, gzip)
+        total, ms = total + size, ms + elapsed
+    return total, ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dist", default=DIST_DIR)
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = args.dist
+        if not os.path.exists(os.path.join(root, "index.html")):
+            root = os.path.join(tmp, "dist")
+            synthetic_dist(root)
+            print("react-slides/dist not built; using a synthetic build")
+        server = SlideServer(root, host="127.0.0.1", port=0)
+        conn = http.client.HTTPConnection("127.0.0.1", server.port)
+        route = ROUTES[0]
+        print(f"{len(server.site.files)} files, deck /{route} preloads {len(server.site.assets(route))} assets")
+        print(f"{'load':>28} {'kB':>8} {'ms':>8}")
+
+        cases = [("cold, uncompressed", dict(gzip=False, warm=False)),
+                 ("cold, gzip", dict(gzip=True, warm=False)),
+                 ("switch deck, warm cache", dict(gzip=True, warm=True))]
+        for name, case in cases:
+            sizes, times = [], []
+            for i in range(args.repeats):
+                etags = {}
+                if case["warm"]:
+                    # The browser has every hashed asset from the first deck and its idle prefetch, and
+                    # immutable assets are not revalidated, so only the other deck's page is requested
+                    size, elapsed = fetch(conn, f"/{ROUTES[1 + i % 2]}", etags)
+                else:
+                    size, elapsed = open_deck(conn, server, route, etags, gzip=case["gzip"])
+                sizes.append(size)
+                times.append(elapsed)
+            print(f"{name:>28} {np.median(sizes) / 1e3:>8.1f} {np.median(times):>8.2f}")
+
+        conn.close()
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
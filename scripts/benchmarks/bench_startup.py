@@ -0,0 +1,87 @@
+"""
+Measure cold-start and per-rerun import time of each dashboard page against importing everything up front
+
+Each case runs in a fresh interpreter that has already imported Streamlit, as the server
+has when the app script first runs; the rerun column imports the same modules again, as
+every later rerun of the script does. The last line is the first full run of the default
+page through Streamlit's app test harness.
+
+Usage:
+    python scripts/benchmarks/bench_startup.py [--repeats 3]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+SRC_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+
+EEG_IMPORTS = [
+    "numpy", "pandas", "utils.cache", "utils.dashboard_data", "utils.live_stream", "utils.risk", "utils.correlation",
+    "utils.export", "utils.jobs", "utils.spectral", "utils.attention", "utils.downsample", "utils.figures",
+]
+
+# Modules each page of src/app.py imports on its first visit
+PAGE_IMPORTS = {
+    "EEG Dashboard": EEG_IMPORTS,
+    "Proposed Grants": ["streamlit.components.v1", "utils.slide_server"],
+    "Slide Deck": [],
+}
+
+# What every run imported before the imports moved into the pages
+EAGER_IMPORTS = ["matplotlib.pyplot", "seaborn", "utils.tsx_renderer", "utils.elements_renderer"] + EEG_IMPORTS
+
+_TIMER = """
+import importlib, json, sys, time
+import streamlit
+sys.path.insert(0, {src!r})
+def run(modules):
+    start = time.perf_counter()
+    for name in modules:
+        importlib.import_module(name)
+    return (time.perf_counter() - start) * 1000
+modules = {modules!r}
+print(json.dumps([run(modules), run(modules)]))
+"""
+
+_FIRST_RUN = """
+import json, time
+from streamlit.testing.v1 import AppTest
+start = time.perf_counter()
+AppTest.from_file({app!r}, default_timeout=300).run()
+print(json.dumps((time.perf_counter() - start) * 1000))
+"""
+
+
+def fresh(code):
+    result = subprocess.run([sys.executable, "-c", code], cwd=SRC_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'page':>18} {'modules':>8} {'cold ms':>9} {'rerun ms':>9}")
+    cases = dict(PAGE_IMPORTS, **{"all (before)": EAGER_IMPORTS})
+    for page, modules in cases.items():
+        try:
+            runs = np.array([fresh(_TIMER.format(src=SRC_DIR, modules=modules)) for _ in range(args.repeats)])
+        except RuntimeError as exc:
+            print(f"{page:>18} skipped: {exc}")
+            continue
+        cold, rerun = np.median(runs, axis=0)
+        print(f"{page:>18} {len(modules):>8} {cold:>9.0f} {rerun:>9.3f}")
+
+    first_run = np.median([fresh(_FIRST_RUN.format(app=os.path.join(SRC_DIR, "app.py"))) for _ in range(args.repeats)])
+    print(f"First run of the EEG Dashboard page: {first_run:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Measure slide-deck page preparation: cold bundle build, disk-cache hit and in-memory hit
+
+Usage:
+    python scripts/benchmarks/bench_tsx_bundle.py [--deck k99r00-slide-deck]
+"""
+import argparse
+import os
+import shutil
+import sys
+import time
+
+# Make the dashboard's utils package importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src"))
+
+from utils.tsx_renderer import BUNDLE_CACHE_DIR, SLIDES_DIR, BundleError, _babel_html, build_bundle, bundle_html
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--deck", default="k99r00-slide-deck")
+    args = parser.parse_args()
+    path = os.path.join(SLIDES_DIR, "src", "grants", args.deck + ".tsx")
+
+    legacy = _babel_html(path)
+    print(f"in-browser Babel page: {len(legacy) / 1e3:.0f} kB HTML, plus React, "
+          f"@babel/standalone and the Tailwind CDN fetched and run by the browser on every render")
+
+    # Cold build into a scratch cache, leaving the real one alone
+    backup = BUNDLE_CACHE_DIR + ".bench-backup"
+    if os.path.exists(BUNDLE_CACHE_DIR):
+        shutil.move(BUNDLE_CACHE_DIR, backup)
+    try:
+        start = time.perf_counter()
+        try:
+            build_bundle(path)
+        except BundleError as exc:
+            print(f"cannot build: {exc}")
+            return
+        print(f"cold build:      {(time.perf_counter() - start) * 1e3:9.1f} ms")
+
+        start = time.perf_counter()
+        build_bundle(path)
+        print(f"disk-cache hit:  {(time.perf_counter() - start) * 1e3:9.1f} ms")
+
+        bundle_html(path)
+        start = time.perf_counter()
+        html = bundle_html(path)
+        print(f"in-memory hit:   {(time.perf_counter() - start) * 1e3:9.3f} ms")
+        print(f"bundled page: {len(html) / 1e3:.0f} kB HTML, self-contained, no transpilation in the browser")
+    finally:
+        if os.path.exists(backup):
+            shutil.rmtree(BUNDLE_CACHE_DIR, ignore_errors=True)
+            shutil.move(backup, BUNDLE_CACHE_DIR)
+
+
+if __name__ == "__main__":
+    main()
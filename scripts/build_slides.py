@@ -0,0 +1,45 @@
+"""
+Precompile every grant slide deck under react-slides/src/grants into a cached bundle
+
+Each deck is bundled with production React by esbuild and its Tailwind classes compiled
+into a minified stylesheet, both stored in react-slides/.bundle-cache by content hash;
+the dashboard inlines them instead of transpiling in the browser. Decks that have not
+changed since their last build are skipped. Needs 'npm install' in react-slides first.
+
+Usage:
+    python scripts/build_slides.py
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+# Make the dashboard's utils package importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from utils.tsx_renderer import BUNDLE_CACHE_DIR, SLIDES_DIR, BundleError, build_bundle
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.parse_args()
+
+    failed = []
+    for path in sorted(glob.glob(os.path.join(SLIDES_DIR, "src", "grants", "*.tsx"))):
+        start = time.perf_counter()
+        try:
+            js, css = build_bundle(path)
+        except BundleError as exc:
+            failed.append(os.path.basename(path))
+            print(f"{os.path.basename(path)}: {exc}")
+            continue
+        print(f"{os.path.basename(path)}: {len(js) / 1e3:.0f} kB JS, {len(css) / 1e3:.0f} kB CSS "
+              f"in {time.perf_counter() - start:.2f} s")
+    print(f"bundles in {BUNDLE_CACHE_DIR}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
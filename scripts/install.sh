@@ -372,6 +372,10 @@ module.exports = {
 };
 EOL
             echo "Patched postcss.config.js with valid JS (no \\n)."
+            # Precompile the slide decks so the dashboard never transpiles them in the browser
+            "$PYTHON_CMD" "$PROJECT_ROOT/scripts/build_slides.py" || echo -e "${YELLOW}Slide decks not precompiled; they will be built on first view.${NC}"
+            # Production build the dashboard serves on the Proposed Grants page
+            npm run build || echo -e "${YELLOW}Slide deck build failed; run 'npm run build' in react-slides.${NC}"
         echo -e "${RED}Error: npm (Node.js) is not installed. Please install Node.js and npm to use the React slide decks frontend.\nVisit https://nodejs.org/en/download for installation instructions.${NC}"
     fi
     cd "$PROJECT_ROOT"
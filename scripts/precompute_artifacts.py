@@ -0,0 +1,47 @@
+"""
+Precompute per-patient analysis artifacts for every recording under DATA_PATH
+
+Band powers, attention maps and summary features are written to DATA_PATH/artifacts as
+one NPZ per recording; the dashboard loads them instead of computing inline. Progress
+is kept in DATA_PATH/artifacts/manifest.json, so rerunning only processes recordings
+that are new or changed.
+
+Usage:
+    python scripts/precompute_artifacts.py [--data-path ./data] [--workers N] [--force]
+    python scripts/precompute_artifacts.py --synthesize 32 --seconds 600
+"""
+import argparse
+import os
+import sys
+
+# Make the dashboard's utils package importable
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from utils.dashboard_data import ensure_synthetic_recording
+from utils.precompute import run_precompute
+
+CHANNELS = ['Fp1', 'Fp2', 'F3', 'F4', 'C3', 'C4', 'P3', 'P4', 'O1', 'O2', 'T3', 'T4']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--data-path", default=os.environ.get("DATA_PATH", "./data"))
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--force", action="store_true", help="Recompute up-to-date artifacts")
+    parser.add_argument("--synthesize", type=int, default=0, help="First create this many synthetic patients")
+    parser.add_argument("--seconds", type=float, default=600, help="Length of each synthetic recording")
+    args = parser.parse_args()
+
+    os.environ["DATA_PATH"] = args.data_path
+    for i in range(args.synthesize):
+        ensure_synthetic_recording(10000 + i, CHANNELS, seconds=args.seconds, seed=10000 + i)
+
+    manifest = run_precompute(args.data_path, workers=args.workers, force=args.force)
+    failed = [key for key, entry in manifest.items() if entry.get("status") == "failed"]
+    if failed:
+        print(f"failed: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -67,16 +67,16 @@ case $choice in
             APP_PATH="$custom_path"
         fi
 
-        # Start React frontend (in background)
+        # Build the React slide decks; the dashboard serves the production build itself
         if [ -d "$ROOT_DIR/react-slides" ]; then
-            echo -e "${GREEN}Starting React frontend (slide decks)...${NC}"
             cd "$ROOT_DIR/react-slides"
-            if command -v npm &> /dev/null; then
-                npm run dev &
-                REACT_PID=$!
-                echo -e "${BLUE}React frontend running at http://localhost:3000${NC}"
+            if [ -f dist/index.html ] && [ -z "$(find src index.html vite.config.ts package-lock.json -newer dist/index.html 2>/dev/null)" ]; then
+                echo -e "${BLUE}React slide decks are up to date.${NC}"
+            elif command -v npm &> /dev/null; then
+                echo -e "${GREEN}Building React slide decks...${NC}"
+                npm run build || echo -e "${YELLOW}Slide deck build failed; the Proposed Grants page will be unavailable.${NC}"
             else
-                echo -e "${YELLOW}npm (Node.js) not found. React slide decks will not be available.\nInstall Node.js and run 'npm run dev' in react-slides manually.${NC}"
+                echo -e "${YELLOW}npm (Node.js) not found. React slide decks will not be available.\nInstall Node.js and run 'npm run build' in react-slides manually.${NC}"
             fi
             cd "$ROOT_DIR"
         fi
@@ -92,8 +92,7 @@ case $choice in
             STREAMLIT_PID=$!
         fi
 
-        echo -e "\n${BLUE}To stop the React frontend, run:${NC}"
-        echo -e "${YELLOW}    kill $REACT_PID${NC}"
+        echo -e "\n${BLUE}Slide decks are served by the dashboard at http://localhost:${SLIDES_PORT:-3000}${NC}"
         echo -e "${BLUE}To stop the Streamlit backend, run:${NC}"
         echo -e "${YELLOW}    kill $STREAMLIT_PID${NC}"
         wait $STREAMLIT_PID
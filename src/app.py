@@ -1,19 +1,11 @@
 import streamlit as st
-import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import time
-from datetime import datetime, timedelta
-import random
+import uuid
 import os
 import sys
 
-from utils.tsx_renderer import render_tsx_component
-from utils.elements_renderer import render_grant_slides
+# Start of this script run, for the page's total time
+run_start = time.perf_counter()
 
 # Add the current directory to the path so we can import the utils module
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -77,130 +69,95 @@ with st.sidebar:
     # Add a radio button for page selection
     page = st.radio("Navigation", ["EEG Dashboard", "Proposed Grants", "Slide Deck (Alignment/Proposed-Contributions)"])
 
+# Hidden page with the process's latency and memory profile, opened with ?page=performance
+if st.query_params.get("page") == "performance":
+    page = "Performance"
+
+# Each page imports only the modules it uses, so the process loads them on the first visit to that page;
+# on later reruns these imports are lookups in the module cache
+if page == "EEG Dashboard":
+    import pandas as pd
+    from panels import panel_timings
+    from panels.attention import attention_panel
+    from panels.clinical import clinical_panel, prediction_panel, risk_panel
+    from panels.cohort import correlation_panel
+    from panels.eeg import eeg_panel, live_eeg_panel
+    from panels.jobs import export_panel, jobs_panel
+    from utils.cache import array_digest, cache_stats
+    from utils.dashboard_data import (
+        data_path, ensure_synthetic_recording, list_edf_files, open_recording, open_pyramid, load_attention,
+        load_precomputed, find_similar_cases, load_patient_registry, search_patients, load_model_attention,
+        risk_forecast, model_attention_job,
+    )
+    from utils.risk import MODEL_TYPES
+    from utils.jobs import JobQueueFull
+    from utils.attention import pool_bins
+    from utils.downsample import DOWNSAMPLING_MODES
+    from utils.figures import EEG_RENDER_MODES
+    from utils.instrumentation import record, timed
+elif page == "Proposed Grants":
+    import streamlit.components.v1 as components
+    from utils.slide_server import slide_server
+elif page == "Performance":
+    import json
+    import pandas as pd
+    from utils.instrumentation import (
+        PROFILE_ENV, PROFILE_MODES, ROLLING_SAMPLES, counters, profile_report, profile_sections, reset, section_stats,
+        snapshot,
+    )
+
+with st.sidebar:
     if page == "EEG Dashboard":
         st.markdown("### Patient Selection")
         patient_search = st.text_input("Search patients...")
-
-        # Sample patient data
-        st.markdown("<div class='patient-card'>Patient ID: 28791<br>Status: Post-seizure monitoring</div>", unsafe_allow_html=True)
+        if patient_search.strip():
+            matches, total_matches, patient_search_ms = search_patients(patient_search, k=10)
+            if matches:
+                st.dataframe(pd.DataFrame(matches)[["patient_id", "status", "age", "sex", "medication"]],
+                             hide_index=True, use_container_width=True)
+            else:
+                st.info("No matching patients")
+            st.caption(f"{total_matches:,} of {len(load_patient_registry()):,} patients in {patient_search_ms:.1f} ms")
+
+        # Current patient, from the registry
+        patient_record = load_patient_registry().get("28791") or {"patient_id": "28791", "status": "Unknown"}
+        st.markdown(f"<div class='patient-card'>Patient ID: {patient_record['patient_id']}<br>"
+                    f"Status: {patient_record['status']}</div>", unsafe_allow_html=True)
+        recording_source = st.selectbox("Recording", ["Synthetic recording"] + list_edf_files())
+        live_mode = st.toggle("Live monitoring", value=False)
 
         st.markdown("### Model Configuration")
         attention_layer = st.selectbox("Attention Visualization", ["Transformer Layer 1", "Transformer Layer 2", "Transformer Layer 3", "Transformer Layer 4"])
-        time_window = st.selectbox("Time Window", ["Last 5 minutes", "Last 15 minutes", "Last 30 minutes", "Last 1 hour"])
+        time_window = st.selectbox("Time Window", ["Last 30 seconds", "Last 5 minutes", "Last 15 minutes", "Last 30 minutes",
+                                                    "Last 1 hour", "Last 6 hours", "Last 24 hours"])
+        downsampling_label = st.selectbox("EEG Downsampling", list(DOWNSAMPLING_MODES))
+        eeg_render_mode = st.radio("EEG Render Mode", EEG_RENDER_MODES, horizontal=True)
 
-        st.markdown("### Similar Cases")
-        # Create sample similar cases
-        similar_cases = [
-            {"id": "17382", "similarity": "87%", "selected": True},
-            {"id": "29104", "similarity": "72%", "selected": False},
-            {"id": "15209", "similarity": "64%", "selected": False}
-        ]
-
-        for case in similar_cases:
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.markdown(f"<div class='similar-case'>Case #{case['id']}<br>Similarity: {case['similarity']}</div>", unsafe_allow_html=True)
-            with col2:
-                case["selected"] = st.checkbox("View", value=case["selected"], key=f"case_{case['id']}")
-
-        view_all = st.button("View All Similar Cases")
 
     elif page == "Proposed Grants":
         st.markdown("### Grant Type")
 
-# Function to generate synthetic EEG data
-def generate_eeg_data(channels, seconds, sample_rate=250):
-    """Generate synthetic EEG data for visualization"""
-    time = np.arange(0, seconds, 1/sample_rate)
-    eeg_data = {}
-
-    base_freqs = {
-        'Fp1': 10, 'Fp2': 11, 'F3': 9, 'F4': 10,
-        'C3': 12, 'C4': 11, 'P3': 8, 'P4': 9,
-        'O1': 10, 'O2': 11, 'T3': 9, 'T4': 10,
-        'T5': 12, 'T6': 11
-    }
-
-    # Generate synthetic data for each channel
-    for channel in channels:
-        base_freq = base_freqs.get(channel, 10)  # Hz
-
-        # Base signal (alpha wave)
-        signal = np.sin(2 * np.pi * base_freq * time)
-
-        # Add some beta
-        signal += 0.3 * np.sin(2 * np.pi * (base_freq*2) * time)
-
-        # Add some theta
-        signal += 0.2 * np.sin(2 * np.pi * (base_freq/2) * time)
-
-        # Add noise
-        signal += 0.1 * np.random.randn(len(time))
-
-        # Create abnormality in F3 channel between 15-20 seconds (spike and wave)
-        if channel == 'F3' and seconds > 20:
-            # Add spike-wave pattern
-            spike_start = int(15 * sample_rate)
-            spike_end = int(20 * sample_rate)
-
-            for i in range(spike_start, spike_end, int(0.3 * sample_rate)):
-                if i + int(0.05 * sample_rate) < len(signal):
-                    signal[i:i+int(0.05*sample_rate)] = 2 * np.sin(2 * np.pi * 30 * time[0:int(0.05*sample_rate)])
-
-                    # Fix for the shape mismatch error
-                    wave_length = int(0.2*sample_rate) - int(0.05*sample_rate)
-                    if i + int(0.2*sample_rate) <= len(signal) and wave_length <= len(time):
-                        signal[i+int(0.05*sample_rate):i+int(0.2*sample_rate)] = -1 * np.sin(2 * np.pi * 3 * time[0:wave_length])
-
-        eeg_data[channel] = signal
-
-    return time, eeg_data
-
-# Function to generate attention heatmap data
-def generate_attention_data(channels, seconds, sample_rate=250):
-    """Generate synthetic attention data"""
-    # Number of time bins (5 per second)
-    time_bins = int(seconds / 0.2)
-    attention_data = np.zeros((len(channels), time_bins))
-
-    # Create high attention area in F3
-    f3_idx = channels.index('F3') if 'F3' in channels else 0
-    f4_idx = channels.index('F4') if 'F4' in channels else 1
-
-    # Add high attention to F3 in the abnormal region
-    high_attn_start = int(15 / 0.2)
-    high_attn_end = int(20 / 0.2)
-    attention_data[f3_idx, high_attn_start:high_attn_end] = np.random.uniform(0.7, 0.9, high_attn_end-high_attn_start)
-
-    # Add medium attention to F4 in the same region
-    attention_data[f4_idx, high_attn_start:high_attn_end] = np.random.uniform(0.3, 0.5, high_attn_end-high_attn_start)
-
-    # Add some random low attention
-    for i in range(len(channels)):
-        for j in range(time_bins):
-            if attention_data[i, j] == 0:
-                attention_data[i, j] = np.random.uniform(0, 0.3)
-
-    return attention_data
-
 # Main content based on selected page
 if page == "EEG Dashboard":
 
-    # Advanced options (collapsible)
+    # Identifies this session's background jobs, so the shared job pool can schedule sessions fairly
+    session_id = st.session_state.setdefault("session_id", uuid.uuid4().hex)
+
+    # Advanced options (collapsible). Inputs of several panels live here and rerun the page; the export
+    # controls are a panel of their own, placed here once the forecast is known
     with st.expander("Advanced Analysis Options", expanded=True):
         col_adv1, col_adv2, col_adv3 = st.columns(3)
 
         with col_adv1:
-            st.selectbox("Statistical Test", ["Pearson Correlation", "Spearman Correlation", "Chi-squared", "ANOVA"])
             st.multiselect("Additional Features", ["Heart Rate", "Blood Pressure", "Respiration", "Temperature", "Movement"])
 
         with col_adv2:
-            st.selectbox("Model Type", ["Transformer", "CNN-LSTM", "XGBoost", "Ensemble"])
-            st.number_input("Confidence Threshold", min_value=0.5, max_value=0.95, value=0.7, step=0.05)
+            model_type = st.selectbox("Model Type", list(MODEL_TYPES))
+            confidence_threshold = st.number_input("Confidence Threshold", min_value=0.5, max_value=0.95, value=0.7,
+                                                   step=0.05, help="Confidence level of the risk forecast intervals")
 
         with col_adv3:
-            st.selectbox("Export Format", ["CSV", "JSON", "PDF Report", "DICOM"])
-            st.button("Generate Report")
+            export_slot = st.container()
 
 
     # Main content layout with columns
@@ -209,61 +166,117 @@ if page == "EEG Dashboard":
     # EEG Channels to display
     channels = ['Fp1', 'Fp2', 'F3', 'F4', 'C3', 'C4', 'P3', 'P4', 'O1', 'O2', 'T3', 'T4']
 
-    # Generate EEG data for 30 seconds
-    time_array, eeg_data = generate_eeg_data(channels, seconds=30)
+    # Approximate rendered width of the EEG column, used to cap points per trace
+    eeg_plot_width_px = 1000
+
+    # Patient recording, memory-mapped from DATA_PATH; the synthetic one is created on first use
+    patient_id = 28791
+    patient_seed = 28791
+    if recording_source == "Synthetic recording":
+        recording = open_recording(ensure_synthetic_recording(patient_id, channels, seconds=3600, seed=patient_seed))
+    else:
+        recording = open_recording(os.path.join(data_path(), recording_source))
+        channels = recording.channels
+
+    # Similar cases, retrieved from the case-embedding index; rendered at the end of the sidebar
+    with st.sidebar:
+        st.markdown("### Similar Cases")
+        similar_cases, cohort_size, search_ms = find_similar_cases(recording.path, k=3)
+
+        for rank, case in enumerate(similar_cases):
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                st.markdown(f"<div class='similar-case'>Case #{case['id']}<br>Similarity: {case['similarity']:.0%}</div>", unsafe_allow_html=True)
+            with col2:
+                case["selected"] = st.checkbox("View", value=rank == 0, key=f"case_{case['id']}")
+
+        view_all = st.button("View All Similar Cases")
+        if view_all:
+            all_cases, cohort_size, search_ms = find_similar_cases(recording.path, k=50)
+            st.dataframe(pd.DataFrame(all_cases).assign(similarity=lambda df: (df["similarity"] * 100).round(1)),
+                         hide_index=True, use_container_width=True)
+        st.caption(f"Searched {cohort_size:,} cases in {search_ms:.1f} ms")
+
+    # The time window sets how much of the recording is visible; the slider pans it, starting at the end
+    time_windows = {"Last 30 seconds": 30, "Last 5 minutes": 300, "Last 15 minutes": 900, "Last 30 minutes": 1800,
+                    "Last 1 hour": 3600, "Last 6 hours": 21600, "Last 24 hours": 86400}
+    view_seconds = int(min(time_windows[time_window], max(1, recording.duration)))
+    span_start = 0
+    span_end = int(max(0, recording.duration - view_seconds))
+    slider_key = f"time_slider_{time_window}"
+    window_start = st.session_state.get(slider_key, span_end)
+
+    # Long windows are drawn from the coarsest pyramid level that still fills the plot width;
+    # short ones read raw samples, as a zero-copy view into the memory map
+    with timed("data.eeg_window"):
+        pyramid = open_pyramid(recording.path)
+        pyramid.update(recording)
+        lo, hi = recording.sample_range(window_start, view_seconds)
+        envelope = pyramid.envelope(lo, hi, eeg_plot_width_px)
+        if envelope is None:
+            time_array, eeg_data = recording.read_window(window_start, view_seconds)
+        else:
+            time_array, eeg_data = envelope
+    events = recording.annotations_in(window_start, window_start + view_seconds)
+
+    # The viewed window, shared by the panels. data_key holds the inputs that determine the displayed data;
+    # any other widget change reuses the cached figures
+    view = {
+        "path": recording.path, "channels": channels, "seed": patient_seed, "start": window_start,
+        "seconds": view_seconds, "time": time_array, "eeg": eeg_data, "envelope": envelope, "events": events,
+        "plot_width": eeg_plot_width_px, "data_key": (recording.path, tuple(channels), window_start, view_seconds, hi),
+    }
 
-    # Generate attention data
-    attention_data = generate_attention_data(channels, seconds=30)
+    # Longest window run through the attention model during the rerun, and the longest run on the job pool;
+    # longer ones use precomputed or generated maps
+    max_inference_seconds = 900
+    max_background_inference_seconds = 21600
+
+    # Attention data in 0.2 s bins. Windows up to max_inference_seconds go through the model once, capturing every
+    # layer, so the layer selector only indexes the cached result. Longer windows are queued on the job pool and
+    # meanwhile come from the precomputed artifacts when the batch command has run, otherwise generated.
+    # Pooled to the plot width for long windows
+    inference = None
+    attention_job = None
+    if view_seconds <= max_inference_seconds:
+        inference = load_model_attention(recording.path, window_start, view_seconds)
+    elif view_seconds <= max_background_inference_seconds:
+        try:
+            attention_job = model_attention_job(recording.path, window_start, view_seconds, owner=session_id)
+            if attention_job is None:
+                inference = load_model_attention(recording.path, window_start, view_seconds)
+        except JobQueueFull:
+            # This session's queue is full: stay on the fallback map until the next rerun
+            pass
+    if inference is not None:
+        layers = inference["attention"]
+        attention_data = layers[min(int(attention_layer.split()[-1]), len(layers)) - 1]
+        attention_source = "model"
+    else:
+        attention_data = load_precomputed(recording.path, "attention", window_start, view_seconds)
+        attention_source = "precomputed"
+        if attention_data is None:
+            attention_source = "generated"
+            attention_data = load_attention(tuple(channels), seconds=view_seconds, seed=patient_seed,
+                                            start=window_start, events=events)
+    # The full-resolution map feeds the highlighted regions and the export; the heatmap gets the pooled one
+    full_attention = attention_data
+    attention_data, attention_bin_width = pool_bins(attention_data, max_bins=eeg_plot_width_px // 2)
+    # Which map is shown, for the panels' cache keys: the source changes when a background model pass or the
+    # precomputed artifacts become available, the digest of the pooled map when their contents change
+    view["attention_key"] = (attention_source, array_digest(attention_data))
+
+    # Each panel below is a fragment: widgets inside one rerun that panel alone, while the sidebar, the
+    # advanced options and the timeline slider rerun the page and with it every panel
 
     # EEG plot with attention highlights
     with col1:
         st.markdown("<div class='section-header'>EEG with Attention Highlights</div>", unsafe_allow_html=True)
 
-        # Create EEG visualization with plotly
-        fig = make_subplots(rows=len(channels), cols=1, shared_xaxes=True, vertical_spacing=0.01,
-                            subplot_titles=channels)
-
-        for i, channel in enumerate(channels):
-            # Add EEG trace
-            fig.add_trace(
-                go.Scatter(
-                    x=time_array,
-                    y=eeg_data[channel],
-                    name=channel,
-                    line=dict(color='#2c3e50', width=1),
-                ),
-                row=i+1, col=1
-            )
-
-            # Add highlight for high attention regions (if F3 channel)
-            if channel == 'F3':
-                fig.add_vrect(
-                    x0=15, x1=20,
-                    fillcolor="rgba(231, 76, 60, 0.2)",
-                    opacity=0.8,
-                    layer="below", line_width=0,
-                    row=i+1, col=1
-                )
-
-                # Add annotation for high attention region
-                fig.add_annotation(
-                    x=17.5, y=min(eeg_data[channel]),
-                    text="High Attention Region",
-                    showarrow=False,
-                    font=dict(color="rgb(231, 76, 60)"),
-                    row=i+1, col=1
-                )
-
-        # Update layout
-        fig.update_layout(
-            height=600,
-            showlegend=False,
-            margin=dict(l=50, r=20, t=10, b=50),
-        )
-
-        fig.update_xaxes(title_text="Time (s)", row=len(channels), col=1)
-
-        st.plotly_chart(fig, use_container_width=True)
+        if live_mode:
+            live_eeg_panel(view, eeg_render_mode, downsampling_label)
+        else:
+            eeg_panel(view, eeg_render_mode, downsampling_label, full_attention, attention_layer)
 
         # Channel selection
         st.markdown("**Channels:** Fp1, Fp2, F3, F4, C3, C4, P3, P4, O1, O2, T3, T4, T5, T6")
@@ -272,22 +285,7 @@ if page == "EEG Dashboard":
     with col2:
         st.markdown("<div class='section-header'>Attention Map</div>", unsafe_allow_html=True)
 
-        # Create heatmap for attention
-        fig = px.imshow(
-            attention_data,
-            labels=dict(x="Time (s)", y="Channel", color="Attention Score"),
-            x=[f"{i*0.2:.1f}" for i in range(attention_data.shape[1])],
-            y=channels,
-            color_continuous_scale='Reds',
-            aspect="auto"
-        )
-
-        fig.update_layout(
-            height=600,
-            margin=dict(l=50, r=20, t=10, b=50),
-        )
-
-        st.plotly_chart(fig, use_container_width=True)
+        attention_panel(view, attention_data, attention_bin_width, attention_layer, attention_job, attention_source)
 
         # Legend
         cols = st.columns(3)
@@ -301,6 +299,18 @@ if page == "EEG Dashboard":
             st.color_picker("Low Attention", "#ffeaa7", disabled=True)
             st.markdown("Low Attention")
 
+    # Seizure risk for the next 24 hours from the hour of EEG before the end of the view, with bootstrap
+    # intervals at the confidence threshold
+    forecast = risk_forecast(recording.path, window_start + view_seconds, model_type, round(confidence_threshold, 2),
+                             str(patient_id), time.localtime().tm_hour)
+
+    # Export of the current view, under the advanced options
+    with export_slot:
+        export_panel(view, full_attention, forecast, inference, owner=session_id,
+                     metadata={"patient_id": str(patient_id), "model_type": model_type,
+                               "confidence_level": round(confidence_threshold, 2), "attention_layer": attention_layer,
+                               "events": events})
+
     # Clinical variables and model interpretation
     st.markdown("<div class='section-header'>Clinical Variables and Model Interpretation</div>", unsafe_allow_html=True)
 
@@ -308,63 +318,11 @@ if page == "EEG Dashboard":
 
     # Influential clinical variables
     with col3:
-        st.markdown("#### Influential Clinical Variables")
-
-        # Create dataframe for clinical variables
-        clinical_vars = pd.DataFrame({
-            'Variable': [
-                'Prior Seizure History',
-                'EEG Abnormalities (F3)',
-                'Age',
-                'Medications (Levetiracetam)',
-                'Sleep Deprivation',
-                'Structural Lesion',
-                'Genetic Factors'
-            ],
-            'Importance': [0.72, 0.91, 0.36, 0.48, 0.58, 0.24, 0.17]
-        })
-
-        # Create horizontal bar chart
-        fig = px.bar(
-            clinical_vars,
-            x='Importance',
-            y='Variable',
-            orientation='h',
-            color='Importance',
-            color_continuous_scale=['#3498db', '#e74c3c'],
-            range_color=[0, 1]
-        )
-
-        fig.update_layout(
-            height=400,
-            margin=dict(l=0, r=0, t=10, b=10),
-            yaxis=dict(autorange="reversed"),
-        )
-
-        st.plotly_chart(fig, use_container_width=True)
+        clinical_panel()
 
     # Case-based reasoning
     with col4:
-        st.markdown("#### Case-Based Reasoning")
-
-        st.markdown("<div class='info-box'>", unsafe_allow_html=True)
-        st.markdown("**Similar Case #17382:**")
-        st.markdown("• 32-year-old male with similar F3 discharge pattern")
-        st.markdown("• Developed seizure within 4 hours of recording")
-        st.markdown("• Responded to increased Levetiracetam dosage")
-        st.markdown("</div>", unsafe_allow_html=True)
-
-        st.markdown("<div class='info-box'>", unsafe_allow_html=True)
-        st.markdown("**Model Prediction:**")
-        st.markdown("<span class='highlight-text'>67% probability of seizure within next 6 hours</span>", unsafe_allow_html=True)
-        st.markdown("Confidence interval: 54%-79%")
-        st.markdown("</div>", unsafe_allow_html=True)
-
-        st.markdown("<div class='info-box'>", unsafe_allow_html=True)
-        st.markdown("**Recommended Actions:**")
-        st.markdown("1. Increase monitoring frequency")
-        st.markdown("2. Consider prophylactic medication adjustment")
-        st.markdown("</div>", unsafe_allow_html=True)
+        prediction_panel(forecast, confidence_threshold, model_type)
 
     # Additional interactive elements
     st.markdown("<div class='section-header'>Interactive Analysis</div>", unsafe_allow_html=True)
@@ -374,99 +332,17 @@ if page == "EEG Dashboard":
     # Add time slider for EEG navigation
     with col5:
         st.markdown("#### EEG Navigation")
-        time_slider = st.slider("Navigate EEG timeline (seconds)", 0, 120, 30)
+        if span_end > span_start:
+            time_slider = st.slider("Navigate EEG timeline (seconds)", span_start, span_end, span_end, key=slider_key)
+        else:
+            st.caption("The time window covers the whole recording.")
 
         # Seizure risk over time
-        st.markdown("#### Seizure Risk Prediction Over Time")
-
-        # Generate risk prediction data
-        hours = list(range(24))
-        base_risk = [0.2, 0.25, 0.3, 0.4, 0.55, 0.67, 0.72, 0.65, 0.6, 0.5, 0.45, 0.4,
-                    0.35, 0.3, 0.28, 0.25, 0.23, 0.2, 0.18, 0.15, 0.14, 0.13, 0.12, 0.1]
-
-        # Add confidence intervals
-        ci_lower = [max(0, r - 0.12) for r in base_risk]
-        ci_upper = [min(1, r + 0.12) for r in base_risk]
-
-        # Create the line chart with confidence interval
-        fig = go.Figure([
-            go.Scatter(
-                name='Upper Bound',
-                x=hours,
-                y=ci_upper,
-                mode='lines',
-                marker=dict(color="#444"),
-                line=dict(width=0),
-                showlegend=False
-            ),
-            go.Scatter(
-                name='Lower Bound',
-                x=hours,
-                y=ci_lower,
-                marker=dict(color="#444"),
-                line=dict(width=0),
-                mode='lines',
-                fillcolor='rgba(231, 76, 60, 0.2)',
-                fill='tonexty',
-                showlegend=False
-            ),
-            go.Scatter(
-                name='Seizure Risk',
-                x=hours,
-                y=base_risk,
-                mode='lines',
-                line=dict(color='rgb(231, 76, 60)'),
-                showlegend=True
-            )
-        ])
-
-        fig.update_layout(
-            height=300,
-            title='Predicted Seizure Risk',
-            yaxis_title='Probability',
-            xaxis_title='Hours from Now',
-            hovermode="x",
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
-        )
-
-        st.plotly_chart(fig, use_container_width=True)
+        risk_panel(forecast)
 
     # Feature correlation matrix
     with col6:
-        st.markdown("#### Feature Correlation Analysis")
-
-        # Generate correlation data
-        features = ['Age', 'Seizure History', 'F3 Spikes', 'Sleep Dep.', 'Med. Adherence', 'Lesion Size']
-        corr_matrix = np.array([
-            [1.0, 0.2, 0.15, 0.1, 0.05, 0.25],
-            [0.2, 1.0, 0.45, 0.3, 0.15, 0.4],
-            [0.15, 0.45, 1.0, 0.6, 0.3, 0.5],
-            [0.1, 0.3, 0.6, 1.0, 0.2, 0.1],
-            [0.05, 0.15, 0.3, 0.2, 1.0, 0.05],
-            [0.25, 0.4, 0.5, 0.1, 0.05, 1.0]
-        ])
-
-        # Create heatmap
-        fig = px.imshow(
-            corr_matrix,
-            labels=dict(x="Feature", y="Feature", color="Correlation"),
-            x=features,
-            y=features,
-            color_continuous_scale='RdBu_r',
-            zmin=-1.0, zmax=1.0
-        )
-
-        fig.update_layout(
-            height=300,
-            margin=dict(l=10, r=10, t=10, b=10),
-        )
-
-        st.plotly_chart(fig, use_container_width=True)
-
-        # Add interactive threshold selector for attention visualization
-        st.markdown("#### Attention Threshold Adjustment")
-        attention_threshold = st.slider("Highlight threshold for attention scores", 0.0, 1.0, 0.5, 0.05)
-        st.markdown(f"Regions with attention scores above **{attention_threshold}** will be highlighted")
+        correlation_panel()
 
 
     # Footer with sample metrics
@@ -477,7 +353,20 @@ if page == "EEG Dashboard":
         st.metric(label="Model Accuracy", value="83%", delta="1.2%")
 
     with metric_cols[1]:
-        st.metric(label="Prediction Time", value="1.2 sec", delta="-0.3 sec")
+        # Model inference time per 10 s window, against the previous forward pass in this session; cached
+        # results keep their original measurement
+        if inference is not None and inference["n_windows"]:
+            timing = st.session_state.setdefault("prediction_ms", {"current": None, "previous": None})
+            if inference["window_ms"] != timing["current"]:
+                timing.update(previous=timing["current"], current=inference["window_ms"])
+            prediction_ms, previous_ms = timing["current"], timing["previous"]
+            st.metric(label="Prediction Time", value=f"{prediction_ms:.1f} ms",
+                      delta=None if previous_ms is None else f"{prediction_ms - previous_ms:+.1f} ms",
+                      delta_color="inverse", help="Attention model inference per 10 s window, all channels")
+        else:
+            st.metric(label="Prediction Time", value="n/a",
+                      help=f"Shown once the model has run on the window; windows over "
+                           f"{max_background_inference_seconds // 3600} hours use precomputed attention")
 
     with metric_cols[2]:
         st.metric(label="False Positive Rate", value="12%", delta="-2.4%")
@@ -485,10 +374,24 @@ if page == "EEG Dashboard":
     with metric_cols[3]:
         st.metric(label="Data Points Analyzed", value="24,892", delta="1,204")
 
+    # Cache effectiveness across reruns
+    with st.expander("Cache Statistics"):
+        st.dataframe(pd.DataFrame(cache_stats()), use_container_width=True, hide_index=True)
+
+    # Time spent in each panel, in full page reruns and in reruns of the panel alone, as of this full rerun
+    with st.expander("Panel Timings"):
+        st.dataframe(pd.DataFrame(panel_timings()), use_container_width=True, hide_index=True)
+
+    # This session's jobs on the shared pool
+    with st.expander("Background Jobs"):
+        jobs_panel(session_id)
+
+    # Whole-page rerun time, from the top of the script
+    record("page.eeg_dashboard", (time.perf_counter() - run_start) * 1000)
+
 
 elif page == "Proposed Grants":
     st.markdown("<div class='main-header'>Grant Proposals</div>", unsafe_allow_html=True)
-    import streamlit.components.v1 as components
     grant_options = {
         "NIH K99/R00": "k99r00",
         "NSF CAREER": "nsf-career",
@@ -496,8 +399,18 @@ elif page == "Proposed Grants":
     }
     grant_label = st.selectbox("Select Grant Slide Deck", list(grant_options.keys()))
     grant_route = grant_options[grant_label]
-    react_url = f"http://localhost:3000/{grant_route}"
-    components.iframe(react_url, height=900, width=1100)
+    # Decks are served from the react-slides production build by this process; SLIDES_URL sets the address
+    # browsers reach it at when that is not localhost
+    try:
+        server = slide_server()
+    except OSError as exc:
+        server = None
+        st.error(f"Slide server could not start on port {os.environ.get('SLIDES_PORT', 3000)}: {exc}")
+    else:
+        if server is None:
+            st.info("The slide decks have not been built yet; run 'npm run build' in react-slides.")
+    if server is not None:
+        components.iframe(server.url(grant_route, base=os.environ.get("SLIDES_URL")), height=900, width=1100)
 
 elif page == 'Slide Deck (Alignment/Proposed-Contributions)':
     st.markdown("### Slide Deck (Alignment/Proposed-Contributions)")
@@ -511,3 +424,41 @@ elif page == 'Slide Deck (Alignment/Proposed-Contributions)':
             title="NeuroAI Job Interview">
     </iframe>
     """, unsafe_allow_html=True)
+
+elif page == "Performance":
+    st.markdown("<div class='main-header'>Performance</div>", unsafe_allow_html=True)
+    st.caption(f"Timed sections of this server process across all sessions: percentiles over the last "
+               f"{ROLLING_SAMPLES} timings of each, slowest p95 first. Cached functions are timed on cache "
+               f"misses only.")
+
+    col_refresh, col_reset, col_export = st.columns(3)
+    with col_refresh:
+        st.button("Refresh")
+    with col_reset:
+        if st.button("Reset"):
+            reset()
+    with col_export:
+        st.download_button("Export JSON", data=json.dumps(snapshot(), indent=2),
+                           file_name=f"dashboard_performance_{time.strftime('%Y%m%d-%H%M%S')}.json",
+                           mime="application/json", on_click="ignore")
+
+    sections = section_stats()
+    if sections:
+        st.dataframe(pd.DataFrame(sections), use_container_width=True, hide_index=True)
+    else:
+        st.info("Nothing timed yet; open the EEG Dashboard first.")
+
+    counts = counters()
+    if counts:
+        st.markdown("#### Counters")
+        st.dataframe(pd.DataFrame({"counter": list(counts), "count": list(counts.values())}),
+                     use_container_width=True, hide_index=True)
+
+    st.markdown("#### Profiles")
+    if "tracemalloc" not in PROFILE_MODES:
+        st.caption(f"Memory peaks of the outermost timed sections are recorded when {PROFILE_ENV} includes tracemalloc.")
+    if profile_sections():
+        profiled = st.selectbox("Section", profile_sections())
+        st.code(profile_report(profiled), language=None)
+    else:
+        st.caption(f"Start the server with {PROFILE_ENV}=cprofile to profile the outermost timed sections.")
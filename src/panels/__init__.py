@@ -0,0 +1,80 @@
+import functools
+import time
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from utils.instrumentation import count, timed
+
+# Session-state key of the per-panel run timings
+PANEL_TIMINGS_KEY = "panel_timings"
+
+
+def _fragment_run():
+    """Whether the current script run reruns fragments only, rather than the whole page"""
+    ctx = get_script_run_ctx()
+    return bool(ctx is not None and ctx.fragment_ids_this_run)
+
+
+def panel(name, run_every=None):
+    """
+    Render the decorated function as a Streamlit fragment and time each of its runs
+
+    Widgets created inside a panel rerun only that panel; a full rerun, from a widget
+    outside every panel, runs all of them with the arguments of that run. Each run's
+    wall time is recorded under ``name`` in the session, split by whether the panel ran
+    alone or as part of a full rerun, and as section ``panel.<name>`` of the process-wide
+    instrumentation.
+
+    Args:
+        name (str): Panel name shown in the timings
+        run_every (float): Seconds between automatic reruns of the panel, or None
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def run(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                with timed(f"panel.{name}"):
+                    return fn(*args, **kwargs)
+            finally:
+                _record(name, (time.perf_counter() - start) * 1000, _fragment_run())
+
+        return st.fragment(run, run_every=run_every)
+
+    return decorate
+
+
+def _record(name, elapsed_ms, alone):
+    if alone:
+        count(f"panel_reruns.{name}")
+    timings = st.session_state.setdefault(PANEL_TIMINGS_KEY, {})
+    timing = timings.setdefault(name, {"panel": name, "full_runs": 0, "panel_runs": 0, "last_ms": 0.0,
+                                       "total_ms": 0.0, "last_run": None})
+    timing["panel_runs" if alone else "full_runs"] += 1
+    timing["last_ms"] = elapsed_ms
+    timing["total_ms"] += elapsed_ms
+    timing["last_run"] = "panel" if alone else "full"
+
+
+def panel_timings():
+    """Run counts and times of every panel in this session, with the mean time per run"""
+    rows = []
+    for timing in st.session_state.get(PANEL_TIMINGS_KEY, {}).values():
+        runs = timing["full_runs"] + timing["panel_runs"]
+        rows.append(dict(timing, mean_ms=timing["total_ms"] / runs if runs else 0.0))
+    return rows
+
+
+def plotly_chart(fig, target=None):
+    """
+    ``st.plotly_chart`` at full width, timed as section ``render.plotly_chart``
+
+    Serializing the figure to JSON happens in this call and is often the largest part
+    of drawing a chart.
+
+    Args:
+        target: Container or placeholder to draw in; the current one when None
+    """
+    with timed("render.plotly_chart"):
+        (target or st).plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,45 @@
+import streamlit as st
+
+from panels import panel, plotly_chart
+from panels.jobs import job_panel
+from utils.attention import pool_bins
+from utils.cache import session_cache
+from utils.dashboard_data import load_band_powers, load_precomputed
+from utils.figures import build_attention_figure
+from utils.spectral import BANDS
+
+# Longest window whose band powers are computed from raw samples on demand
+MAX_BAND_POWER_SECONDS = 3600
+
+
+@panel("Attention map")
+def attention_panel(view, attention_data, bin_width, attention_layer, attention_job=None, attention_source="model"):
+    """Attention heatmap of the viewed window, with an optional band-power overlay chosen inside the panel"""
+    # Optional band-power contours, computed on the same 0.2 s grid as the attention bins
+    band_overlay = st.selectbox("Band Power Overlay", ["None"] + [band.capitalize() for band in BANDS])
+    overlay = None
+    if band_overlay != "None":
+        powers = load_precomputed(view["path"], "band_powers", view["start"], view["seconds"])
+        if powers is None and view["seconds"] <= MAX_BAND_POWER_SECONDS:
+            powers = load_band_powers(view["path"], view["start"], view["seconds"])
+        if powers is not None:
+            overlay, _ = pool_bins(powers[list(BANDS).index(band_overlay.lower())],
+                                   max_bins=view["plot_width"] // 2)
+        else:
+            st.caption("Band power overlays beyond 1 hour need scripts/precompute_artifacts.py.")
+
+    # Create heatmap for attention
+    fig = session_cache("figures", maxsize=16).get_or_compute(
+        ("attention", attention_layer, band_overlay) + view["attention_key"] + view["data_key"],
+        lambda: build_attention_figure(attention_data, view["channels"], bin_width=bin_width,
+                                       start=view["start"], overlay=overlay,
+                                       overlay_name=f"Relative {band_overlay.lower()} power")
+    )
+
+    plotly_chart(fig)
+
+    if attention_job is not None:
+        job_panel(attention_job, lambda job: st.caption(
+            f"Attention model {job['status']}{': ' + job['error'] if job['error'] else ''}; "
+            f"showing {attention_source} attention"))
+
@@ -0,0 +1,78 @@
+import pandas as pd
+import streamlit as st
+
+from panels import panel, plotly_chart
+from utils.cache import make_key, session_cache
+from utils.figures import build_clinical_figure, build_risk_figure
+
+
+@panel("Clinical variables")
+def clinical_panel():
+    """Influential clinical variables"""
+    st.markdown("#### Influential Clinical Variables")
+
+    # Create dataframe for clinical variables
+    clinical_vars = pd.DataFrame({
+        'Variable': [
+            'Prior Seizure History',
+            'EEG Abnormalities (F3)',
+            'Age',
+            'Medications (Levetiracetam)',
+            'Sleep Deprivation',
+            'Structural Lesion',
+            'Genetic Factors'
+        ],
+        'Importance': [0.72, 0.91, 0.36, 0.48, 0.58, 0.24, 0.17]
+    })
+
+    # Create horizontal bar chart
+    fig = session_cache("figures", maxsize=16).get_or_compute(
+        make_key("clinical", clinical_vars['Variable'].tolist(), clinical_vars['Importance'].tolist()),
+        lambda: build_clinical_figure(clinical_vars)
+    )
+
+    plotly_chart(fig)
+
+
+@panel("Case-based reasoning")
+def prediction_panel(forecast, confidence_threshold, model_type):
+    """Similar case, model prediction for the next 6 hours and recommended actions"""
+    st.markdown("#### Case-Based Reasoning")
+
+    st.markdown("<div class='info-box'>", unsafe_allow_html=True)
+    st.markdown("**Similar Case #17382:**")
+    st.markdown("• 32-year-old male with similar F3 discharge pattern")
+    st.markdown("• Developed seizure within 4 hours of recording")
+    st.markdown("• Responded to increased Levetiracetam dosage")
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    st.markdown("<div class='info-box'>", unsafe_allow_html=True)
+    st.markdown("**Model Prediction:**")
+    if forecast is not None:
+        within, within_lower, within_upper = forecast["horizon"]
+        st.markdown(f"<span class='highlight-text'>{within:.0%} probability of seizure within next 6 hours</span>",
+                    unsafe_allow_html=True)
+        st.markdown(f"{confidence_threshold:.0%} confidence interval: {within_lower:.0%}-{within_upper:.0%} ({model_type})")
+    else:
+        st.markdown("Not enough EEG for a risk prediction")
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    st.markdown("<div class='info-box'>", unsafe_allow_html=True)
+    st.markdown("**Recommended Actions:**")
+    st.markdown("1. Increase monitoring frequency")
+    st.markdown("2. Consider prophylactic medication adjustment")
+    st.markdown("</div>", unsafe_allow_html=True)
+
+
+@panel("Risk forecast")
+def risk_panel(forecast):
+    """Seizure risk over the next 24 hours with its confidence band"""
+    st.markdown("#### Seizure Risk Prediction Over Time")
+
+    if forecast is not None:
+        hours = list(range(len(forecast["risk"])))
+        fig = session_cache("figures", maxsize=16).get_or_compute(
+            make_key("risk", forecast["risk"], forecast["lower"], forecast["upper"]),
+            lambda: build_risk_figure(hours, forecast["risk"], forecast["lower"], forecast["upper"])
+        )
+        plotly_chart(fig)
@@ -0,0 +1,28 @@
+import streamlit as st
+
+from panels import panel, plotly_chart
+from utils.cache import make_key, session_cache
+from utils.correlation import COHORT_FEATURES, STATISTICS, STATISTIC_SCALES
+from utils.dashboard_data import cohort_correlation
+from utils.figures import build_correlation_figure
+
+
+@panel("Feature correlation")
+def correlation_panel():
+    """Cohort feature correlation under a statistic chosen inside the panel"""
+    st.markdown("#### Feature Correlation Analysis")
+    statistical_test = st.selectbox("Statistical Test", list(STATISTICS))
+
+    # Selected statistic over the whole cohort, from streaming accumulators shared by every statistic
+    features = list(COHORT_FEATURES)
+    corr_matrix, cohort_patients = cohort_correlation(statistical_test)
+    scale_label, scale_min, scale_max = STATISTIC_SCALES[statistical_test]
+
+    # Create heatmap
+    fig = session_cache("figures", maxsize=16).get_or_compute(
+        make_key("correlation", statistical_test, corr_matrix, features),
+        lambda: build_correlation_figure(corr_matrix, features, label=scale_label, zmin=scale_min, zmax=scale_max)
+    )
+
+    plotly_chart(fig)
+    st.caption(f"{scale_label} over {cohort_patients:,} patients")
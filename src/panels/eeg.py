@@ -0,0 +1,104 @@
+import time
+
+import numpy as np
+import streamlit as st
+
+from panels import panel, plotly_chart
+from utils.cache import session_cache
+from utils.dashboard_data import live_source
+from utils.downsample import DOWNSAMPLING_MODES, points_for_width
+from utils.figures import build_eeg_figure, build_eeg_stacked_figure, set_eeg_highlights, update_eeg_figure
+from utils.live_stream import LIVE_BUFFER_SECONDS
+from utils.regions import RegionIndex
+
+# Seconds between live EEG refreshes
+LIVE_REFRESH_SECONDS = 1.0
+
+# Highlighted regions closer than this many plot pixels are drawn as one
+HIGHLIGHT_MERGE_PIXELS = 2
+
+
+def _eeg_builder(eeg_render_mode):
+    return build_eeg_stacked_figure if eeg_render_mode == "Stacked (WebGL)" else build_eeg_figure
+
+
+@panel("EEG")
+def eeg_panel(view, eeg_render_mode, downsampling_label, attention, attention_layer):
+    """
+    EEG of the viewed window with its high-attention regions shaded
+
+    Regions are the above-threshold runs of the full-resolution attention map, indexed
+    once per threshold; the threshold slider reruns this panel only, which re-shades the
+    cached figure instead of rebuilding it.
+    """
+    # Long windows come as a pyramid envelope, already reduced to the plot width
+    downsampling = DOWNSAMPLING_MODES[downsampling_label] if view["envelope"] is None else None
+    max_points = points_for_width(view["plot_width"])
+    build_eeg = _eeg_builder(eeg_render_mode)
+    fig = session_cache("figures", maxsize=16).get_or_compute(
+        ("eeg", eeg_render_mode, downsampling, max_points) + view["data_key"],
+        lambda: build_eeg(view["time"], view["eeg"], view["channels"], max_points=max_points,
+                          downsampling=downsampling)
+    )
+    chart = st.empty()
+
+    st.markdown("#### Attention Threshold Adjustment")
+    threshold = st.slider("Highlight threshold for attention scores", 0.0, 1.0, 0.5, 0.05)
+    regions = session_cache("regions", maxsize=8).get_or_compute(
+        ("regions", attention_layer, threshold) + view["attention_key"] + view["data_key"],
+        lambda: RegionIndex.from_attention(attention, view["channels"], threshold, start=view["start"])
+    )
+    highlights = regions.highlights(view["start"], view["start"] + view["seconds"],
+                                    min_gap=HIGHLIGHT_MERGE_PIXELS * view["seconds"] / view["plot_width"])
+    set_eeg_highlights(fig, highlights)
+    plotly_chart(fig, target=chart)
+    st.caption(f"{len(regions):,} regions with attention scores of at least {threshold:.2f}, "
+               f"drawn as {len(highlights)} highlights")
+
+
+@panel("Live EEG", run_every=LIVE_REFRESH_SECONDS)
+def live_eeg_panel(view, eeg_render_mode, downsampling_label):
+    """
+    Live EEG, rerun on a timer
+
+    Each tick pulls the samples that arrived since the last one from the shared ring
+    buffer and swaps them into the session's existing figure.
+    """
+    channels = view["channels"]
+    source = live_source(tuple(channels), seed=view["seed"])
+    live_samples = int(min(view["seconds"], LIVE_BUFFER_SECONDS) * source.sample_rate)
+    live_downsampling = DOWNSAMPLING_MODES[downsampling_label]
+    max_points = points_for_width(view["plot_width"])
+    live_key = (tuple(channels), eeg_render_mode, live_downsampling, max_points, live_samples)
+
+    state = st.session_state.get("live_eeg")
+    if state is not None and state["key"] == live_key:
+        first, new, stamp = source.buffer.read_since(state["index"])
+    if state is None or state["key"] != live_key or first > state["index"]:
+        # First tick, changed settings, or this session fell behind the buffer: start over
+        first, new, stamp = source.buffer.read_latest(live_samples)
+        state = {"key": live_key, "data": new[:, :0], "fig": None}
+    samples = np.concatenate([state["data"], new], axis=1)[:, -live_samples:]
+    state.update(index=first + new.shape[1], data=samples)
+    st.session_state["live_eeg"] = state
+
+    if samples.shape[1] < 2:
+        st.info("Waiting for live samples...")
+        return
+
+    live_time = (state["index"] - samples.shape[1] + np.arange(samples.shape[1])) / source.sample_rate
+    if state["fig"] is None:
+        state["fig"] = _eeg_builder(eeg_render_mode)(live_time, samples, channels, max_points=max_points,
+                                                     downsampling=live_downsampling)
+    else:
+        update_eeg_figure(state["fig"], live_time, samples, channels, max_points=max_points,
+                          downsampling=live_downsampling)
+
+    latency_slot = st.empty()
+    plotly_chart(state["fig"])
+
+    # Newest sample's acquisition to the figure being handed to the browser
+    latency_ms = (time.time() - stamp) * 1000
+    latency_slot.metric("End-to-end latency", f"{latency_ms:.0f} ms")
+    st.caption(f"Live ring buffer: {len(channels)} channels, {LIVE_BUFFER_SECONDS} s, "
+               f"{source.buffer.nbytes / 1e6:.1f} MB")
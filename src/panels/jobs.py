@@ -0,0 +1,94 @@
+import os
+import time
+
+import streamlit as st
+
+from panels import panel
+from utils.dashboard_data import job_manager, start_export
+from utils.export import EXPORT_FORMATS, EXPORT_REQUIREMENTS, available_export_formats, export_mime
+from utils.jobs import DONE, FINAL_STATES, QUEUED, RUNNING, JobQueueFull
+
+# Seconds between progress checks of a running background job
+JOB_POLL_SECONDS = 0.5
+
+
+def job_panel(job_id, render_finished):
+    """Progress of a background job, polled until it ends; the page then reruns once and ``render_finished`` gets its record"""
+    job = job_manager().status(job_id)
+    if job is None:
+        return
+    polling = job["status"] not in FINAL_STATES
+
+    @st.fragment(run_every=JOB_POLL_SECONDS if polling else None)
+    def poll():
+        job = job_manager().status(job_id)
+        if job["status"] not in FINAL_STATES:
+            st.progress(job["progress"], text=f"{job['label']}: {job['status']}...")
+        elif polling:
+            # Finished since the last full run: rerun the page once to pick up the result and stop polling
+            st.rerun()
+        else:
+            render_finished(job)
+
+    poll()
+
+
+def _export_download(job):
+    if job["status"] != DONE:
+        st.error(f"Export {job['status']}" + (f": {job['error']}" if job["error"] else ""))
+        return
+    path = job["result"]["path"]
+    if not os.path.exists(path):
+        st.caption("The export has been removed; generate it again.")
+        return
+
+    def read():
+        with open(path, "rb") as f:
+            return f.read()
+
+    st.download_button(f"Download {os.path.basename(path)}", data=read,
+                       file_name=os.path.basename(path), mime=export_mime(path), on_click="ignore")
+    st.caption(f"{job['result']['size'] / 1e6:.1f} MB in {job['finished'] - job['started']:.1f} s")
+
+
+@panel("Export")
+def export_panel(view, attention, forecast, inference, metadata, owner):
+    """
+    Export format, Generate Report and the download of the last export
+
+    The EEG, the displayed attention layer at full resolution and the predictions of the
+    view are written on the job pool, and the panel polls the job until the download is
+    ready; choosing a format or generating a report reruns this panel only.
+    """
+    formats = available_export_formats()
+    export_format = st.selectbox("Export Format", formats)
+    missing = [name for name in EXPORT_FORMATS if name not in formats]
+    if missing:
+        st.caption(", ".join(f"{name} needs {EXPORT_REQUIREMENTS[name]}" for name in missing))
+    if st.button("Generate Report"):
+        try:
+            st.session_state["export_job"] = start_export(
+                export_format, view["path"], view["start"], view["seconds"], attention=attention,
+                forecast=forecast, inference=inference, metadata=metadata, owner=owner,
+            )
+        except JobQueueFull as exc:
+            st.warning(str(exc))
+
+    if st.session_state.get("export_job") is not None:
+        job_panel(st.session_state["export_job"], _export_download)
+
+
+@panel("Background jobs")
+def jobs_panel(owner):
+    """This session's jobs on the shared pool, with cancellation of the ones still waiting or running"""
+    pool = job_manager().stats()
+    st.caption(f"{pool['running']} of {pool['workers']} workers busy, {pool['queued']} jobs queued across sessions")
+    for job in job_manager().jobs(owner=owner, limit=10):
+        col_job, col_cancel = st.columns([4, 1])
+        with col_job:
+            elapsed = (job["finished"] or time.time()) - (job["started"] or job["submitted"])
+            st.markdown(f"**{job['label']}**: {job['status']} ({job['progress']:.0%}, {elapsed:.1f} s)")
+        with col_cancel:
+            if job["status"] in (QUEUED, RUNNING) and st.button("Cancel", key=f"cancel_{job['id']}"):
+                job_manager().cancel(job["id"])
+                st.rerun(scope="fragment")
@@ -0,0 +1,125 @@
+import numpy as np
+
+# High attention on the F3 spike-and-wave and medium attention on neighbouring F4
+DEFAULT_ATTENTION_REGIONS = [
+    {"channel": "F3", "start": 15.0, "end": 20.0, "low": 0.7, "high": 0.9},
+    {"channel": "F4", "start": 15.0, "end": 20.0, "low": 0.3, "high": 0.5},
+]
+
+# Left/right homologous electrode pairs; discharges on one side draw medium attention on the other
+HOMOLOGOUS = {
+    'Fp1': 'Fp2', 'F3': 'F4', 'C3': 'C4', 'P3': 'P4', 'O1': 'O2',
+    'F7': 'F8', 'T3': 'T4', 'T5': 'T6',
+}
+HOMOLOGOUS.update({right: left for left, right in list(HOMOLOGOUS.items())})
+
+# Background attention range for every cell outside a region
+BACKGROUND_RANGE = (0.0, 0.3)
+
+# Number of channel-bins filled per block; bounds the float32 scratch buffer
+CHUNK_ELEMENTS = 1 << 22
+
+
+def _region_rows(channels, regions):
+    """Resolve region channels to rows; regions on channels that are not displayed are skipped"""
+    resolved = []
+    for region in regions:
+        if region["channel"] in channels:
+            resolved.append((channels.index(region["channel"]), region))
+    return resolved
+
+
+def build_attention_map(channels, seconds, bin_width=0.2, regions=DEFAULT_ATTENTION_REGIONS, seed=None,
+                        dtype=np.float32, start=0.0, background=BACKGROUND_RANGE):
+    """
+    Build a synthetic ``(n_channels, n_bins)`` attention map without per-cell Python work
+
+    One block of uniform samples is drawn for all channels and bins at once, scaled into
+    the background range, and each configured region rescales its slice of the same
+    samples into its own range. Long windows are filled in time blocks so float16 maps of
+    multi-hour recordings never need a full-size float32 temporary.
+
+    Args:
+        channels (list): Channel names, one row per channel
+        seconds (float): Window length in seconds
+        bin_width (float): Width of each time bin in seconds
+        regions (list): Region dicts with ``channel``, ``start``/``end`` in absolute
+            seconds and the ``low``/``high`` uniform range inside the region
+        seed (int | np.random.Generator | None): Seed or generator for the scores
+        dtype: Output dtype, e.g. np.float32 or np.float16 for long recordings
+        start (float): Absolute time of the first bin
+        background (tuple): (low, high) range for cells outside every region
+
+    Returns:
+        np.ndarray: Attention scores of shape (n_channels, n_bins)
+    """
+    rng = np.random.default_rng(seed)
+    n_bins = int(round(seconds / bin_width))
+    first_bin = int(round(start / bin_width))
+    attention = np.empty((len(channels), n_bins), dtype=dtype)
+    rows = _region_rows(list(channels), regions or [])
+
+    bg_low, bg_high = background
+    chunk = max(1, CHUNK_ELEMENTS // max(1, len(channels)))
+    scratch = np.empty(len(channels) * min(chunk, n_bins), dtype=np.float32)
+
+    for lo in range(0, n_bins, chunk):
+        hi = min(lo + chunk, n_bins)
+        block = scratch[:len(channels) * (hi - lo)].reshape(len(channels), hi - lo)
+        rng.random(dtype=np.float32, out=block)
+        attention[:, lo:hi] = block * (bg_high - bg_low) + bg_low
+
+        # Overwrite the region slices that fall inside this block with their own range
+        for row, region in rows:
+            r_lo = max(int(region["start"] / bin_width) - first_bin, lo)
+            r_hi = min(int(region["end"] / bin_width) - first_bin, hi)
+            if r_lo >= r_hi:
+                continue
+            values = block[row, r_lo - lo:r_hi - lo]
+            attention[row, r_lo:r_hi] = values * (region["high"] - region["low"]) + region["low"]
+
+    return attention
+
+
+def regions_from_events(events, high=(0.7, 0.9), medium=(0.3, 0.5)):
+    """
+    Attention regions for annotated events: high on the event channel, medium on its homologue
+
+    Args:
+        events (list): Event dicts with ``channel``, ``start`` and ``end`` in seconds
+
+    Returns:
+        list: Region dicts for ``build_attention_map``
+    """
+    regions = []
+    for event in events:
+        regions.append({"channel": event["channel"], "start": event["start"], "end": event["end"],
+                        "low": high[0], "high": high[1]})
+        if event["channel"] in HOMOLOGOUS:
+            regions.append({"channel": HOMOLOGOUS[event["channel"]], "start": event["start"], "end": event["end"],
+                            "low": medium[0], "high": medium[1]})
+    return regions
+
+
+def bin_times(n_bins, bin_width=0.2, start=0.0):
+    """Start time in seconds of each attention bin, used as the heatmap x axis"""
+    return start + np.arange(n_bins) * bin_width
+
+
+def pool_bins(attention_data, max_bins, bin_width=0.2):
+    """
+    Max-pool attention bins so a long window fits in at most ``max_bins`` heatmap columns
+
+    Max pooling keeps short high-attention regions visible when many bins share a column.
+
+    Returns:
+        tuple: (pooled scores of shape (n_channels, <= max_bins), pooled bin width in seconds)
+    """
+    factor = -(-attention_data.shape[1] // max_bins)
+    if factor <= 1:
+        return attention_data, bin_width
+
+    n_channels, n_bins = attention_data.shape
+    padded = np.full((n_channels, -(-n_bins // factor) * factor), -np.inf, dtype=attention_data.dtype)
+    padded[:, :n_bins] = attention_data
+    return padded.reshape(n_channels, -1, factor).max(axis=2), bin_width * factor
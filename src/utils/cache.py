@@ -0,0 +1,159 @@
+import functools
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import streamlit as st
+
+# Every process-level cache, by name, so the dashboard can report their statistics
+_REGISTRY = {}
+
+
+def make_key(*args, **kwargs):
+    """
+    Build a hashable cache key from call arguments
+
+    Lists, tuples and dicts are converted recursively and NumPy arrays are keyed on
+    their shape, dtype and raw bytes, so equal inputs always map to the same entry.
+    """
+    def freeze(value):
+        if isinstance(value, (list, tuple)):
+            return tuple(freeze(v) for v in value)
+        if isinstance(value, dict):
+            return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+        if isinstance(value, np.ndarray):
+            return ("ndarray", value.shape, value.dtype.str, value.tobytes())
+        if isinstance(value, type):
+            return value.__qualname__
+        return value
+
+    return freeze(args), freeze(kwargs)
+
+
+def array_digest(array):
+    """Short digest of an array's shape, dtype and contents, to key caches on data rather than on its inputs"""
+    array = np.ascontiguousarray(array)
+    digest = hashlib.blake2b(f"{array.shape}{array.dtype.str}".encode(), digest_size=8)
+    digest.update(array.data)
+    return digest.hexdigest()
+
+
+class LRUCache:
+    """
+    Bounded least-recently-used cache with hit/miss counters
+
+    Safe to share between Streamlit sessions, which run in separate threads.
+
+    Args:
+        maxsize (int): Maximum number of entries kept before the oldest is evicted
+        name (str): Optional name shown in the statistics
+    """
+
+    def __init__(self, maxsize=32, name=None):
+        self.maxsize = maxsize
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        """Return the cached value and mark it as recently used, counting a hit or miss"""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        """Insert a value, evicting least-recently-used entries beyond ``maxsize``"""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for ``key``, calling ``compute()`` and storing it on a miss"""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+
+        # Compute outside the lock so slow builds do not block other sessions
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        """Counters as a plain dict"""
+        total = self.hits + self.misses
+        return {
+            "name": self.name,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+def lru_cached(maxsize=32, name=None):
+    """
+    Decorator memoizing a function in a process-level ``LRUCache``
+
+    The cache is shared by every session of the Streamlit server and survives reruns,
+    because utility modules are imported once per process. It is exposed as the
+    wrapper's ``cache`` attribute.
+    """
+    def decorator(fn):
+        cache = LRUCache(maxsize=maxsize, name=name or fn.__name__)
+        _REGISTRY[cache.name] = cache
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return cache.get_or_compute(make_key(*args, **kwargs), lambda: fn(*args, **kwargs))
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+def session_cache(name, maxsize=16):
+    """
+    Return the ``LRUCache`` called ``name`` for the current Streamlit session
+
+    Session caches hold objects that are not safe to share between users, such as
+    Plotly figures that a page may still modify before rendering.
+    """
+    caches = st.session_state.setdefault("_lru_caches", {})
+    if name not in caches:
+        caches[name] = LRUCache(maxsize=maxsize, name=name)
+    return caches[name]
+
+
+def cache_stats():
+    """Statistics for every process-level cache and the current session's caches"""
+    rows = [dict(cache.stats(), scope="process") for cache in _REGISTRY.values()]
+    for cache in st.session_state.get("_lru_caches", {}).values():
+        rows.append(dict(cache.stats(), scope="session"))
+    return rows
@@ -0,0 +1,308 @@
+import io
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Options of the "Statistical Test" selector
+STATISTICS = ("Pearson Correlation", "Spearman Correlation", "Chi-squared", "ANOVA")
+
+# Cohort features shown on the correlation heatmap, and which of them are binary
+COHORT_FEATURES = ("Age", "Seizure History", "F3 Spikes", "Sleep Dep.", "Med. Adherence", "Lesion Size")
+BINARY_FEATURES = ("Seizure History", "Sleep Dep.")
+
+# Bytes of a cohort file parsed per chunk, and bytes before the consumed offset compared to detect rewrites
+COHORT_CHUNK_BYTES = 8 << 20
+COHORT_TAIL_BYTES = 4096
+
+# Colour-bar label and range of each statistic's heatmap
+STATISTIC_SCALES = {
+    "Pearson Correlation": ("Pearson r", -1.0, 1.0),
+    "Spearman Correlation": ("Spearman ρ", -1.0, 1.0),
+    "Chi-squared": ("Cramér's V", 0.0, 1.0),
+    "ANOVA": ("Correlation ratio η", 0.0, 1.0),
+}
+
+
+class CorrelationAccumulator:
+    """
+    One-pass, mergeable accumulators for every pairwise statistic of the heatmap
+
+    Chunks of rows are folded in with ``update`` and never kept, so a cohort streams
+    through in bounded memory and new patients refine the matrix without a recompute.
+
+    * Pearson: exact, from running means and co-moment matrices combined across chunks
+      with Chan et al.'s parallel form of Welford's update.
+    * Spearman: every feature is binned on edges fixed from the first chunk's quantiles,
+      and the joint bin counts of every pair are kept. Ranks are the mid-ranks of the
+      bins, so the result is exact for binary features and bin-tie-corrected otherwise.
+    * Chi-squared: Cramér's V of the contingency tables of every pair, continuous
+      features grouped into ``n_groups`` quantile groups of their binned marginals.
+    * ANOVA: correlation ratio η of each feature (rows) across the groups of another
+      (columns), from per-bin sums of every feature.
+
+    Args:
+        names (tuple): Feature names, one per column of the chunks
+        binary (tuple): Names of binary (0/1) features
+        n_bins (int): Bins per continuous feature for the rank and group statistics
+        n_groups (int): Groups per continuous feature for chi-squared and ANOVA
+    """
+
+    def __init__(self, names=COHORT_FEATURES, binary=BINARY_FEATURES, n_bins=64, n_groups=5):
+        self.names = tuple(names)
+        self.binary = np.array([name in binary for name in self.names])
+        self.n_bins = n_bins
+        self.n_groups = n_groups
+        n_features = len(self.names)
+        self.count = 0
+        self.mean = np.zeros(n_features)
+        self.comoment = np.zeros((n_features, n_features))
+        self.edges = None
+        self.joint = np.zeros((n_features, n_features, n_bins, n_bins), dtype=np.int64)
+        # Per-bin sums of every feature, centred on the first chunk's means for numerical stability
+        self.centre = None
+        self.bin_sums = np.zeros((n_features, n_bins, n_features))
+
+    def _set_edges(self, values):
+        self.centre = values.mean(axis=0)
+        quantiles = np.linspace(0, 1, self.n_bins + 1)[1:-1]
+        self.edges = []
+        for column, binary in zip(values.T, self.binary):
+            self.edges.append(np.array([0.5]) if binary else np.unique(np.quantile(column, quantiles)))
+
+    def _bins(self, values):
+        return np.column_stack([np.searchsorted(edges, column, side="right")
+                                for edges, column in zip(self.edges, values.T)])
+
+    def update(self, values):
+        """Fold a chunk of rows of shape (n, n_features) into every accumulator"""
+        values = np.asarray(values, dtype=np.float64).reshape(-1, len(self.names))
+        n = len(values)
+        if n == 0:
+            return self
+        if self.edges is None:
+            self._set_edges(values)
+
+        # Chan et al.: merge the chunk's mean and co-moments into the running ones
+        chunk_mean = values.mean(axis=0)
+        centred = values - chunk_mean
+        delta = chunk_mean - self.mean
+        total = self.count + n
+        self.comoment += centred.T @ centred + np.outer(delta, delta) * self.count * n / total
+        self.mean += delta * n / total
+        self.count = total
+
+        # Joint bin counts of every feature pair with a single bincount over pair-offset indices
+        n_features, n_bins = len(self.names), self.n_bins
+        bins = self._bins(values)
+        pair = np.arange(n_features * n_features).reshape(n_features, n_features) * n_bins * n_bins
+        index = pair + bins[:, :, None] * n_bins + bins[:, None, :]
+        self.joint += np.bincount(index.ravel(), minlength=self.joint.size).reshape(self.joint.shape)
+
+        # Sums of every feature within every bin of every other feature
+        group = (np.arange(n_features) * n_bins + bins).ravel()
+        shifted = values - self.centre
+        for column in range(n_features):
+            weights = np.repeat(shifted[:, column], n_features)
+            self.bin_sums[:, :, column] += np.bincount(group, weights, n_features * n_bins).reshape(n_features, n_bins)
+        return self
+
+    def merge(self, other):
+        """Combine with an accumulator over other rows that was started from the same bin edges"""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.__dict__.update({key: np.copy(value) if isinstance(value, np.ndarray) else value
+                                  for key, value in other.__dict__.items()})
+            return self
+        if any(not np.array_equal(a, b) for a, b in zip(self.edges, other.edges)) or not np.array_equal(
+                self.centre, other.centre):
+            raise ValueError("Accumulators must share bin edges; start one from the other's with copy_layout()")
+        delta = other.mean - self.mean
+        total = self.count + other.count
+        self.comoment += other.comoment + np.outer(delta, delta) * self.count * other.count / total
+        self.mean += delta * other.count / total
+        self.count = total
+        self.joint += other.joint
+        self.bin_sums += other.bin_sums
+        return self
+
+    def copy_layout(self):
+        """Empty accumulator with this one's bin edges, for accumulating rows elsewhere and merging back"""
+        twin = CorrelationAccumulator(self.names, n_bins=self.n_bins, n_groups=self.n_groups)
+        twin.binary = self.binary.copy()
+        twin.edges = [edges.copy() for edges in self.edges] if self.edges is not None else None
+        twin.centre = None if self.centre is None else self.centre.copy()
+        return twin
+
+    # Statistics
+
+    def _marginals(self):
+        """(n_features, n_bins) bin counts of every feature"""
+        n_features = len(self.names)
+        return self.joint[np.arange(n_features), np.arange(n_features)].diagonal(axis1=1, axis2=2)
+
+    def pearson(self):
+        scale = np.sqrt(np.diag(self.comoment))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.clip(self.comoment / np.outer(scale, scale), -1.0, 1.0)
+
+    def spearman(self):
+        counts = self._marginals().astype(np.float64)
+        # Mid-rank of every bin, centred on the mean rank
+        ranks = np.cumsum(counts, axis=1) - (counts - 1) / 2 - (self.count + 1) / 2
+        covariance = np.einsum("ijab,ia,jb->ij", self.joint, ranks, ranks, optimize=True)
+        variance = np.einsum("ia,ia->i", counts, ranks ** 2)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.clip(covariance / np.sqrt(np.outer(variance, variance)), -1.0, 1.0)
+
+    def _groups(self):
+        """(n_features, n_bins, n_groups) one-hot map from bins to quantile groups"""
+        counts = self._marginals().astype(np.float64)
+        midpoints = (np.cumsum(counts, axis=1) - counts / 2) / max(self.count, 1)
+        groups = np.minimum((midpoints * self.n_groups).astype(int), self.n_groups - 1)
+        groups[self.binary] = np.minimum(np.arange(self.n_bins), self.n_groups - 1)
+        return np.eye(self.n_groups)[groups]
+
+    def cramers_v(self):
+        onehot = self._groups()
+        tables = np.einsum("ijab,iag,jbh->ijgh", self.joint, onehot, onehot, optimize=True)
+        rows, columns = tables.sum(axis=3), tables.sum(axis=2)
+        expected = rows[..., :, None] * columns[..., None, :] / max(self.count, 1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            chi2 = np.where(expected > 0, (tables - expected) ** 2 / expected, 0.0).sum(axis=(2, 3))
+            levels = np.minimum((rows > 0).sum(axis=2), (columns > 0).sum(axis=2))
+            return np.sqrt(chi2 / (self.count * np.maximum(levels - 1, 1)))
+
+    def eta(self):
+        onehot = self._groups()
+        counts = np.einsum("ia,iag->ig", self._marginals().astype(np.float64), onehot)
+        sums = np.einsum("iaj,iag->igj", self.bin_sums, onehot)
+        # Between-group sum of squares of feature j across the groups of feature i
+        grand = (self.mean - self.centre)[None, None, :]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = np.where(counts[..., None] > 0, sums / counts[..., None], 0.0)
+            between = (counts[..., None] * (means - grand) ** 2).sum(axis=1)
+            ratio = np.sqrt(np.clip(between / np.diag(self.comoment)[None, :], 0.0, 1.0)).T
+        np.fill_diagonal(ratio, 1.0)
+        return ratio
+
+    def matrix(self, statistic):
+        """(n_features, n_features) matrix of one of ``STATISTICS``"""
+        compute = {"Pearson Correlation": self.pearson, "Spearman Correlation": self.spearman,
+                   "Chi-squared": self.cramers_v, "ANOVA": self.eta}[statistic]
+        return compute()
+
+
+class CohortFile:
+    """
+    Correlation accumulator over a cohort CSV that only ever reads rows appended since the last update
+
+    The file is consumed up to its last complete line. The byte offset reached is kept
+    together with the header line and the bytes just before the offset; ``update`` folds
+    in the rows past the offset, so adding patients costs time proportional to the new
+    rows. When the file shrank, or its header or the bytes before the offset changed, it
+    was rewritten rather than appended to, and the accumulator is rebuilt from the start.
+
+    Args:
+        path (str): CSV with a header row and at least the ``COHORT_FEATURES`` columns
+        chunk_bytes (int): Bytes parsed per chunk, bounding memory while streaming
+    """
+
+    def __init__(self, path, chunk_bytes=COHORT_CHUNK_BYTES):
+        self.path = path
+        self.chunk_bytes = chunk_bytes
+        self.accumulator = CorrelationAccumulator()
+        self.offset = 0
+        self.rebuilds = 0
+        self._header = None
+        self._columns = None
+        self._tail = b""
+        self._stat = None
+        self._lock = threading.Lock()
+
+    @property
+    def count(self):
+        return self.accumulator.count
+
+    def update(self):
+        """
+        Fold in the rows appended since the last update, rebuilding if the file was rewritten
+
+        Returns:
+            int: Number of rows read
+        """
+        with self._lock:
+            return self._update()
+
+    def _update(self):
+        stat = os.stat(self.path)
+        if (stat.st_ino, stat.st_size, stat.st_mtime_ns) == self._stat:
+            return 0
+        with open(self.path, "rb") as f:
+            header = f.readline()
+            if not self._appended(f, header, os.fstat(f.fileno()).st_size):
+                self.accumulator = CorrelationAccumulator()
+                self.offset = len(header)
+                self.rebuilds += self._header is not None
+                self._header = header
+                self._columns = list(pd.read_csv(io.BytesIO(header), nrows=0).columns)
+                self._tail = b""
+
+            f.seek(self.offset)
+            added = 0
+            pending = b""
+            while block := f.read(self.chunk_bytes):
+                block = pending + block
+                end = block.rfind(b"\n") + 1
+                pending = block[end:]
+                if not end:
+                    continue
+                rows = self._parse(block[:end])
+                self.accumulator.update(rows)
+                added += len(rows)
+                self.offset += end
+                self._tail = (self._tail + block[max(0, end - COHORT_TAIL_BYTES):end])[-COHORT_TAIL_BYTES:]
+        # A partial last line is read again on the next update, once its writer has finished it
+        self._stat = None if pending else (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        return added
+
+    def _appended(self, f, header, size):
+        """Whether the file still starts with everything consumed so far"""
+        if self._header is None or header != self._header or size < self.offset:
+            return False
+        f.seek(self.offset - len(self._tail))
+        return f.read(len(self._tail)) == self._tail
+
+    def _parse(self, data):
+        frame = pd.read_csv(io.BytesIO(data), header=None, names=self._columns, usecols=list(COHORT_FEATURES))
+        return frame[list(COHORT_FEATURES)].to_numpy(dtype=np.float64)
+
+    def matrix(self, statistic):
+        """(matrix of ``statistic``, number of patients) over the rows read so far"""
+        with self._lock:
+            return self.accumulator.matrix(statistic), self.accumulator.count
+
+
+def synthetic_cohort_chunks(n, chunk_rows=100_000, seed=None):
+    """
+    Synthetic cohort rows in ``COHORT_FEATURES`` order, yielded chunk by chunk
+
+    Features share a latent severity, so they correlate, and several are skewed or
+    zero-inflated (spike counts, lesion sizes), so rank and linear correlations differ.
+
+    Yields:
+        np.ndarray: float64 rows of shape (<= chunk_rows, len(COHORT_FEATURES))
+    """
+    rng = np.random.default_rng(seed)
+    for lo in range(0, n, chunk_rows):
+        m = min(chunk_rows, n - lo)
+        severity = rng.standard_normal(m)
+        age = np.clip(45 + 18 * rng.standard_normal(m) + 4 * severity, 1, 95)
+        history = (0.8 * severity + rng.standard_normal(m)) > 0.3
+        spikes = rng.poisson(np.exp(1.0 + 0.7 * severity + 0.3 * history))
+        sleep = (0.5 * severity + 0.4 * (spikes > 5) + rng.standard_normal(m)) > 0.8
+        adherence = np.clip(0.85 - 0.08 * severity + 0.1 * rng.standard_normal(m), 0, 1)
+        lesion = np.where(rng.random(m) < 0.15 + 0.1 * (severity > 1), rng.gamma(2.0, 6.0 + 3 * np.maximum(severity, 0)), 0.0)
+        yield np.column_stack([age, history, spikes, sleep, adherence, lesion]).astype(np.float64)
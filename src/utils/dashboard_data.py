@@ -0,0 +1,529 @@
+import glob
+import os
+import threading
+import time
+
+import numpy as np
+
+from utils.attention import build_attention_map, regions_from_events
+from utils.cache import lru_cached, make_key
+from utils.correlation import CohortFile, CorrelationAccumulator, synthetic_cohort_chunks
+from utils.edf_reader import EDFReader
+from utils.eeg_generator import recurring_artifacts
+from utils.export import (EXPORT_FORMATS, EXPORT_REQUIREMENTS, available_export_formats, export_tables, prune_exports,
+                          write_export)
+from utils.inference import WINDOW_TOKENS, load_model, run_attention
+from utils.instrumentation import record, timed
+from utils.jobs import CANCELLED, FAILED, JobManager
+from utils.live_stream import SimulatedSource
+from utils.patient_registry import PatientRegistry, synthetic_patients
+from utils.precompute import (ARTIFACTS_DIR, MANIFEST_FILE, artifact_path, compute_artifacts, load_manifest,
+                              recording_key, recording_name)
+from utils.pyramid import PyramidIndex, pyramid_path
+from utils.similarity import SimilarityIndex, embedding_from_summary, synthetic_embeddings
+from utils.spectral import band_powers, relative_band_powers
+from utils.risk import RiskEngine, clinical_features, window_features
+from utils.recording_store import RecordingReader, convert_synthetic_recording, is_recording
+
+# Guards first-run creation of the synthetic recording when several sessions start at once
+_recording_lock = threading.Lock()
+
+# Size of the demo cohort searched when no precomputed cohort exists under DATA_PATH
+DEMO_COHORT_SIZE = 100_000
+
+# Size of the demo patient registry used when DATA_PATH has no patients.sqlite or patients.parquet
+DEMO_REGISTRY_SIZE = 100_000
+
+# Rows of the synthetic cohort streamed into the correlation heatmap when DATA_PATH has no cohort_features.csv
+DEMO_CORRELATION_COHORT_SIZE = 200_000
+
+# Rows generated per chunk when streaming the synthetic cohort
+COHORT_CHUNK_ROWS = 100_000
+
+# Seconds of EEG before the current view's end that the risk forecast is computed from
+RISK_LOOKBACK_SECONDS = 3600
+
+# Exports kept under DATA_PATH/exports; older ones are deleted as new ones start
+EXPORT_KEEP = 20
+
+# The dashboard's own patient, always present in the demo registry
+DASHBOARD_PATIENT = {
+    "patient_id": "28791", "status": "Post-seizure monitoring", "age": 42, "sex": "Female",
+    "medication": "Levetiracetam", "eeg_finding": "F3 spike-and-wave", "prior_seizure_history": True,
+    "structural_lesion": False, "genetic_factors": True, "sleep_deprivation": True,
+}
+
+
+def _read_only(*arrays):
+    """Freeze cached arrays so one session cannot modify data another session is reading"""
+    for array in arrays:
+        array.flags.writeable = False
+    return arrays if len(arrays) > 1 else arrays[0]
+
+
+def data_path():
+    """Root directory for recordings and derived artifacts, from the ``DATA_PATH`` setting"""
+    return os.environ.get("DATA_PATH", "./data")
+
+
+def model_path():
+    """Attention model file from the ``MODEL_PATH`` setting; unset means the built-in NumPy transformer"""
+    return os.environ.get("MODEL_PATH")
+
+
+@timed("data.synthetic_recording")
+def ensure_synthetic_recording(patient_id, channels, seconds, sample_rate=250, seed=None):
+    """
+    Path of the patient's recording under ``DATA_PATH``, synthesizing it on first use
+
+    The synthetic recording repeats the F3 spike-and-wave discharge 20 s before the end
+    of every 5-minute block, so the latest 30 s always show one. The discharges are
+    stored as header annotations.
+
+    Returns:
+        str: Recording directory
+    """
+    path = os.path.join(data_path(), "recordings", f"patient_{patient_id}")
+    with _recording_lock:
+        if not is_recording(path):
+            convert_synthetic_recording(path, list(channels), seconds, sample_rate=sample_rate, seed=seed,
+                                        artifacts=recurring_artifacts(seconds, offset=280.0))
+    return path
+
+
+def list_edf_files():
+    """EDF/EDF+ files anywhere under ``DATA_PATH``, relative to it"""
+    root = data_path()
+    paths = glob.glob(os.path.join(root, "**", "*.edf"), recursive=True)
+    paths += glob.glob(os.path.join(root, "**", "*.EDF"), recursive=True)
+    return sorted(os.path.relpath(p, root) for p in set(paths))
+
+
+@lru_cached(maxsize=8, name="recordings")
+def open_recording(path):
+    """
+    Cached memory-mapped reader for a recording directory or an .edf file
+
+    Both readers expose ``channels``, ``sample_rate``, ``duration``, ``read_window`` and
+    ``annotations_in``, so the dashboard does not need to know which format it reads.
+    """
+    if path.lower().endswith(".edf"):
+        return EDFReader(path)
+    return RecordingReader(path)
+
+
+@lru_cached(maxsize=8, name="pyramids")
+def open_pyramid(path):
+    """
+    Cached min/max/mean pyramid stored next to a recording, built on first use
+
+    Call ``update`` with the recording's reader to pick up appended samples; only the
+    new buckets are computed.
+    """
+    recording = open_recording(path)
+    pyramid = PyramidIndex(pyramid_path(path), len(recording.channels), recording.sample_rate)
+    pyramid.update(recording)
+    return pyramid
+
+
+@lru_cached(maxsize=4, name="live_sources")
+def _simulated_source(channels, sample_rate, seed):
+    return SimulatedSource(list(channels), sample_rate=sample_rate, seed=seed)
+
+
+def live_source(channels, sample_rate=250, seed=None):
+    """
+    Running simulated live source for ``channels``, shared by every session watching them
+
+    Each call counts as a reader, keeping the producer thread alive; it stops on its own
+    once no session has asked for it for a while.
+
+    Returns:
+        SimulatedSource: Source whose ``buffer`` holds the latest samples
+    """
+    source = _simulated_source(tuple(channels), sample_rate, seed)
+    source.start()
+    return source
+
+
+@lru_cached(maxsize=16, name="attention")
+@timed("data.generated_attention")
+def load_attention(channels, seconds, seed=None, start=0.0, events=(), bin_width=0.2):
+    """
+    Cached synthetic attention map for one window, the stand-in when no model or precomputed map is available
+
+    Like the precomputed map it has no layers, so switching the selected layer reuses it.
+
+    Args:
+        channels (tuple): Channel names
+        seconds (float): Window length
+        seed (int): Seed for the synthetic scores
+        start (float): Window start in seconds
+        events (tuple): Annotated events in the window, drawing high attention
+        bin_width (float): Width of each time bin in seconds
+
+    Returns:
+        np.ndarray: Read-only attention scores of shape (n_channels, n_bins)
+    """
+    attention_data = build_attention_map(list(channels), seconds, bin_width=bin_width, seed=seed, start=start,
+                                         regions=regions_from_events(events))
+    return _read_only(attention_data)
+
+
+@lru_cached(maxsize=2, name="models")
+def _attention_model(path, token_samples):
+    return load_model(path, token_samples=token_samples)
+
+
+@lru_cached(maxsize=16, name="model_attention")
+@timed("model.attention")
+def load_model_attention(path, start, seconds, bin_width=0.2):
+    """
+    Attention of every transformer layer over one recording window, from a single forward pass
+
+    All layers are captured together and cached per window, so switching the displayed
+    layer is an index into the result rather than another forward pass.
+
+    Args:
+        path (str): Recording directory or .edf file
+        start (float): Window start in seconds
+        seconds (float): Window length
+        bin_width (float): Seconds per model token, the attention bin width
+
+    Returns:
+        dict: ``attention`` read-only (n_layers, n_channels, n_bins), ``probability`` per
+            model window, ``window_ms`` inference milliseconds per model window
+    """
+    recording = open_recording(path)
+    model = _attention_model(model_path(), int(round(bin_width * recording.sample_rate)))
+    _, samples = recording.read_window(start, seconds)
+    result = run_attention(model, samples, recording.sample_rate, token_seconds=bin_width)
+    _read_only(result["attention"], result["probability"])
+    return result
+
+
+@lru_cached(maxsize=16, name="band_powers")
+@timed("features.band_powers")
+def load_band_powers(path, start, seconds, bin_width=0.2):
+    """
+    Cached relative band powers of one recording window, one column per attention bin
+
+    Args:
+        path (str): Recording directory or .edf file
+        start (float): Window start in seconds
+        seconds (float): Window length
+        bin_width (float): Attention bin width in seconds
+
+    Returns:
+        np.ndarray: Read-only relative powers of shape (n_bands, n_channels, n_bins)
+    """
+    recording = open_recording(path)
+    _, samples = recording.read_window(start, seconds)
+    return _read_only(relative_band_powers(band_powers(samples, recording.sample_rate, hop=bin_width)))
+
+
+@lru_cached(maxsize=8, name="artifacts")
+def _load_artifact_file(path, mtime):
+    with np.load(path) as npz:
+        return {name: _read_only(npz[name]) for name in npz.files}
+
+
+@timed("data.precomputed")
+def load_precomputed(path, name, start, seconds):
+    """
+    Window of a precomputed artifact array for a recording, or None if it is not available
+
+    Artifacts are written by ``scripts/precompute_artifacts.py``; when a recording has
+    not been processed, or has grown past its artifact, callers compute inline instead.
+
+    Args:
+        path (str): Recording directory or .edf file
+        name (str): Array name, "band_powers" or "attention"
+        start (float): Window start in seconds
+        seconds (float): Window length
+
+    Returns:
+        np.ndarray | None: Read-only float32 values of the window's bins, on the last axis
+    """
+    file = artifact_path(data_path(), path)
+    if not os.path.exists(file):
+        return None
+    artifacts = _load_artifact_file(file, os.path.getmtime(file))
+    bin_width = float(artifacts["bin_width"])
+    first = int(round(start / bin_width))
+    last = first + int(round(seconds / bin_width))
+    if last > artifacts[name].shape[-1]:
+        return None
+    # Stored as float16 to keep artifacts compact; plotly only serializes float32 and wider
+    return _read_only(artifacts[name][..., first:last].astype(np.float32))
+
+
+def _embedding(artifacts):
+    return embedding_from_summary({name[len("summary_"):]: value for name, value in artifacts.items()
+                                   if name.startswith("summary_")})
+
+
+def recording_embedding(path):
+    """
+    Case embedding of a recording, from its precomputed artifacts
+
+    Recordings the batch command has not processed yet get their artifacts computed on
+    first use, like the synthetic recording itself.
+    """
+    file = artifact_path(data_path(), path)
+    with _recording_lock:
+        if not os.path.exists(file):
+            compute_artifacts(path, file)
+    return _embedding(_load_artifact_file(file, os.path.getmtime(file)))
+
+
+@lru_cached(maxsize=2, name="similarity")
+def _similarity_index(manifest_mtime, demo_centre):
+    root = data_path()
+    ids, vectors, names = [], [], {}
+    for key, entry in load_manifest(root).items():
+        file = os.path.join(root, entry.get("artifact", ""))
+        if entry.get("status") == "done" and os.path.exists(file):
+            ids.append(key)
+            vectors.append(_embedding(_load_artifact_file(file, os.path.getmtime(file))))
+            names[key] = recording_name(entry.get("source", key)).replace("patient_", "")
+
+    index = SimilarityIndex()
+    if len(ids) > 1:
+        index.add(ids, np.stack(vectors))
+    else:
+        # No cohort has been precomputed: search a synthetic one scattered around the patient
+        centre = np.asarray(demo_centre, dtype=np.float32)
+        index.add(*synthetic_embeddings(DEMO_COHORT_SIZE, seed=0, centre=centre,
+                                        spread=np.maximum(np.abs(centre) * 0.25, 0.05)))
+    return index.build(), names
+
+
+@timed("search.similar_cases")
+def find_similar_cases(path, k=3):
+    """
+    Most similar cases to a recording, by cosine similarity of case embeddings
+
+    The index covers every recording in the precomputed cohort manifest, or a synthetic
+    demo cohort of ``DEMO_COHORT_SIZE`` cases when there is none.
+
+    Returns:
+        tuple: (list of {"id", "similarity"} dicts best first, cohort size, search milliseconds)
+    """
+    query = recording_embedding(path)
+    manifest_file = os.path.join(data_path(), ARTIFACTS_DIR, MANIFEST_FILE)
+    manifest_mtime = os.path.getmtime(manifest_file) if os.path.exists(manifest_file) else None
+    index, names = _similarity_index(manifest_mtime, tuple(query.tolist()))
+
+    own_id = recording_key(data_path(), path)
+    start = time.perf_counter()
+    ids, scores = index.search(query, k=k + 1)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    cases = [{"id": names.get(case_id, case_id), "similarity": float(score)}
+             for case_id, score in zip(ids[0], scores[0]) if case_id != own_id][:k]
+    return cases, len(index), elapsed_ms
+
+
+def _registry_source():
+    for name in ("patients.sqlite", "patients.parquet"):
+        file = os.path.join(data_path(), name)
+        if os.path.exists(file):
+            return file
+    return None
+
+
+@lru_cached(maxsize=1, name="patient_registry")
+def _patient_registry(source, mtime):
+    if source is None:
+        return PatientRegistry.from_frame(synthetic_patients(DEMO_REGISTRY_SIZE, seed=0, include=[DASHBOARD_PATIENT]))
+    if source.endswith(".sqlite"):
+        return PatientRegistry.from_sqlite(source)
+    return PatientRegistry.from_parquet(source)
+
+
+def load_patient_registry():
+    """
+    Patient registry shared by every session
+
+    Bulk-loaded from ``patients.sqlite`` (table ``patients``) or ``patients.parquet`` under
+    DATA_PATH, and reloaded when that file changes; a synthetic registry of
+    ``DEMO_REGISTRY_SIZE`` patients stands in when neither exists.
+    """
+    source = _registry_source()
+    return _patient_registry(source, os.path.getmtime(source) if source else None)
+
+
+@timed("search.patients")
+def search_patients(query, k=10):
+    """
+    Ranked registry matches for the sidebar search box
+
+    Returns:
+        tuple: (list of record dicts best first, total matches, search milliseconds)
+    """
+    registry = load_patient_registry()
+    start = time.perf_counter()
+    records, total = registry.search(query, k=k)
+    return records, total, (time.perf_counter() - start) * 1000
+
+
+@lru_cached(maxsize=4, name="risk_engines")
+def _risk_engine(model_type):
+    return RiskEngine(model_type)
+
+
+@lru_cached(maxsize=8, name="risk_features")
+@timed("features.risk")
+def load_risk_features(path, end):
+    """Risk-model window features of the ``RISK_LOOKBACK_SECONDS`` of a recording before ``end``"""
+    recording = open_recording(path)
+    start = max(0.0, end - RISK_LOOKBACK_SECONDS)
+    _, samples = recording.read_window(start, end - start)
+    return _read_only(window_features(samples, recording.sample_rate))
+
+
+@lru_cached(maxsize=16, name="risk_forecast")
+@timed("model.risk_forecast")
+def risk_forecast(path, end, model_type, level, patient_id, hour_of_day):
+    """
+    24 h seizure-risk forecast for a recording and patient, with bootstrap intervals at ``level``
+
+    Returns:
+        dict: ``risk``, ``lower``, ``upper`` (24 hourly probabilities) and ``horizon``
+            (probability of a seizure within 6 hours, lower, upper)
+    """
+    features = load_risk_features(path, end)
+    if len(features) == 0:
+        return None
+    clinical = clinical_features(load_patient_registry().get(patient_id))
+    result = _risk_engine(model_type).forecast(features[None], clinical[None], level=level, hour_of_day=hour_of_day)
+    return {name: _read_only(value[0]) for name, value in result.items()}
+
+
+@lru_cached(maxsize=1, name="correlations")
+@timed("features.cohort_correlation")
+def _synthetic_cohort():
+    accumulator = CorrelationAccumulator()
+    for chunk in synthetic_cohort_chunks(DEMO_CORRELATION_COHORT_SIZE, COHORT_CHUNK_ROWS, seed=0):
+        accumulator.update(chunk)
+    return accumulator
+
+
+@lru_cached(maxsize=1, name="cohort_files")
+def open_cohort(source):
+    """Cached ``CohortFile`` over a cohort CSV; call ``update`` to fold in appended patients"""
+    return CohortFile(source)
+
+
+def cohort_correlation(statistic):
+    """
+    Pairwise ``statistic`` over the cohort's ``COHORT_FEATURES``
+
+    The cohort streams in chunks from ``cohort_features.csv`` under DATA_PATH, or from a
+    synthetic cohort, through one set of accumulators that serves every statistic. Rows
+    appended to the file are folded into the accumulators; they are rebuilt only when
+    the file is rewritten.
+
+    Returns:
+        tuple: (read-only matrix, number of patients)
+    """
+    source = os.path.join(data_path(), "cohort_features.csv")
+    if not os.path.exists(source):
+        accumulator = _synthetic_cohort()
+        return _read_only(accumulator.matrix(statistic)), accumulator.count
+
+    cohort = open_cohort(source)
+    start = time.perf_counter()
+    if cohort.update():
+        record("features.cohort_correlation", (time.perf_counter() - start) * 1000)
+    matrix, count = cohort.matrix(statistic)
+    return _read_only(matrix), count
+
+
+def exports_dir():
+    """Directory under ``DATA_PATH`` that exports are written to"""
+    return os.path.join(data_path(), "exports")
+
+
+@lru_cached(maxsize=1, name="job_managers")
+def _job_manager(db_path):
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    return JobManager(db_path)
+
+
+def job_manager():
+    """Background job pool shared by every session, with its registry in ``jobs.sqlite`` under DATA_PATH"""
+    return _job_manager(os.path.join(data_path(), "jobs.sqlite"))
+
+
+def _model_attention_job(context, path, start, seconds):
+    result = load_model_attention(path, start, seconds)
+    return {"n_windows": result["n_windows"], "window_ms": result["window_ms"]}
+
+
+def model_attention_job(path, start, seconds, owner=None):
+    """
+    Job id of a background ``load_model_attention`` pass, or None when the result is already cached
+
+    Sessions asking for the same window share one job; once it finishes, calling
+    ``load_model_attention`` with the same arguments is a cache hit. A failed or
+    cancelled pass returns that job's id rather than starting another.
+    """
+    if make_key(path, start, seconds) in load_model_attention.cache:
+        return None
+    # A pass that failed or was cancelled is not retried until the window changes or the server restarts
+    key = f"model_attention:{path}:{start}:{seconds}"
+    last = job_manager().latest(key)
+    if last is not None and last["status"] in (FAILED, CANCELLED):
+        return last["id"]
+    return job_manager().submit(_model_attention_job, path, start, seconds, kind="inference", owner=owner,
+                                label=f"Attention model, {seconds / 60:.0f} min from {start:.0f} s", key=key)
+
+
+def _export_job(context, out_path, export_format, tables, metadata):
+    write_export(out_path, export_format, tables, metadata, progress=context.report)
+    return {"path": out_path, "size": os.path.getsize(out_path)}
+
+
+def start_export(export_format, path, start, seconds, attention=None, bin_width=0.2, forecast=None, inference=None,
+                 metadata=None, owner=None):
+    """
+    Queue an export of one dashboard view on the job pool and return its job id without waiting
+
+    The view's raw EEG is streamed from the recording block by block, next to the
+    attention map, the risk forecast and the model's per-window probabilities.
+
+    Args:
+        export_format (str): Key of ``EXPORT_FORMATS``
+        path (str): Recording directory or .edf file
+        start (float): View start in seconds
+        seconds (float): View length in seconds
+        attention (np.ndarray): Displayed attention scores of shape (n_channels, n_bins)
+        bin_width (float): Attention bin width in seconds
+        forecast (dict): Result of ``risk_forecast``
+        inference (dict): Result of ``load_model_attention``, for per-window probabilities
+        metadata (dict): Extra JSON-serializable fields, e.g. the patient and model settings
+        owner (str): Requesting session
+
+    Returns:
+        str: Job id; the finished job's result holds the file ``path`` and ``size``
+    """
+    if export_format in EXPORT_REQUIREMENTS and export_format not in available_export_formats():
+        raise ValueError(f"{export_format} export needs {EXPORT_REQUIREMENTS[export_format]}: "
+                         f"pip install {EXPORT_REQUIREMENTS[export_format]}")
+    recording = open_recording(path)
+    tables = export_tables(recording, start, seconds, attention=attention, bin_width=bin_width, forecast=forecast,
+                           window_probability=None if inference is None else inference["probability"],
+                           window_seconds=WINDOW_TOKENS * bin_width)
+    metadata = dict(metadata or {}, recording=os.path.relpath(path, data_path()), start_s=start, seconds=seconds,
+                    sample_rate=recording.sample_rate, channels=list(recording.channels),
+                    exported_at=time.strftime("%Y-%m-%d %H:%M:%S"))
+    if forecast is not None:
+        metadata["risk_within_6h"] = [round(float(value), 4) for value in forecast["horizon"]]
+
+    slug = export_format.split()[0].lower()
+    name = (f"{recording_name(path)}_{int(start)}-{int(start + seconds)}s_{time.strftime('%Y%m%d-%H%M%S')}_{slug}"
+            f"{EXPORT_FORMATS[export_format]}")
+    prune_exports(exports_dir(), keep=EXPORT_KEEP)
+    return job_manager().submit(_export_job, os.path.join(exports_dir(), name), export_format, tables, metadata,
+                                kind="export", label=f"{export_format} export, {seconds / 60:.1f} min", owner=owner)
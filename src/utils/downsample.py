@@ -0,0 +1,119 @@
+import numpy as np
+
+# Decimation modes offered in the sidebar
+DOWNSAMPLING_MODES = {
+    "Min/Max": "minmax",
+    "LTTB": "lttb",
+    "Off": None,
+}
+
+
+def points_for_width(width_px, points_per_pixel=2):
+    """Per-trace point budget for a plot ``width_px`` pixels wide"""
+    return max(4, int(width_px * points_per_pixel))
+
+
+def minmax_decimate(x, y, n_buckets):
+    """
+    Keep the minimum and maximum sample of each pixel bucket, in time order
+
+    Every extreme survives, so short spikes stay visible however long the recording.
+
+    Args:
+        x (np.ndarray): Shared sample times of length n
+        y (np.ndarray): Samples of shape (n_channels, n)
+        n_buckets (int): Number of buckets, typically the plot width in pixels
+
+    Returns:
+        tuple: (x, y), both of shape (n_channels, 2 * n_buckets)
+    """
+    n = y.shape[1]
+    bucket = -(-n // n_buckets)
+    n_buckets = -(-n // bucket)
+
+    # Pad the last partial bucket with its final value so every bucket has equal width
+    pad = n_buckets * bucket - n
+    if pad:
+        y = np.concatenate([y, np.repeat(y[:, -1:], pad, axis=1)], axis=1)
+    buckets = y.reshape(y.shape[0], n_buckets, bucket)
+
+    offsets = np.arange(n_buckets) * bucket
+    lo = buckets.argmin(axis=2) + offsets
+    hi = buckets.argmax(axis=2) + offsets
+
+    # Emit each bucket's two extremes in the order they occur
+    idx = np.stack([np.minimum(lo, hi), np.maximum(lo, hi)], axis=2).reshape(y.shape[0], -1)
+    idx = np.minimum(idx, n - 1)
+    rows = np.arange(y.shape[0])[:, None]
+    return x[idx], y[rows, idx]
+
+
+def lttb(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets downsampling of every channel at once
+
+    The loop runs over output buckets only; within a bucket all channels are scored
+    together, so the cost is O(n_out) NumPy calls regardless of channel count.
+
+    Args:
+        x (np.ndarray): Shared sample times of length n
+        y (np.ndarray): Samples of shape (n_channels, n)
+        n_out (int): Number of points to keep per channel, including both end points
+
+    Returns:
+        tuple: (x, y), both of shape (n_channels, n_out)
+    """
+    n_channels, n = y.shape
+    rows = np.arange(n_channels)
+
+    # Bucket edges over the interior points; the first and last samples are always kept
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+
+    # Averages of every bucket, used as the third triangle vertex for the bucket before it
+    csum_y = np.concatenate([np.zeros((n_channels, 1)), np.cumsum(y, axis=1, dtype=np.float64)], axis=1)
+    csum_x = np.concatenate([[0.0], np.cumsum(x, dtype=np.float64)])
+    counts = np.maximum(edges[1:] - edges[:-1], 1)
+    avg_x = (csum_x[edges[1:]] - csum_x[edges[:-1]]) / counts
+    avg_y = (csum_y[:, edges[1:]] - csum_y[:, edges[:-1]]) / counts
+    avg_x = np.append(avg_x, x[-1])
+    avg_y = np.concatenate([avg_y, y[:, -1:]], axis=1)
+
+    idx = np.empty((n_channels, n_out), dtype=np.int64)
+    idx[:, 0] = 0
+    idx[:, -1] = n - 1
+    a = np.zeros(n_channels, dtype=np.int64)
+
+    for i in range(n_out - 2):
+        lo, hi = edges[i], max(edges[i + 1], edges[i] + 1)
+        ax = x[a][:, None]
+        ay = y[rows, a][:, None]
+        cx = x[lo:hi][None, :]
+        cy = y[:, lo:hi]
+        area = np.abs((ax - avg_x[i + 1]) * (cy - ay) - (ax - cx) * (avg_y[:, i + 1:i + 2] - ay))
+        a = lo + area.argmax(axis=1)
+        idx[:, i + 1] = a
+
+    return x[idx], y[rows[:, None], idx]
+
+
+def decimate(x, y, max_points, mode="minmax"):
+    """
+    Reduce every channel to at most ``max_points`` points for plotting
+
+    Args:
+        x (np.ndarray): Shared sample times of length n
+        y (np.ndarray): Samples of shape (n_channels, n)
+        max_points (int): Point budget per channel, e.g. from ``points_for_width``
+        mode (str | None): "minmax", "lttb", or None to return the raw samples
+
+    Returns:
+        tuple: (x, y); x is 1-D when no decimation was needed and (n_channels, m) otherwise
+    """
+    n = y.shape[1]
+    if mode is None or max_points is None or n <= max_points:
+        return x, y
+    if mode == "minmax":
+        return minmax_decimate(x, y, max(1, max_points // 2))
+    if mode == "lttb":
+        return lttb(x, y, max(3, max_points))
+    raise ValueError(f"Unknown downsampling mode: {mode}")
@@ -0,0 +1,405 @@
+import mmap
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+
+ANNOTATION_LABEL = "EDF Annotations"
+
+# Per-signal header fields and their widths in bytes, in file order
+SIGNAL_FIELDS = [
+    ("label", 16), ("transducer", 80), ("physical_dimension", 8),
+    ("physical_min", 8), ("physical_max", 8), ("digital_min", 8), ("digital_max", 8),
+    ("prefiltering", 80), ("samples_per_record", 8), ("reserved", 32),
+]
+
+# Seconds of signal decoded per block by default
+DEFAULT_BLOCK_SECONDS = 10.0
+
+
+def _field(raw, start, width):
+    return raw[start:start + width].decode("latin-1").strip()
+
+
+def _parse_tals(data):
+    """
+    Parse the time-stamped annotation lists (TALs) of one annotation record
+
+    Returns:
+        list: (onset, duration, [texts]) tuples in record order
+    """
+    tals = []
+    for tal in data.split(b"\x00"):
+        if not tal:
+            continue
+        parts = tal.split(b"\x14")
+        timing = parts[0].split(b"\x15")
+        onset = float(timing[0])
+        duration = float(timing[1]) if len(timing) > 1 and timing[1] else 0.0
+        texts = [p.decode("utf-8", "replace") for p in parts[1:] if p]
+        tals.append((onset, duration, texts))
+    return tals
+
+
+class EDFReader:
+    """
+    Lazy EDF/EDF+ reader backed by a memory map
+
+    The header is parsed once; data records are exposed as a zero-copy ``np.frombuffer``
+    view over the mapped file and only decoded to physical units block by block, so
+    multi-gigabyte recordings never have to fit in memory.
+
+    Only ordinary signals sharing the most common sample rate are exposed as
+    ``channels``; the "EDF Annotations" signal is parsed into ``annotations``.
+
+    Args:
+        path (str): Path to an .edf file
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._parse_header()
+        self._annotations = None
+        self._onsets = None
+
+    def _parse_header(self):
+        raw = self._mmap[:256]
+        self.header_bytes = int(_field(raw, 184, 8))
+        self.reserved = _field(raw, 192, 44)
+        self.is_edf_plus = self.reserved.startswith("EDF+")
+        self.is_discontinuous = self.reserved.startswith("EDF+D")
+        self.record_duration = float(_field(raw, 244, 8))
+        n_signals = int(_field(raw, 252, 4))
+        self.patient = _field(raw, 8, 80)
+        self.recording_id = _field(raw, 88, 80)
+        try:
+            self.start_datetime = datetime.strptime(_field(raw, 168, 8) + _field(raw, 176, 8), "%d.%m.%y%H.%M.%S")
+        except ValueError:
+            self.start_datetime = None
+
+        # Signal fields are stored column-wise: every label, then every transducer, ...
+        raw = self._mmap[256:256 + 256 * n_signals]
+        self.signals = [{} for _ in range(n_signals)]
+        pos = 0
+        for name, width in SIGNAL_FIELDS:
+            for signal in self.signals:
+                signal[name] = _field(raw, pos, width)
+                pos += width
+        for signal in self.signals:
+            for name in ("physical_min", "physical_max", "digital_min", "digital_max"):
+                signal[name] = float(signal[name])
+            signal["samples_per_record"] = int(signal["samples_per_record"])
+            signal["gain"] = ((signal["physical_max"] - signal["physical_min"])
+                              / (signal["digital_max"] - signal["digital_min"]))
+            signal["offset"] = signal["physical_min"] - signal["gain"] * signal["digital_min"]
+
+        # Sample offsets of each signal inside a data record
+        spr = np.array([s["samples_per_record"] for s in self.signals])
+        self.record_samples = int(spr.sum())
+        self._signal_offsets = np.concatenate([[0], np.cumsum(spr)[:-1]])
+
+        # The record count in the header may be -1 while recording; trust the file size instead
+        record_bytes = 2 * self.record_samples
+        self.n_records = (len(self._mmap) - self.header_bytes) // record_bytes
+        self._records = np.frombuffer(self._mmap, dtype="<i2", count=self.n_records * self.record_samples,
+                                      offset=self.header_bytes).reshape(self.n_records, self.record_samples)
+
+        # Channels: ordinary signals at the dominant sample rate
+        ordinary = [i for i, s in enumerate(self.signals) if s["label"] != ANNOTATION_LABEL]
+        self._annotation_index = next((i for i, s in enumerate(self.signals) if s["label"] == ANNOTATION_LABEL), None)
+        rate_counts = Counter(self.signals[i]["samples_per_record"] for i in ordinary)
+        self.samples_per_record = rate_counts.most_common(1)[0][0] if rate_counts else 0
+        self._channel_index = [i for i in ordinary if self.signals[i]["samples_per_record"] == self.samples_per_record]
+        self.channels = [self.signals[i]["label"] for i in self._channel_index]
+        self.sample_rate = self.samples_per_record / self.record_duration if self.record_duration else 0.0
+
+        gains = np.array([self.signals[i]["gain"] for i in self._channel_index], dtype=np.float32)
+        offsets = np.array([self.signals[i]["offset"] for i in self._channel_index], dtype=np.float32)
+        self._gains = gains[:, None, None]
+        self._offsets = offsets[:, None, None]
+
+    @property
+    def n_samples(self):
+        return self.n_records * self.samples_per_record
+
+    @property
+    def duration(self):
+        """Seconds to the end of the last record, gaps of EDF+D files included"""
+        if self.is_discontinuous and self.n_records:
+            return float(self.record_onsets()[-1]) + self.record_duration
+        return self.n_records * self.record_duration
+
+    def refresh(self):
+        """No-op for the recording-store interface; EDF files are read as they were opened"""
+
+    def record_onsets(self):
+        """
+        Start time in seconds of every data record
+
+        EDF+D files carry each record's onset in its first annotation; otherwise records
+        are contiguous. Parsed once and kept.
+        """
+        if self._onsets is None:
+            if self.is_discontinuous and self._annotation_index is not None:
+                self._onsets = np.array([self._record_tals(r)[0][0] for r in range(self.n_records)], dtype=np.float64)
+            else:
+                self._onsets = np.arange(self.n_records) * self.record_duration
+        return self._onsets
+
+    def _record_at(self, seconds):
+        """Index of the last record starting at or before ``seconds``, or -1 before the first"""
+        return int(np.searchsorted(self.record_onsets(), seconds, "right")) - 1
+
+    def _sample_at(self, seconds):
+        """Index of the first sample at or after ``seconds``; times in a gap map to the next record"""
+        record = self._record_at(seconds)
+        if record < 0:
+            return 0
+        offset = int(round((seconds - self.record_onsets()[record]) * self.sample_rate))
+        return min(record * self.samples_per_record + min(max(0, offset), self.samples_per_record), self.n_samples)
+
+    def sample_times(self, lo, hi):
+        """Time in seconds of samples [lo, hi), from the onset of the record holding each"""
+        record, offset = np.divmod(np.arange(lo, hi), self.samples_per_record)
+        return self.record_onsets()[record] + offset / self.sample_rate
+
+    def _record_tals(self, record):
+        i = self._annotation_index
+        lo = self._signal_offsets[i]
+        hi = lo + self.signals[i]["samples_per_record"]
+        return _parse_tals(self._records[record, lo:hi].tobytes())
+
+    @property
+    def annotations(self):
+        """EDF+ annotations as event dicts with ``kind``, ``channel`` (None), ``start`` and ``end``"""
+        if self._annotations is None:
+            self._annotations = []
+            if self._annotation_index is not None:
+                for record in range(self.n_records):
+                    # The first TAL of each record only keeps time and is not an event
+                    for onset, duration, texts in self._record_tals(record)[1:]:
+                        for text in texts:
+                            self._annotations.append({"kind": text, "channel": None,
+                                                      "start": onset, "end": onset + duration})
+        return self._annotations
+
+    def annotations_in(self, start, end):
+        """Annotations overlapping the window [start, end) in seconds"""
+        return [a for a in self.annotations if a["start"] < end and a["end"] > start]
+
+    def decode_records(self, first, last, scaled=True):
+        """
+        Decode data records [first, last) of every channel to physical units
+
+        Args:
+            scaled (bool): Convert to physical units; otherwise the stored int16 values
+
+        Returns:
+            np.ndarray: float32 (int16 unless scaled) samples of shape
+                (n_channels, (last - first) * samples_per_record)
+        """
+        cols = self._signal_offsets[self._channel_index][:, None] + np.arange(self.samples_per_record)[None, :]
+        digital = self._records[first:last][:, cols]
+        if not scaled:
+            return np.ascontiguousarray(digital.transpose(1, 0, 2)).reshape(len(self.channels), -1)
+        physical = digital.transpose(1, 0, 2).astype(np.float32, order="C")
+        physical *= self._gains
+        physical += self._offsets
+        return physical.reshape(len(self.channels), -1)
+
+    def iter_blocks(self, block_seconds=DEFAULT_BLOCK_SECONDS, start=0.0, stop=None):
+        """
+        Stream the recording as consecutive decoded blocks
+
+        Args:
+            block_seconds (float): Approximate seconds per block, rounded to whole records
+            start (float): First second to stream
+            stop (float): Stop after this second; defaults to the end of the file
+
+        Yields:
+            tuple: (start_time in seconds, samples of shape (n_channels, n))
+        """
+        onsets = self.record_onsets()
+        per_block = max(1, int(round(block_seconds / self.record_duration)))
+        first = max(0, self._record_at(start))
+        last = self.n_records if stop is None else int(np.searchsorted(onsets, stop, "left"))
+        for lo in range(first, last, per_block):
+            hi = min(lo + per_block, last)
+            yield float(onsets[lo]), self.decode_records(lo, hi)
+
+    def sample_range(self, start, duration):
+        """
+        Clamp a window in seconds to sample indices [lo, hi)
+
+        Times are placed by record onset, so on EDF+D files a window never reaches past a
+        gap into samples recorded after its end.
+        """
+        if self.is_discontinuous:
+            lo = self._sample_at(start)
+            hi = max(lo, min(self._sample_at(start + duration), lo + int(round(duration * self.sample_rate))))
+            return lo, hi
+        lo = min(max(0, int(round(start * self.sample_rate))), self.n_samples)
+        hi = min(self.n_samples, lo + int(round(duration * self.sample_rate)))
+        return lo, hi
+
+    def read_window(self, start, duration, scaled=True):
+        """
+        Read the window [start, start + duration) seconds of every channel
+
+        Only the records covering the window are decoded.
+
+        Args:
+            scaled (bool): Decode to physical units; otherwise the stored int16 values
+
+        Returns:
+            tuple: (time array in seconds, float32 (int16 unless scaled) samples of shape (n_channels, n))
+        """
+        lo, hi = self.sample_range(start, duration)
+        return self.sample_times(lo, hi), self.read_samples(lo, hi, scaled=scaled)
+
+    def read_samples(self, lo, hi, scaled=True):
+        """Samples [lo, hi) of every channel, decoding only the records that cover them"""
+        hi = max(lo, hi)
+        first = lo // self.samples_per_record
+        last = -(-hi // self.samples_per_record)
+        block = self.decode_records(first, last, scaled=scaled)
+        skip = lo - first * self.samples_per_record
+        return block[:, skip:skip + hi - lo]
+
+    def close(self):
+        # Drop the buffer views before closing the map they point into
+        self._records = None
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _header_field(value, width):
+    text = str(value)
+    if len(text) > width:
+        # Numbers may be shortened; anything else must fit
+        try:
+            float(text)
+            text = text[:width]
+        except ValueError:
+            raise ValueError(f"EDF header field too long for {width} bytes: {text!r}")
+    return text.ljust(width).encode("latin-1")
+
+
+def _format_number(value, width=8):
+    """Shortest representation of ``value`` that fits an EDF numeric field"""
+    for digits in range(width, 0, -1):
+        text = f"{value:.{digits}g}"
+        if len(text) <= width:
+            return text
+    raise ValueError(f"Cannot format {value} in {width} characters")
+
+
+def write_edf(path, data, channels, sample_rate, record_duration=1.0, physical_dimension="uV",
+              annotations=None, start_datetime=None, patient="X", chunk_records=60, record_onsets=None):
+    """
+    Write an EDF file, or EDF+C when annotations are given, or EDF+D when record onsets are
+
+    Samples are quantized to 16 bits over each channel's own range and written a chunk of
+    records at a time.
+
+    Args:
+        path (str): Output .edf path
+        data (np.ndarray): Samples of shape (n_channels, n_samples); trailing samples that do
+            not fill a whole record are dropped
+        channels (list): Channel labels
+        sample_rate (float): Samples per second; sample_rate * record_duration must be whole
+        record_duration (float): Seconds per data record
+        physical_dimension (str): Unit label stored for every channel
+        annotations (list): Event dicts with ``kind``, ``start`` and ``end`` in seconds
+        start_datetime (datetime): Recording start; defaults to now
+        patient (str): Patient identification field
+        chunk_records (int): Records encoded per write
+        record_onsets (list): Start in seconds of each data record, for a discontinuous recording
+    """
+    data = np.asarray(data)
+    spr = int(round(sample_rate * record_duration))
+    if abs(spr - sample_rate * record_duration) > 1e-9:
+        raise ValueError("sample_rate * record_duration must be a whole number of samples")
+    n_records = data.shape[1] // spr
+    start_datetime = start_datetime or datetime.now()
+    discontinuous = record_onsets is not None
+    edf_plus = annotations is not None or discontinuous
+    annotations = annotations or []
+
+    phys_min = data.min(axis=1).astype(np.float64)
+    phys_max = data.max(axis=1).astype(np.float64)
+    phys_max = np.where(phys_max > phys_min, phys_max, phys_min + 1)
+    # Round the stored range outwards to what the 8-character fields can hold
+    phys_min = np.array([float(_format_number(np.floor(v * 1e3) / 1e3)) for v in phys_min])
+    phys_max = np.array([float(_format_number(np.ceil(v * 1e3) / 1e3)) for v in phys_max])
+    dig_min, dig_max = -32768, 32767
+    gain = (phys_max - phys_min) / (dig_max - dig_min)
+
+    # Annotation TALs, one per record: the record time-keeper followed by any events starting in it
+    annotation_spr = 0
+    tal_records = []
+    if edf_plus:
+        for r in range(n_records):
+            onset = record_onsets[r] if discontinuous else r * record_duration
+            tal = f"+{onset:g}\x14\x14\x00".encode()
+            for event in annotations:
+                if onset <= event["start"] < onset + record_duration:
+                    duration = event["end"] - event["start"]
+                    tal += f"+{event['start']:g}\x15{duration:g}\x14{event['kind']}\x14\x00".encode()
+            tal_records.append(tal)
+        annotation_spr = max(len(t) for t in tal_records) // 2 + 1 if tal_records else 1
+
+    labels = list(channels) + ([ANNOTATION_LABEL] if edf_plus else [])
+    n_signals = len(labels)
+
+    header = b"".join([
+        _header_field("0", 8),
+        _header_field(patient, 80),
+        _header_field(f"Startdate {start_datetime.strftime('%d-%b-%Y').upper()} X X X" if edf_plus else "X", 80),
+        _header_field(start_datetime.strftime("%d.%m.%y"), 8),
+        _header_field(start_datetime.strftime("%H.%M.%S"), 8),
+        _header_field(256 * (n_signals + 1), 8),
+        _header_field(("EDF+D" if discontinuous else "EDF+C") if edf_plus else "", 44),
+        _header_field(n_records, 8),
+        _header_field(_format_number(record_duration), 8),
+        _header_field(n_signals, 4),
+    ])
+
+    def column(values, width):
+        return b"".join(_header_field(v, width) for v in values)
+
+    extra = 1 if edf_plus else 0
+    header += column(labels, 16)
+    header += column([""] * n_signals, 80)
+    header += column([physical_dimension] * len(channels) + [""] * extra, 8)
+    header += column([_format_number(v) for v in phys_min] + ["-1"] * extra, 8)
+    header += column([_format_number(v) for v in phys_max] + ["1"] * extra, 8)
+    header += column([dig_min] * n_signals, 8)
+    header += column([dig_max] * n_signals, 8)
+    header += column([""] * n_signals, 80)
+    header += column([spr] * len(channels) + [annotation_spr] * extra, 8)
+    header += column([""] * n_signals, 32)
+
+    with open(path, "wb") as f:
+        f.write(header)
+        for lo in range(0, n_records, chunk_records):
+            hi = min(lo + chunk_records, n_records)
+            block = data[:, lo * spr:hi * spr].astype(np.float64)
+            digital = np.clip(np.rint((block - phys_min[:, None]) / gain[:, None] + dig_min), dig_min, dig_max)
+            # (records, channels, samples) is the on-disk record order
+            records = digital.astype("<i2").reshape(len(channels), hi - lo, spr).transpose(1, 0, 2)
+            records = records.reshape(hi - lo, -1)
+            if edf_plus:
+                tal_block = np.zeros((hi - lo, annotation_spr * 2), dtype=np.uint8)
+                for i, tal in enumerate(tal_records[lo:hi]):
+                    tal_block[i, :len(tal)] = np.frombuffer(tal, dtype=np.uint8)
+                records = np.concatenate([records.view(np.uint8), tal_block], axis=1)
+            f.write(np.ascontiguousarray(records).tobytes())
@@ -0,0 +1,166 @@
+import numpy as np
+
+# Dominant (alpha) frequency per channel in Hz; unknown channels fall back to 10 Hz
+BASE_FREQS = {
+    'Fp1': 10, 'Fp2': 11, 'F3': 9, 'F4': 10,
+    'C3': 12, 'C4': 11, 'P3': 8, 'P4': 9,
+    'O1': 10, 'O2': 11, 'T3': 9, 'T4': 10,
+    'T5': 12, 'T6': 11
+}
+
+# Spike-and-wave discharge on F3 between 15-20 seconds, as shown on the dashboard
+DEFAULT_ARTIFACTS = [
+    {"kind": "spike_wave", "channel": "F3", "start": 15.0, "end": 20.0, "period": 0.3},
+]
+
+# Number of channel-samples synthesized per block; bounds the float64 temporaries
+CHUNK_ELEMENTS = 1 << 20
+
+
+def _spike_wave_template(sample_rate):
+    """50 ms 30 Hz spike of amplitude 2 followed by a 150 ms inverted 3 Hz slow wave"""
+    spike_len = int(0.05 * sample_rate)
+    total_len = int(0.2 * sample_rate)
+    t = np.arange(total_len) / sample_rate
+    template = np.empty(total_len, dtype=np.float32)
+    template[:spike_len] = 2 * np.sin(2 * np.pi * 30 * t[:spike_len])
+    template[spike_len:] = -1 * np.sin(2 * np.pi * 3 * t[:total_len - spike_len])
+    return template
+
+
+def _spike_template(sample_rate):
+    """Isolated 50 ms 30 Hz spike of amplitude 2"""
+    spike_len = int(0.05 * sample_rate)
+    t = np.arange(spike_len) / sample_rate
+    return (2 * np.sin(2 * np.pi * 30 * t)).astype(np.float32)
+
+
+ARTIFACT_TEMPLATES = {
+    "spike_wave": _spike_wave_template,
+    "spike": _spike_template,
+}
+
+
+def recurring_artifacts(seconds, every=300.0, offset=15.0, length=5.0, channel='F3', kind='spike_wave'):
+    """Artifact dicts repeating the dashboard's discharge at ``offset`` seconds into every ``every``-second block"""
+    return [
+        {"kind": kind, "channel": channel, "start": block + offset, "end": block + offset + length, "period": 0.3}
+        for block in np.arange(0.0, seconds, every).tolist()
+        if block + offset + length <= seconds
+    ]
+
+
+def _apply_artifacts(data, channels, artifacts, sample_rate, start):
+    """Overwrite the artifact templates into ``data`` in place with fancy indexing"""
+    n_samples = data.shape[1]
+    for artifact in artifacts:
+        if artifact["channel"] not in channels:
+            continue
+        row = channels.index(artifact["channel"])
+        template = ARTIFACT_TEMPLATES[artifact["kind"]](sample_rate)
+
+        # Onsets in absolute samples, then shifted to this block
+        first = int(artifact["start"] * sample_rate)
+        last = int(artifact["end"] * sample_rate)
+        step = max(1, int(artifact.get("period", 0.3) * sample_rate))
+        onsets = np.arange(first, last, step) - int(round(start * sample_rate))
+
+        # Templates may straddle the block edges; only their in-block samples are written
+        onsets = onsets[(onsets + len(template) > 0) & (onsets < n_samples)]
+        if len(onsets) == 0:
+            continue
+
+        idx = onsets[:, None] + np.arange(len(template))[None, :]
+        inside = (idx >= 0) & (idx < n_samples)
+        data[row, idx[inside]] = np.broadcast_to(template, idx.shape)[inside]
+
+
+def _oscillations(freqs, time):
+    """
+    Alpha/beta/theta mix for every channel at the given times
+
+    Args:
+        freqs (np.ndarray): Column vector of channel base frequencies
+        time (np.ndarray): Sample times in seconds
+
+    Returns:
+        np.ndarray: float32 array of shape (n_channels, len(time))
+    """
+    # Half-angle of the alpha phase, wrapped to one theta period so float32 keeps its precision
+    half = (np.pi * ((freqs * time[None, :]) % 2.0)).astype(np.float32)
+    s_half = np.sin(half)
+    c_half = np.cos(half)
+
+    # Double-angle identities give alpha and beta from the theta sin/cos pair
+    alpha = 2 * s_half * c_half
+    beta = 2 * alpha * (1 - 2 * s_half * s_half)
+    signal = alpha
+    signal += 0.3 * beta
+    signal += 0.2 * s_half
+    return signal
+
+
+def generate_eeg_batch(channels, seconds, sample_rate=250, seed=None, artifacts=DEFAULT_ARTIFACTS,
+                       start=0.0, dtype=np.float32):
+    """
+    Generate synthetic multichannel EEG as a single ``(n_channels, n_samples)`` array
+
+    Each channel is the same alpha/beta/theta mix as the original per-channel generator
+    (sin(f) + 0.3 sin(2f) + 0.2 sin(f/2) + 0.1 noise), built by broadcasting the channel
+    frequencies against the time axis. The oscillatory part is periodic, so it is computed
+    for a single period and tiled; noise is drawn in fixed-size blocks so temporaries stay
+    bounded regardless of duration.
+
+    Args:
+        channels (list): Channel names; frequencies are looked up in ``BASE_FREQS``
+        seconds (float): Duration to generate
+        sample_rate (int): Samples per second
+        seed (int | np.random.Generator | None): Seed or generator for the noise component
+        artifacts (list): Artifact dicts with ``kind`` (key of ``ARTIFACT_TEMPLATES``),
+            ``channel``, ``start``/``end`` in absolute seconds and optional ``period``
+        start (float): Absolute time of the first sample, so consecutive calls with the
+            same generator produce a continuous recording
+        dtype: Output dtype, float32 by default
+
+    Returns:
+        tuple: (time array in seconds, EEG array of shape (n_channels, n_samples))
+    """
+    rng = np.random.default_rng(seed)
+    n_samples = int(round(seconds * sample_rate))
+    start_sample = int(round(start * sample_rate))
+    time = (start_sample + np.arange(n_samples)) / sample_rate
+
+    freqs = np.array([BASE_FREQS.get(channel, 10) for channel in channels], dtype=np.float64)[:, None]
+    data = np.empty((len(channels), n_samples), dtype=dtype)
+
+    # With integer frequencies every channel repeats exactly every 2 seconds, so only one
+    # period is synthesized and then tiled; otherwise the whole time axis is evaluated
+    if np.all(freqs == np.round(freqs)) and float(sample_rate).is_integer():
+        period = int(2 * sample_rate)
+        offset = start_sample % period
+        phase_time = (offset + np.arange(period)) / sample_rate
+        template = _oscillations(freqs, phase_time).astype(dtype)
+
+        n_full = n_samples // period
+        data[:, :n_full * period].reshape(len(channels), n_full, period)[:] = template[:, None, :]
+        data[:, n_full * period:] = template[:, :n_samples - n_full * period]
+    else:
+        chunk = max(1, CHUNK_ELEMENTS // max(1, len(channels)))
+        for lo in range(0, n_samples, chunk):
+            hi = min(lo + chunk, n_samples)
+            data[:, lo:hi] = _oscillations(freqs, time[lo:hi])
+
+    # Additive noise, drawn block by block straight into float32 scratch space
+    chunk = max(1, CHUNK_ELEMENTS // max(1, len(channels)))
+    noise = np.empty(len(channels) * min(chunk, n_samples), dtype=np.float32)
+    for lo in range(0, n_samples, chunk):
+        hi = min(lo + chunk, n_samples)
+        block = noise[:len(channels) * (hi - lo)].reshape(len(channels), hi - lo)
+        rng.standard_normal(dtype=np.float32, out=block)
+        block *= 0.1
+        data[:, lo:hi] += block
+
+    if artifacts:
+        _apply_artifacts(data, list(channels), artifacts, sample_rate, start)
+
+    return time, data
@@ -0,0 +1,423 @@
+import importlib.util
+import io
+import json
+import os
+import time
+import zipfile
+
+import numpy as np
+
+from utils.attention import pool_bins
+from utils.downsample import decimate
+from utils.figures import montage_order
+
+# Options of the "Export Format" selector and the file extension each one writes; CSV and
+# Parquet hold one file per table, so they are zip archives
+EXPORT_FORMATS = {
+    "CSV": ".zip",
+    "JSON": ".json",
+    "NPZ": ".npz",
+    "Parquet": ".zip",
+    "PDF Report": ".pdf",
+    "DICOM": ".dcm",
+}
+
+# Optional package each format's writer imports; formats whose package is missing are not offered
+EXPORT_REQUIREMENTS = {
+    "Parquet": "pyarrow",
+    "DICOM": "pydicom",
+}
+
+EXPORT_MIME_TYPES = {
+    ".zip": "application/zip",
+    ".json": "application/json",
+    ".npz": "application/octet-stream",
+    ".pdf": "application/pdf",
+    ".dcm": "application/dicom",
+}
+
+# Seconds of EEG read, converted and written at a time, so memory stays bounded on long windows
+EXPORT_BLOCK_SECONDS = 60
+
+# Points per channel of the EEG traces drawn in PDF reports
+REPORT_POINTS = 4000
+
+# Time bins of the attention map drawn in PDF reports
+REPORT_BINS = 1000
+
+
+class ExportTable:
+    """
+    Uniformly spaced table streamed block by block to any export format
+
+    Row ``i`` is at time ``start + i * step``; ``blocks`` yields the values of consecutive
+    rows as arrays of shape (len(columns), n), so no format ever holds the whole table.
+
+    Args:
+        name (str): Table name, used for file and array names
+        time_label (str): Name of the time column
+        start (float): Time of the first row
+        step (float): Time between rows
+        columns (list): Value column names
+        rows (int): Total number of rows
+        blocks (callable): Returns an iterator over the value blocks
+    """
+
+    def __init__(self, name, time_label, start, step, columns, rows, blocks):
+        self.name = name
+        self.time_label = time_label
+        self.start = start
+        self.step = step
+        self.columns = list(columns)
+        self.rows = rows
+        self.blocks = blocks
+
+    def times(self, offset, n):
+        return self.start + self.step * np.arange(offset, offset + n)
+
+    def iter_rows(self, progress=None):
+        """Yield (times, values) block by block"""
+        offset = 0
+        for values in self.blocks():
+            n = values.shape[1]
+            yield self.times(offset, n), values
+            offset += n
+            if progress is not None:
+                progress(n)
+
+
+def _array_blocks(values, block_rows):
+    def blocks():
+        for lo in range(0, values.shape[1], block_rows):
+            yield values[:, lo:lo + block_rows]
+    return blocks
+
+
+def export_tables(recording, start, seconds, attention=None, bin_width=0.2, forecast=None, window_probability=None,
+                  window_seconds=None, block_seconds=EXPORT_BLOCK_SECONDS):
+    """
+    Tables of one dashboard view: raw EEG, attention map and model predictions
+
+    EEG blocks are read from the recording's memory map as they are written, so only one
+    block of samples is held at a time.
+
+    Args:
+        recording: ``RecordingReader`` or ``EDFReader``
+        start (float): View start in seconds
+        seconds (float): View length in seconds
+        attention (np.ndarray): Attention scores of shape (n_channels, n_bins), or None
+        bin_width (float): Attention bin width in seconds
+        forecast (dict): Risk forecast with hourly ``risk``, ``lower`` and ``upper``, or None
+        window_probability (np.ndarray): Seizure probability of each model window, or None
+        window_seconds (float): Length of a model window in seconds
+        block_seconds (float): Seconds of EEG per block
+
+    Returns:
+        list: ``ExportTable`` objects
+    """
+    rate = recording.sample_rate
+    lo = min(max(0, int(round(start * rate))), recording.n_samples)
+    hi = min(recording.n_samples, lo + int(round(seconds * rate)))
+    block_samples = max(1, int(block_seconds * rate))
+
+    def eeg_blocks():
+        for first in range(lo, hi, block_samples):
+            yield recording.read_samples(first, min(hi, first + block_samples))
+
+    tables = [ExportTable("eeg", "time_s", lo / rate, 1.0 / rate, recording.channels, hi - lo, eeg_blocks)]
+    if attention is not None:
+        tables.append(ExportTable("attention", "time_s", start, bin_width, recording.channels, attention.shape[1],
+                                  _array_blocks(attention, max(1, int(block_seconds / bin_width)))))
+    if forecast is not None:
+        risk = np.stack([forecast["risk"], forecast["lower"], forecast["upper"]])
+        tables.append(ExportTable("risk_forecast", "hour", 0, 1, ["risk", "lower", "upper"], risk.shape[1],
+                                  _array_blocks(risk, risk.shape[1])))
+    if window_probability is not None and len(window_probability):
+        probability = np.asarray(window_probability)[None]
+        tables.append(ExportTable("window_probability", "time_s", start, window_seconds, ["probability"],
+                                  probability.shape[1], _array_blocks(probability, probability.shape[1])))
+    return tables
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _dumps(value):
+    return json.dumps(value, default=_json_default)
+
+
+def _write_csv(out, tables, metadata, progress):
+    # Deflate at level 1: CSV shrinks severalfold while compression stays cheaper than formatting
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as archive:
+        archive.writestr("metadata.json", json.dumps(metadata, indent=2, default=_json_default))
+        for table in tables:
+            with archive.open(f"{table.name}.csv", "w", force_zip64=True) as raw, \
+                    io.TextIOWrapper(raw, encoding="utf-8", newline="") as handle:
+                handle.write(",".join([table.time_label] + table.columns) + "\n")
+                # Times keep enough decimals for the sample spacing; values keep six significant digits
+                fmt = ["%.4f"] + ["%.6g"] * len(table.columns)
+                for times, values in table.iter_rows(progress):
+                    np.savetxt(handle, np.column_stack([times, values.T]), fmt=fmt, delimiter=",")
+
+
+def _write_json(out, tables, metadata, progress):
+    # One document, written row block by row block: {"metadata": ..., "tables": {name: {"columns", "rows"}}}
+    with open(out, "w", encoding="utf-8") as handle:
+        handle.write('{"metadata": ' + _dumps(metadata) + ', "tables": {')
+        for i, table in enumerate(tables):
+            handle.write(("" if i == 0 else ", ") + _dumps(table.name) + ': {"columns": '
+                         + _dumps([table.time_label] + table.columns) + ', "rows": [')
+            first = True
+            for times, values in table.iter_rows(progress):
+                if values.shape[1] == 0:
+                    continue
+                rows = np.column_stack([times, values.T.astype(np.float64)])
+                handle.write(("" if first else ", ") + json.dumps(np.round(rows, 6).tolist())[1:-1])
+                first = False
+            handle.write("]}")
+        handle.write("}}")
+
+
+def _write_npy(archive, name, array_shape, dtype, chunks, fortran_order=False):
+    """Stream an .npy member of known shape into an open zip archive, chunk by chunk"""
+    with archive.open(name + ".npy", "w", force_zip64=True) as handle:
+        np.lib.format.write_array_header_2_0(handle, {"descr": np.lib.format.dtype_to_descr(np.dtype(dtype)),
+                                                      "fortran_order": fortran_order, "shape": array_shape})
+        for chunk in chunks:
+            handle.write(np.ascontiguousarray(chunk, dtype=dtype).tobytes())
+
+
+def _write_npz(out, tables, metadata, progress):
+    # Readable with np.load. Each table keeps the dashboard's (n_columns, n_rows) layout, stored in
+    # Fortran order so every block of rows is one contiguous write; times are {name}_start + i * {name}_step
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_STORED, allowZip64=True) as archive:
+        _write_npy(archive, "metadata", (), "<U" + str(len(_dumps(metadata))), [np.array(_dumps(metadata))])
+        for table in tables:
+            dtype = "<f4" if table.name in ("eeg", "attention") else "<f8"
+            _write_npy(archive, table.name, (len(table.columns), table.rows), dtype,
+                       (values.T for _, values in table.iter_rows(progress)), fortran_order=True)
+            _write_npy(archive, f"{table.name}_columns", (len(table.columns),),
+                       "<U" + str(max(map(len, table.columns))), [np.array(table.columns)])
+            _write_npy(archive, f"{table.name}_start", (), "<f8", [np.array(table.start)])
+            _write_npy(archive, f"{table.name}_step", (), "<f8", [np.array(table.step)])
+
+
+def _write_parquet(out, tables, metadata, progress):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ImportError("Parquet export needs pyarrow: pip install pyarrow") from exc
+
+    # Parquet is already compressed, so members are stored as they are
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_STORED, allowZip64=True) as archive:
+        archive.writestr("metadata.json", json.dumps(metadata, indent=2, default=_json_default))
+        for table in tables:
+            value_type = pa.float32() if table.name in ("eeg", "attention") else pa.float64()
+            schema = pa.schema([(table.time_label, pa.float64())] + [(column, value_type) for column in table.columns])
+            with archive.open(f"{table.name}.parquet", "w", force_zip64=True) as handle, \
+                    pq.ParquetWriter(handle, schema, compression="zstd") as writer:
+                for times, values in table.iter_rows(progress):
+                    writer.write_table(pa.Table.from_arrays([pa.array(times)] + list(values), schema=schema))
+
+
+def _write_pdf(out, tables, metadata, progress):
+    # Rendered off-screen with matplotlib's object API, which is safe outside the main thread
+    from matplotlib.backends.backend_pdf import PdfPages
+    from matplotlib.figure import Figure
+
+    by_name = {table.name: table for table in tables}
+    with PdfPages(out) as pdf:
+        # Summary page
+        fig = Figure(figsize=(8.27, 11.69))
+        fig.text(0.08, 0.94, "NeuroAI EEG Report", fontsize=18, weight="bold")
+        lines = [f"{key.replace('_', ' ').capitalize()}: {value}" for key, value in metadata.items()
+                 if not isinstance(value, (list, dict))]
+        fig.text(0.08, 0.9, "\n".join(lines), fontsize=10, va="top", family="monospace")
+        if "risk_forecast" in by_name:
+            table = by_name["risk_forecast"]
+            hours, (risk, lower, upper) = next(table.iter_rows(progress))
+            ax = fig.add_axes([0.1, 0.08, 0.82, 0.3])
+            ax.fill_between(hours, lower, upper, color="#e74c3c", alpha=0.2, linewidth=0)
+            ax.plot(hours, risk, color="#e74c3c", label="Seizure Risk")
+            ax.set(title="Predicted Seizure Risk", xlabel="Hours from Now", ylabel="Probability", ylim=(0, 1))
+        pdf.savefig(fig)
+
+        # EEG traces, min/max decimated block by block so long windows never load at once
+        table = by_name["eeg"]
+        xs, ys = [], []
+        for times, values in table.iter_rows(progress):
+            budget = int(REPORT_POINTS * values.shape[1] / max(table.rows, 1))
+            x, y = decimate(times, values, max(2, budget), mode="minmax")
+            xs.append(np.broadcast_to(x, y.shape))
+            ys.append(y)
+        fig = Figure(figsize=(11.69, 8.27))
+        ax = fig.add_axes([0.08, 0.08, 0.88, 0.86])
+        if xs:
+            x, y = np.concatenate(xs, axis=1), np.concatenate(ys, axis=1)
+            order = montage_order(table.columns)
+            spacing = max(float(np.percentile(np.abs(y), 99)) * 2.5, 1e-6)
+            for row, channel in enumerate(order):
+                ax.plot(x[channel], y[channel] - row * spacing, color="#2c3e50", linewidth=0.4)
+            ax.set_yticks(-np.arange(len(order)) * spacing, [table.columns[c] for c in order])
+        ax.set(title="EEG", xlabel="Time (s)")
+        pdf.savefig(fig)
+
+        # Attention map, pooled to the page width
+        if "attention" in by_name:
+            table = by_name["attention"]
+            values = np.concatenate([values for _, values in table.iter_rows(progress)], axis=1)
+            pooled, width = pool_bins(values, max_bins=REPORT_BINS, bin_width=table.step)
+            fig = Figure(figsize=(11.69, 8.27))
+            ax = fig.add_axes([0.08, 0.08, 0.8, 0.86])
+            image = ax.imshow(pooled, aspect="auto", cmap="Reds", vmin=0, vmax=1, interpolation="nearest",
+                              extent=(table.start, table.start + pooled.shape[1] * width, len(table.columns), 0))
+            ax.set_yticks(np.arange(len(table.columns)) + 0.5, table.columns)
+            ax.set(title="Attention Map", xlabel="Time (s)")
+            fig.colorbar(image, ax=ax, label="Attention Score")
+            pdf.savefig(fig)
+
+        info = pdf.infodict()
+        info["Title"] = "NeuroAI EEG Report"
+        info["Subject"] = f"Patient {metadata.get('patient_id', '')}"
+
+
+def _write_dicom(out, tables, metadata, progress):
+    try:
+        import pydicom
+        from pydicom.dataset import Dataset, FileMetaDataset
+        from pydicom.uid import ExplicitVRLittleEndian, generate_uid
+    except ImportError as exc:
+        raise ImportError("DICOM export needs pydicom: pip install pydicom") from exc
+
+    # Routine Scalp EEG waveform: one multiplex group of int16 samples, interleaved by channel,
+    # each channel scaled to its own peak. Only the EEG table has a place in the object
+    table = next(table for table in tables if table.name == "eeg")
+    peaks = np.zeros(len(table.columns), dtype=np.float64)
+    for _, values in table.iter_rows():
+        if values.shape[1]:
+            peaks = np.maximum(peaks, np.abs(values).max(axis=1))
+    sensitivity = np.maximum(peaks, 1e-6) / 32767
+    samples = np.empty((table.rows, len(table.columns)), dtype="<i2")
+    offset = 0
+    for _, values in table.iter_rows(progress):
+        n = values.shape[1]
+        samples[offset:offset + n] = np.rint(values.T / sensitivity)
+        offset += n
+
+    sop_class = "1.2.840.10008.5.1.4.1.1.9.7.4"
+    meta = FileMetaDataset()
+    meta.MediaStorageSOPClassUID = sop_class
+    meta.MediaStorageSOPInstanceUID = generate_uid()
+    meta.TransferSyntaxUID = ExplicitVRLittleEndian
+
+    ds = Dataset()
+    ds.file_meta = meta
+    ds.SOPClassUID = sop_class
+    ds.SOPInstanceUID = meta.MediaStorageSOPInstanceUID
+    ds.StudyInstanceUID = generate_uid()
+    ds.SeriesInstanceUID = generate_uid()
+    ds.Modality = "EEG"
+    ds.PatientID = str(metadata.get("patient_id", ""))
+    ds.PatientName = f"Patient^{ds.PatientID}"
+    ds.ContentDate = time.strftime("%Y%m%d")
+    ds.ContentTime = time.strftime("%H%M%S")
+
+    group = Dataset()
+    group.MultiplexGroupTimeOffset = float(table.start) * 1000
+    group.WaveformOriginality = "ORIGINAL"
+    group.NumberOfWaveformChannels = len(table.columns)
+    group.NumberOfWaveformSamples = table.rows
+    group.SamplingFrequency = 1.0 / table.step
+    group.MultiplexGroupLabel = "EEG"
+    group.WaveformBitsAllocated = 16
+    group.WaveformSampleInterpretation = "SS"
+    definitions = []
+    for number, (channel, scale) in enumerate(zip(table.columns, sensitivity), 1):
+        source = Dataset()
+        source.CodeValue, source.CodingSchemeDesignator, source.CodeMeaning = channel, "99NEUROAI", channel
+        units = Dataset()
+        units.CodeValue, units.CodingSchemeDesignator, units.CodeMeaning = "uV", "UCUM", "microvolt"
+        definition = Dataset()
+        definition.WaveformChannelNumber = number
+        definition.ChannelLabel = channel
+        definition.ChannelSourceSequence = [source]
+        definition.ChannelSensitivity = f"{scale:.8g}"[:16]
+        definition.ChannelSensitivityUnitsSequence = [units]
+        definition.ChannelSensitivityCorrectionFactor = 1
+        definition.ChannelBaseline = 0
+        definition.WaveformBitsStored = 16
+        definitions.append(definition)
+    group.ChannelDefinitionSequence = definitions
+    group.WaveformData = samples.tobytes()
+    ds.WaveformSequence = [group]
+    ds.save_as(out, enforce_file_format=True)
+
+
+_WRITERS = {
+    "CSV": _write_csv,
+    "JSON": _write_json,
+    "NPZ": _write_npz,
+    "Parquet": _write_parquet,
+    "PDF Report": _write_pdf,
+    "DICOM": _write_dicom,
+}
+
+
+def available_export_formats():
+    """``EXPORT_FORMATS`` that can be written here, leaving out those whose optional package is not installed"""
+    return [name for name in EXPORT_FORMATS
+            if name not in EXPORT_REQUIREMENTS or importlib.util.find_spec(EXPORT_REQUIREMENTS[name]) is not None]
+
+
+def write_export(out_path, export_format, tables, metadata, progress=None):
+    """
+    Write ``tables`` to ``out_path`` in one of ``EXPORT_FORMATS``
+
+    The file is written under a temporary name and renamed when complete, so a reader
+    never sees a partial export.
+
+    Args:
+        out_path (str): Destination file
+        export_format (str): Key of ``EXPORT_FORMATS``
+        tables (list): ``ExportTable`` objects from ``export_tables``
+        metadata (dict): JSON-serializable description of the export
+        progress (callable): Receives the fraction of rows written so far
+    """
+    total = max(1, sum(table.rows for table in tables))
+    written = [0]
+
+    def advance(n):
+        written[0] += n
+        if progress is not None:
+            progress(min(1.0, written[0] / total))
+
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    tmp_path = out_path + ".tmp"
+    try:
+        _WRITERS[export_format](tmp_path, tables, metadata, advance)
+        os.replace(tmp_path, out_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return out_path
+
+
+def export_mime(path):
+    """MIME type of an export file, for the download button"""
+    return EXPORT_MIME_TYPES[os.path.splitext(path)[1]]
+
+
+def prune_exports(directory, keep=20):
+    """Delete all but the ``keep`` newest files in the export directory"""
+    if not os.path.isdir(directory):
+        return
+    files = sorted((os.path.join(directory, name) for name in os.listdir(directory) if not name.endswith(".tmp")),
+                   key=os.path.getmtime, reverse=True)
+    for path in files[keep:]:
+        os.remove(path)
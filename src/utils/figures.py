@@ -0,0 +1,343 @@
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from utils.attention import bin_times
+from utils.downsample import decimate
+from utils.instrumentation import timed
+
+# Top-to-bottom order of a clinical longitudinal montage: left then right parasagittal
+# chains, left then right temporal chains, then the midline
+CLINICAL_ORDER = [
+    'Fp1', 'F3', 'C3', 'P3', 'O1',
+    'Fp2', 'F4', 'C4', 'P4', 'O2',
+    'F7', 'T3', 'T5', 'F8', 'T4', 'T6',
+    'Fz', 'Cz', 'Pz',
+]
+
+# EEG render modes offered in the sidebar
+EEG_RENDER_MODES = ["Subplots (SVG)", "Stacked (WebGL)"]
+
+
+def montage_order(channels):
+    """Row order for ``channels`` following ``CLINICAL_ORDER``; unknown channels keep their order at the end"""
+    rank = {name: i for i, name in enumerate(CLINICAL_ORDER)}
+    return sorted(range(len(channels)), key=lambda i: (rank.get(channels[i], len(rank)), i))
+
+
+@timed("figure.eeg")
+def build_eeg_figure(time_array, eeg_data, channels, max_points=None, downsampling="minmax", highlights=None):
+    """
+    Build the "EEG with Attention Highlights" chart, one subplot row per channel
+
+    Args:
+        time_array (np.ndarray): Sample times in seconds
+        eeg_data (np.ndarray): EEG array of shape (n_channels, n_samples)
+        channels (list): Channel names, one per row of ``eeg_data``
+        max_points (int): Optional per-trace point budget; longer traces are decimated
+        downsampling (str): Decimation mode passed to ``utils.downsample.decimate``
+        highlights (list): Regions to shade, dicts with ``channel``, ``start`` and ``end`` in seconds
+
+    Returns:
+        go.Figure: The EEG figure
+    """
+    x_plot, y_plot = decimate(time_array, eeg_data, max_points, mode=downsampling)
+
+    fig = make_subplots(rows=len(channels), cols=1, shared_xaxes=True, vertical_spacing=0.01,
+                        subplot_titles=channels)
+
+    for i, channel in enumerate(channels):
+        # Add EEG trace
+        fig.add_trace(
+            go.Scatter(
+                x=x_plot[i] if x_plot.ndim == 2 else x_plot,
+                y=y_plot[i],
+                name=channel,
+                line=dict(color='#2c3e50', width=1),
+            ),
+            row=i+1, col=1
+        )
+
+    # Update layout; meta records the row of each channel for set_eeg_highlights
+    fig.update_layout(
+        height=600,
+        showlegend=False,
+        margin=dict(l=50, r=20, t=10, b=50),
+        meta={"eeg_layout": "subplots", "rows": list(channels)},
+    )
+
+    fig.update_xaxes(title_text="Time (s)", row=len(channels), col=1)
+
+    set_eeg_highlights(fig, highlights)
+    return fig
+
+
+@timed("figure.eeg_stacked")
+def build_eeg_stacked_figure(time_array, eeg_data, channels, max_points=None, downsampling="minmax", highlights=None):
+    """
+    Build the EEG chart as a single WebGL trace with every channel offset on one shared axis
+
+    Channels are stacked top to bottom in clinical montage order and joined into one
+    ``go.Scattergl`` trace separated by NaN gaps, so the browser lays out one pair of
+    axes and one GPU draw call regardless of channel count.
+
+    Args:
+        time_array (np.ndarray): Sample times in seconds
+        eeg_data (np.ndarray): EEG array of shape (n_channels, n_samples)
+        channels (list): Channel names, one per row of ``eeg_data``
+        max_points (int): Optional per-trace point budget; longer traces are decimated
+        downsampling (str): Decimation mode passed to ``utils.downsample.decimate``
+        highlights (list): Regions to shade, dicts with ``channel``, ``start`` and ``end`` in seconds
+
+    Returns:
+        go.Figure: The EEG figure
+    """
+    order = montage_order(channels)
+    x_plot, y_plot = decimate(time_array, eeg_data[order], max_points, mode=downsampling)
+    if x_plot.ndim == 1:
+        x_plot = np.broadcast_to(x_plot, y_plot.shape)
+
+    # Vertical distance between baselines, from the robust amplitude range of the whole montage
+    low, high = np.percentile(eeg_data, [0.5, 99.5])
+    spacing = float(high - low) or 1.0
+    offsets = -spacing * np.arange(len(order))
+
+    # One NaN column after each channel breaks the line between rows; float32 halves the payload
+    n_channels, n_points = y_plot.shape
+    xs = np.full((n_channels, n_points + 1), np.nan, dtype=np.float32)
+    ys = np.full((n_channels, n_points + 1), np.nan, dtype=np.float32)
+    xs[:, :n_points] = x_plot
+    ys[:, :n_points] = y_plot + offsets[:, None]
+
+    fig = go.Figure(
+        go.Scattergl(
+            x=xs.ravel(),
+            y=ys.ravel(),
+            mode='lines',
+            line=dict(color='#2c3e50', width=1),
+            hoverinfo='skip',
+        )
+    )
+
+    labels = [channels[i] for i in order]
+    fig.update_layout(
+        height=600,
+        showlegend=False,
+        margin=dict(l=50, r=20, t=10, b=50),
+        xaxis=dict(title_text="Time (s)"),
+        yaxis=dict(tickvals=offsets, ticktext=labels, showgrid=False, zeroline=False),
+        meta={"eeg_layout": "stacked", "rows": labels, "offsets": offsets.tolist(), "spacing": spacing},
+    )
+
+    set_eeg_highlights(fig, highlights)
+    return fig
+
+
+def set_eeg_highlights(fig, highlights):
+    """
+    Replace the shaded attention regions of an EEG figure from either builder
+
+    Regions are drawn as rectangles limited to their channel's row, and replace any
+    drawn before, so a cached figure can be re-shaded for a new threshold without being
+    rebuilt. Regions on channels the figure does not show are skipped.
+
+    Args:
+        fig (go.Figure): Figure from ``build_eeg_figure`` or ``build_eeg_stacked_figure``
+        highlights (list): Regions to shade, dicts with ``channel``, ``start`` and ``end`` in seconds
+    """
+    meta = fig.layout.meta
+    rows = {name: i for i, name in enumerate(meta["rows"])}
+    shapes = []
+    for region in highlights or []:
+        row = rows.get(region["channel"])
+        if row is None:
+            continue
+        if meta["eeg_layout"] == "subplots":
+            axis = "" if row == 0 else str(row + 1)
+            position = dict(xref=f"x{axis}", yref=f"y{axis} domain", y0=0, y1=1)
+        else:
+            offset, spacing = meta["offsets"][row], meta["spacing"]
+            position = dict(xref="x", yref="y", y0=offset - spacing / 2, y1=offset + spacing / 2)
+        shapes.append(dict(type="rect", x0=region["start"], x1=region["end"], fillcolor="rgba(231, 76, 60, 0.2)",
+                           opacity=0.8, layer="below", line_width=0, **position))
+    fig.layout.shapes = shapes
+
+
+@timed("figure.eeg_update")
+def update_eeg_figure(fig, time_array, eeg_data, channels, max_points=None, downsampling="minmax"):
+    """
+    Replace the samples of a figure from ``build_eeg_figure`` or ``build_eeg_stacked_figure`` in place
+
+    Layout, subplots and axes are kept, so a live view only pays for the new trace data.
+    Stacked figures keep the channel order and offsets they were built with.
+
+    Args:
+        fig (go.Figure): Figure to update
+        time_array (np.ndarray): Sample times in seconds
+        eeg_data (np.ndarray): EEG array of shape (n_channels, n_samples)
+        channels (list): Channel names, one per row of ``eeg_data``
+        max_points (int): Optional per-trace point budget; longer traces are decimated
+        downsampling (str): Decimation mode passed to ``utils.downsample.decimate``
+
+    Returns:
+        go.Figure: ``fig``
+    """
+    stacked = len(fig.data) == 1 and isinstance(fig.data[0], go.Scattergl)
+    if stacked:
+        labels = list(fig.layout.yaxis.ticktext)
+        eeg_data = eeg_data[[channels.index(label) for label in labels]]
+    x_plot, y_plot = decimate(time_array, eeg_data, max_points, mode=downsampling)
+    if x_plot.ndim == 1:
+        x_plot = np.broadcast_to(x_plot, y_plot.shape)
+
+    with fig.batch_update():
+        if stacked:
+            offsets = np.asarray(fig.layout.yaxis.tickvals)
+            n_channels, n_points = y_plot.shape
+            xs = np.full((n_channels, n_points + 1), np.nan, dtype=np.float32)
+            ys = np.full((n_channels, n_points + 1), np.nan, dtype=np.float32)
+            xs[:, :n_points] = x_plot
+            ys[:, :n_points] = y_plot + offsets[:, None]
+            fig.data[0].x = xs.ravel()
+            fig.data[0].y = ys.ravel()
+        else:
+            for trace, x, y in zip(fig.data, x_plot, y_plot):
+                trace.x = x
+                trace.y = y
+    return fig
+
+
+@timed("figure.attention")
+def build_attention_figure(attention_data, channels, bin_width=0.2, start=0.0, overlay=None, overlay_name=None):
+    """
+    Build the attention map heatmap with channels on the y axis and time bins on the x axis
+
+    Args:
+        attention_data (np.ndarray): Scores of shape (n_channels, n_bins)
+        channels (list): Channel names, one per row
+        bin_width (float): Width of each time bin in seconds
+        start (float): Start time of the first bin in seconds
+        overlay (np.ndarray): Optional values on the same grid, e.g. relative band power,
+            drawn as contour lines over the heatmap
+        overlay_name (str): Hover label for the overlay
+    """
+    x = bin_times(attention_data.shape[1], bin_width=bin_width, start=start)
+    fig = px.imshow(
+        attention_data,
+        labels=dict(x="Time (s)", y="Channel", color="Attention Score"),
+        x=x,
+        y=channels,
+        color_continuous_scale='Reds',
+        aspect="auto"
+    )
+
+    if overlay is not None:
+        fig.add_trace(
+            go.Contour(
+                z=overlay,
+                x=x,
+                y=channels,
+                name=overlay_name,
+                contours_coloring='lines',
+                colorscale='Blues',
+                line=dict(width=1),
+                ncontours=6,
+                showscale=False,
+            )
+        )
+
+    fig.update_layout(
+        height=600,
+        margin=dict(l=50, r=20, t=10, b=50),
+    )
+
+    return fig
+
+
+@timed("figure.clinical")
+def build_clinical_figure(clinical_vars):
+    """Build the horizontal bar chart of clinical variable importances"""
+    fig = px.bar(
+        clinical_vars,
+        x='Importance',
+        y='Variable',
+        orientation='h',
+        color='Importance',
+        color_continuous_scale=['#3498db', '#e74c3c'],
+        range_color=[0, 1]
+    )
+
+    fig.update_layout(
+        height=400,
+        margin=dict(l=0, r=0, t=10, b=10),
+        yaxis=dict(autorange="reversed"),
+    )
+
+    return fig
+
+
+@timed("figure.risk")
+def build_risk_figure(hours, risk, ci_lower, ci_upper):
+    """Build the seizure risk forecast line with its shaded confidence band"""
+    fig = go.Figure([
+        go.Scatter(
+            name='Upper Bound',
+            x=hours,
+            y=ci_upper,
+            mode='lines',
+            marker=dict(color="#444"),
+            line=dict(width=0),
+            showlegend=False
+        ),
+        go.Scatter(
+            name='Lower Bound',
+            x=hours,
+            y=ci_lower,
+            marker=dict(color="#444"),
+            line=dict(width=0),
+            mode='lines',
+            fillcolor='rgba(231, 76, 60, 0.2)',
+            fill='tonexty',
+            showlegend=False
+        ),
+        go.Scatter(
+            name='Seizure Risk',
+            x=hours,
+            y=risk,
+            mode='lines',
+            line=dict(color='rgb(231, 76, 60)'),
+            showlegend=True
+        )
+    ])
+
+    fig.update_layout(
+        height=300,
+        title='Predicted Seizure Risk',
+        yaxis_title='Probability',
+        xaxis_title='Hours from Now',
+        hovermode="x",
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+
+    return fig
+
+
+@timed("figure.correlation")
+def build_correlation_figure(corr_matrix, features, label="Correlation", zmin=-1.0, zmax=1.0):
+    """Build the feature association heatmap on a fixed colour scale, diverging when it spans negative values"""
+    fig = px.imshow(
+        corr_matrix,
+        labels=dict(x="Feature", y="Feature", color=label),
+        x=features,
+        y=features,
+        color_continuous_scale='RdBu_r' if zmin < 0 else 'Reds',
+        zmin=zmin, zmax=zmax
+    )
+
+    fig.update_layout(
+        height=300,
+        margin=dict(l=10, r=10, t=10, b=10),
+    )
+
+    return fig
@@ -0,0 +1,324 @@
+import os
+import time
+
+import numpy as np
+
+# Transformer layers, matching the "Attention Visualization" choices
+N_LAYERS = 4
+
+# Seconds of signal per token; the same grid as the attention bins
+TOKEN_SECONDS = 0.2
+
+# Tokens per model input window (10 s at 0.2 s per token)
+WINDOW_TOKENS = 50
+
+# Tokens of context (1 s) in the line-length feature
+CONTEXT_TOKENS = 5
+
+# Line-length z-score at which a token draws as much attention as the sink token
+SINK_LEVEL = 5.0
+
+# Channel windows per forward batch; bounds the attention scratch memory on long windows
+BATCH_WINDOWS = 64
+
+
+def _layer_norm(x, eps=1e-5):
+    mean = x.mean(axis=-1, keepdims=True)
+    var = x.var(axis=-1, keepdims=True)
+    return (x - mean) / np.sqrt(var + eps)
+
+
+def _softmax(x):
+    x = x - x.max(axis=-1, keepdims=True)
+    np.exp(x, out=x)
+    x /= x.sum(axis=-1, keepdims=True)
+    return x
+
+
+def _gelu(x):
+    # tanh approximation, computed in place; ``x ** 3`` alone costs more than the whole layer's matmuls
+    t = x * x
+    t *= 0.044715
+    t += 1.0
+    t *= x
+    t *= 0.7978845608
+    np.tanh(t, out=t)
+    t += 1.0
+    t *= x
+    t *= 0.5
+    return t
+
+
+def token_features(tokens):
+    """
+    Model input features of signal tokens
+
+    Each token is standardized by its window's amplitude, and gains the log line length of
+    the ``CONTEXT_TOKENS`` tokens around it as a last feature, robustly z-scored over all
+    windows of the same channel, so discharges that stand out from the channel's background are
+    visible to the model whatever the gain.
+
+    Args:
+        tokens (np.ndarray): Samples of shape (n_channels, n_windows, n_tokens, token_samples)
+
+    Returns:
+        np.ndarray: float32 features of shape (n_channels, n_windows, n_tokens, token_samples + 1)
+    """
+    tokens = np.asarray(tokens, dtype=np.float32)
+    n_channels, n_windows, n_tokens, _ = tokens.shape
+    centred = tokens - tokens.mean(axis=(2, 3), keepdims=True)
+    scaled = centred / (centred.std(axis=(2, 3), keepdims=True) + 1e-6)
+
+    # Averaging over a second of context separates sustained discharges from single noisy tokens
+    line_length = np.abs(np.diff(tokens, axis=3)).sum(axis=3).reshape(n_channels, -1)
+    half = CONTEXT_TOKENS // 2
+    padded = np.pad(line_length, ((0, 0), (half + 1, half)), mode="edge").astype(np.float64)
+    padded[:, 0] = 0.0
+    sums = np.cumsum(padded, axis=1)
+    context = np.log((sums[:, CONTEXT_TOKENS:] - sums[:, :-CONTEXT_TOKENS]) / CONTEXT_TOKENS + 1e-6)
+    # Median and MAD, so a long discharge does not raise the background it is measured against
+    median = np.median(context, axis=1, keepdims=True)
+    spread = 1.4826 * np.median(np.abs(context - median), axis=1, keepdims=True)
+    z = (context - median) / (spread + 1e-6)
+    z = z.astype(np.float32).reshape(n_channels, n_windows, n_tokens, 1)
+    return np.concatenate([scaled, z], axis=3)
+
+
+class NumpyTransformer:
+    """
+    Small pre-norm transformer encoder over EEG tokens, run on the CPU with NumPy
+
+    Each token is ``TOKEN_SECONDS`` of one channel; a window of ``WINDOW_TOKENS`` tokens is
+    one sequence, so a batch is every (channel, window) pair of the requested span. The
+    forward pass returns a seizure logit per sequence and the softmax attention matrices
+    of every layer, captured as they are computed.
+
+    Weights come from an ``.npz`` file (see ``save``) or a seeded initialization whose
+    keys are biased towards the line-length feature, so untrained attention still
+    follows salient activity and deeper layers attend more sharply.
+
+    Args:
+        token_samples (int): Samples per token
+        d_model (int): Embedding width
+        n_heads (int): Attention heads per layer
+        n_layers (int): Encoder layers
+        d_ff (int): Feed-forward width
+        seed (int): Seed for the initial weights
+    """
+
+    def __init__(self, token_samples=50, d_model=32, n_heads=4, n_layers=N_LAYERS, d_ff=64, seed=0):
+        self.token_samples = token_samples
+        self.d_model = d_model
+        self.n_heads = n_heads
+        self.n_layers = n_layers
+        rng = np.random.default_rng(seed)
+
+        def dense(n_in, n_out):
+            return (rng.standard_normal((n_in, n_out)) / np.sqrt(n_in)).astype(np.float32)
+
+        salience = np.zeros(d_model, dtype=np.float32)
+        salience[0] = 1.0
+        embed = dense(token_samples + 1, d_model)
+        embed[-1] += salience
+        positions = np.arange(WINDOW_TOKENS + 1)[:, None] / 10000 ** (np.arange(d_model)[None, :] / d_model)
+        self.weights = {
+            "embed": embed,
+            "position": (0.1 * np.where(np.arange(d_model) % 2, np.cos(positions), np.sin(positions))).astype(np.float32),
+            # Attention sink prepended to every sequence; queries with nothing salient to look at attend to it
+            # It looks like a background token whose line-length z-score is SINK_LEVEL
+            "sink": (SINK_LEVEL * embed[-1] + rng.standard_normal(d_model)).astype(np.float32),
+            "head": dense(d_model, 1)[:, 0],
+        }
+        for layer in range(n_layers):
+            qkv = dense(d_model, 3 * d_model) * 0.5
+            bias = np.zeros(3 * d_model, dtype=np.float32)
+            # Every query looks for the salience direction in the keys, more strongly in deeper layers
+            gain = 1.5 + 0.25 * layer
+            qkv[:, d_model:2 * d_model] += gain * np.outer(salience, np.ones(d_model, dtype=np.float32))
+            bias[:d_model] = gain
+            self.weights.update({
+                f"layer{layer}_qkv": qkv,
+                f"layer{layer}_qkv_bias": bias,
+                f"layer{layer}_out": dense(d_model, d_model) * 0.5,
+                f"layer{layer}_ff1": dense(d_model, d_ff),
+                f"layer{layer}_ff2": dense(d_ff, d_model) * 0.5,
+            })
+
+    @classmethod
+    def load(cls, path):
+        """Transformer with the weights saved in an ``.npz`` file"""
+        with np.load(path) as saved:
+            weights = {name: saved[name].astype(np.float32) for name in saved.files}
+        n_heads = int(weights.pop("n_heads", 4))
+        n_layers = sum(1 for name in weights if name.endswith("_qkv"))
+        d_model = weights["embed"].shape[1]
+        model = cls(token_samples=weights["embed"].shape[0] - 1, d_model=d_model,
+                    n_heads=n_heads, n_layers=n_layers,
+                    d_ff=weights["layer0_ff1"].shape[1])
+        model.weights.update(weights)
+        return model
+
+    def save(self, path):
+        np.savez(path, n_heads=self.n_heads, **self.weights)
+
+    def forward(self, features):
+        """
+        Args:
+            features (np.ndarray): Token features of shape (batch, n_tokens, token_samples + 1)
+
+        Returns:
+            tuple: (logits of shape (batch,), read from the sink token, and per-layer attention
+                matrices of shape (batch, n_heads, n_tokens + 1, n_tokens + 1), sink first)
+        """
+        w = self.weights
+        batch, n_tokens = features.shape[0], features.shape[1] + 1
+        head_dim = self.d_model // self.n_heads
+        sink = np.broadcast_to(w["sink"], (batch, 1, self.d_model))
+        x = np.concatenate([sink, features @ w["embed"]], axis=1) + w["position"][:n_tokens]
+        attentions = []
+        for layer in range(self.n_layers):
+            qkv = _layer_norm(x) @ w[f"layer{layer}_qkv"] + w[f"layer{layer}_qkv_bias"]
+            q, k, v = qkv.reshape(batch, n_tokens, 3, self.n_heads, head_dim).transpose(2, 0, 3, 1, 4)
+            attention = _softmax(q @ k.transpose(0, 1, 3, 2) / np.float32(np.sqrt(head_dim)))
+            attentions.append(attention)
+            mixed = (attention @ v).transpose(0, 2, 1, 3).reshape(batch, n_tokens, self.d_model)
+            x = x + mixed @ w[f"layer{layer}_out"]
+            x = x + _gelu(_layer_norm(x) @ w[f"layer{layer}_ff1"]) @ w[f"layer{layer}_ff2"]
+        return _layer_norm(x[:, 0]) @ w["head"], attentions
+
+
+class OnnxAttentionModel:
+    """
+    ONNX model with the same interface as ``NumpyTransformer`` (needs onnxruntime)
+
+    The graph takes token features of shape (batch, n_tokens, token_samples + 1) and
+    returns the logits followed by one attention output per layer.
+    """
+
+    def __init__(self, path):
+        try:
+            import onnxruntime
+        except ImportError as exc:
+            raise ImportError("ONNX models need onnxruntime: pip install onnxruntime") from exc
+        self.session = onnxruntime.InferenceSession(path, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+        self.n_layers = len(self.session.get_outputs()) - 1
+        self.token_samples = self.session.get_inputs()[0].shape[-1] - 1
+
+    def forward(self, features):
+        logits, *attentions = self.session.run(None, {self.input_name: features.astype(np.float32)})
+        return np.asarray(logits).reshape(len(features)), attentions
+
+
+class TorchAttentionModel:
+    """
+    TorchScript model with the same interface as ``NumpyTransformer`` (needs torch)
+
+    The module takes a float tensor of token features and returns ``(logits, attentions)``.
+    """
+
+    def __init__(self, path):
+        try:
+            import torch
+        except ImportError as exc:
+            raise ImportError("TorchScript models need torch: pip install torch") from exc
+        self._torch = torch
+        self.module = torch.jit.load(path, map_location="cpu").eval()
+        self.n_layers = int(getattr(self.module, "n_layers", N_LAYERS))
+        self.token_samples = int(getattr(self.module, "token_samples", 50))
+
+    def forward(self, features):
+        with self._torch.inference_mode():
+            logits, attentions = self.module(self._torch.from_numpy(np.ascontiguousarray(features, dtype=np.float32)))
+        return logits.reshape(len(features)).numpy(), [attention.numpy() for attention in attentions]
+
+
+def load_model(path=None, token_samples=50):
+    """
+    Attention model from ``path`` by extension (.npz, .onnx, .pt/.ts), or the default NumPy transformer
+
+    Args:
+        path (str): Model file, usually ``MODEL_PATH``; None or a missing file gives the default model
+        token_samples (int): Samples per token of the default model
+    """
+    if not path or not os.path.exists(path):
+        return NumpyTransformer(token_samples=token_samples)
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".npz":
+        return NumpyTransformer.load(path)
+    if extension == ".onnx":
+        return OnnxAttentionModel(path)
+    if extension in (".pt", ".ts", ".torchscript"):
+        return TorchAttentionModel(path)
+    raise ValueError(f"Unsupported model file: {path}")
+
+
+def _resample_tokens(samples, n_tokens, token_samples):
+    """(n_channels, n_tokens, token_samples) tokens, linearly resampled if the model expects another rate"""
+    n_channels, n_samples = samples.shape
+    per_token = n_samples // n_tokens
+    tokens = samples[:, :n_tokens * per_token].reshape(n_channels, n_tokens, per_token)
+    if per_token == token_samples:
+        return tokens
+    grid = np.linspace(0, per_token - 1, token_samples)
+    lower = np.floor(grid).astype(int)
+    upper = np.minimum(lower + 1, per_token - 1)
+    frac = (grid - lower).astype(np.float32)
+    return tokens[..., lower] * (1 - frac) + tokens[..., upper] * frac
+
+
+def run_attention(model, samples, sample_rate, token_seconds=TOKEN_SECONDS, batch_windows=BATCH_WINDOWS):
+    """
+    Attention received by every token, for every layer, from one pass of the model
+
+    The span is cut into windows of ``WINDOW_TOKENS`` tokens per channel (the last one
+    padded by repeating its final token), and every (channel, window) sequence goes
+    through the model in batches. Each layer's attention matrices are reduced as they are
+    captured to the attention each token receives, averaged over heads and queries, so
+    no batch keeps more than ``batch_windows`` matrices alive. A token receiving ``a``
+    scores ``1 - exp(-WINDOW_TOKENS * a)``: about 0.63 for a uniform share and near 0 when
+    queries attend to the sink instead.
+
+    Args:
+        model: ``NumpyTransformer`` or any object with ``forward``, ``n_layers`` and ``token_samples``
+        samples (np.ndarray): Signal of shape (n_channels, n_samples)
+        sample_rate (float): Samples per second
+        token_seconds (float): Seconds per token, the attention bin width
+        batch_windows (int): Sequences per forward call
+
+    Returns:
+        dict: ``attention`` (n_layers, n_channels, n_tokens) float32, ``probability``
+            (n_windows,) seizure probability of each window (max over channels),
+            ``window_ms`` inference milliseconds per window and ``n_windows``
+    """
+    samples = np.asarray(samples, dtype=np.float32)
+    n_channels = samples.shape[0]
+    n_tokens = int(round(samples.shape[1] / (token_seconds * sample_rate)))
+    if n_tokens == 0:
+        return {"attention": np.zeros((model.n_layers, n_channels, 0), dtype=np.float32),
+                "probability": np.zeros(0, dtype=np.float32), "window_ms": 0.0, "n_windows": 0}
+
+    start = time.perf_counter()
+    tokens = _resample_tokens(samples, n_tokens, model.token_samples)
+    n_windows = -(-n_tokens // WINDOW_TOKENS)
+    padded = n_windows * WINDOW_TOKENS
+    if padded > n_tokens:
+        tokens = np.concatenate([tokens, np.repeat(tokens[:, -1:], padded - n_tokens, axis=1)], axis=1)
+    features = token_features(tokens.reshape(n_channels, n_windows, WINDOW_TOKENS, -1))
+    features = features.reshape(n_channels * n_windows, WINDOW_TOKENS, -1)
+
+    received = np.empty((model.n_layers, n_channels * n_windows, WINDOW_TOKENS), dtype=np.float32)
+    logits = np.empty(n_channels * n_windows, dtype=np.float32)
+    for lo in range(0, len(features), batch_windows):
+        hi = min(lo + batch_windows, len(features))
+        batch_logits, attentions = model.forward(features[lo:hi])
+        logits[lo:hi] = batch_logits
+        for layer, attention in enumerate(attentions):
+            received[layer, lo:hi] = attention[..., 1:].mean(axis=(1, 2))
+    elapsed = time.perf_counter() - start
+
+    # Attention relative to a uniform share of the window, mapped into [0, 1)
+    attention = -np.expm1(-WINDOW_TOKENS * received.reshape(model.n_layers, n_channels, padded)[:, :, :n_tokens])
+    probability = 1.0 / (1.0 + np.exp(-logits.reshape(n_channels, n_windows).max(axis=0)))
+    return {"attention": attention, "probability": probability.astype(np.float32),
+            "window_ms": elapsed * 1000 / n_windows, "n_windows": n_windows}
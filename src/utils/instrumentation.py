@@ -0,0 +1,162 @@
+import contextlib
+import cProfile
+import io
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import defaultdict, deque
+
+import numpy as np
+
+# Timings kept per section for the rolling percentiles
+ROLLING_SAMPLES = 500
+
+# Optional capture, e.g. DASHBOARD_PROFILE=cprofile,tracemalloc:
+#   cprofile     profiles the outermost timed section of each thread and accumulates per-section stats
+#   tracemalloc  records the peak Python allocation of the outermost timed section of each thread
+PROFILE_ENV = "DASHBOARD_PROFILE"
+PROFILE_MODES = {mode.strip() for mode in os.environ.get(PROFILE_ENV, "").lower().split(",") if mode.strip()}
+
+_lock = threading.Lock()
+_samples = defaultdict(lambda: deque(maxlen=ROLLING_SAMPLES))
+_totals = defaultdict(int)
+_counters = defaultdict(int)
+_profiles = {}
+_local = threading.local()
+_started = time.time()
+
+if "tracemalloc" in PROFILE_MODES and not tracemalloc.is_tracing():
+    tracemalloc.start()
+
+
+def record(name, elapsed_ms, peak_bytes=None):
+    """Add one timing of section ``name``, with its peak traced allocation when tracemalloc is on"""
+    with _lock:
+        _samples[name].append((elapsed_ms, np.nan if peak_bytes is None else peak_bytes))
+        _totals[name] += 1
+
+
+def count(name, n=1):
+    """Increment counter ``name``"""
+    with _lock:
+        _counters[name] += n
+
+
+class timed(contextlib.ContextDecorator):
+    """
+    Time a block or every call of a function as section ``name``
+
+    Usable as ``with timed("figure.eeg"):`` or as ``@timed("figure.eeg")``. Nested and
+    concurrent sections are timed independently. cProfile, when enabled, covers only the
+    outermost section of each thread, since one thread can run one profiler, and so does
+    the tracemalloc peak, since resetting it inside a nested section would lose the
+    enclosing section's peak. That peak is process-wide, so sections running at the same
+    time on other threads inflate each other's peaks.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def _recreate_cm(self):
+        # A fresh instance per call, so recursive and concurrent calls keep their own state
+        return type(self)(self.name)
+
+    def __enter__(self):
+        depth = getattr(_local, "depth", 0)
+        _local.depth = depth + 1
+        self._profiler = None
+        if "cprofile" in PROFILE_MODES and depth == 0:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        self._memory = None
+        if tracemalloc.is_tracing() and depth == 0:
+            self._memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed_ms = (time.perf_counter() - self._start) * 1000
+        peak = None
+        if self._memory is not None:
+            peak = max(0, tracemalloc.get_traced_memory()[1] - self._memory)
+        if self._profiler is not None:
+            self._profiler.disable()
+            with _lock:
+                if self.name in _profiles:
+                    _profiles[self.name].add(self._profiler)
+                else:
+                    _profiles[self.name] = pstats.Stats(self._profiler)
+        _local.depth -= 1
+        record(self.name, elapsed_ms, peak)
+        return False
+
+
+def section_stats():
+    """
+    Rolling latency percentiles and memory peaks of every section, slowest p95 first
+
+    Returns:
+        list: Dicts with section, calls (since start), samples (in the window), p50_ms,
+            p95_ms, max_ms, and peak_mb/p95_peak_mb when tracemalloc is on
+    """
+    with _lock:
+        snapshot = {name: (np.array(samples, dtype=np.float64), _totals[name]) for name, samples in _samples.items()}
+    rows = []
+    for name, (samples, calls) in snapshot.items():
+        times, peaks = samples[:, 0], samples[:, 1]
+        p50, p95 = np.percentile(times, [50, 95])
+        row = {"section": name, "calls": calls, "samples": len(times), "p50_ms": float(p50), "p95_ms": float(p95),
+               "max_ms": float(times.max())}
+        if not np.isnan(peaks).all():
+            row["p95_peak_mb"] = float(np.nanpercentile(peaks, 95) / 1e6)
+            row["peak_mb"] = float(np.nanmax(peaks) / 1e6)
+        rows.append(row)
+    return sorted(rows, key=lambda row: row["p95_ms"], reverse=True)
+
+
+def counters():
+    with _lock:
+        return dict(_counters)
+
+
+def profile_sections():
+    """Names of the sections with cProfile stats"""
+    with _lock:
+        return sorted(_profiles)
+
+
+def profile_report(name, limit=25):
+    """Top functions of a section by cumulative time, as printed by pstats"""
+    with _lock:
+        stats = _profiles.get(name)
+        if stats is None:
+            return ""
+        out = io.StringIO()
+        stats.stream = out
+        stats.sort_stats("cumulative").print_stats(limit)
+    return out.getvalue()
+
+
+def snapshot():
+    """Everything recorded, as a JSON-serializable dict for offline comparison"""
+    return {
+        "captured_at": time.time(),
+        "started_at": _started,
+        "pid": os.getpid(),
+        "profile_modes": sorted(PROFILE_MODES),
+        "rolling_samples": ROLLING_SAMPLES,
+        "sections": section_stats(),
+        "counters": counters(),
+    }
+
+
+def reset():
+    """Forget every timing, counter and profile"""
+    with _lock:
+        _samples.clear()
+        _totals.clear()
+        _counters.clear()
+        _profiles.clear()
@@ -0,0 +1,271 @@
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Job states; a job moves from queued to running to one of the final three
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+FINAL_STATES = (DONE, FAILED, CANCELLED)
+
+# Worker threads shared by every session: the pool's concurrency limit
+JOB_WORKERS = 2
+
+# Jobs one session may have running at once, so one user cannot occupy the whole pool
+JOB_SESSION_LIMIT = 1
+
+# Jobs one session may have waiting; further submissions are refused
+JOB_QUEUE_LIMIT = 8
+
+# Minimum seconds between progress writes of one job to the registry
+PROGRESS_INTERVAL = 0.5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    label TEXT,
+    owner TEXT,
+    key TEXT,
+    status TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    submitted REAL NOT NULL,
+    started REAL,
+    finished REAL,
+    error TEXT,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_owner ON jobs (owner, submitted);
+"""
+
+
+class JobCancelled(Exception):
+    """Raised inside a running job when it has been cancelled"""
+
+
+class JobQueueFull(RuntimeError):
+    """Raised by ``submit`` when a session already has ``queue_limit`` jobs waiting"""
+
+
+class JobContext:
+    """
+    Handle passed to a running job for reporting progress and noticing cancellation
+
+    Cancellation is cooperative: ``report`` and ``check`` raise ``JobCancelled`` once the
+    job has been cancelled, so long loops should call one of them per block of work.
+    """
+
+    def __init__(self, manager, job_id, cancel_event):
+        self._manager = manager
+        self.job_id = job_id
+        self._cancel = cancel_event
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def check(self):
+        if self._cancel.is_set():
+            raise JobCancelled(self.job_id)
+
+    def report(self, fraction):
+        """Record progress in [0, 1]"""
+        self.check()
+        self._manager._set_progress(self.job_id, fraction)
+
+
+class JobManager:
+    """
+    Background job pool shared by every dashboard session, with a SQLite job registry
+
+    Work is queued per owner (a session) and dispatched round-robin across owners, so a
+    session submitting many jobs does not starve the others: at most ``workers`` jobs run
+    at once, and at most ``session_limit`` of them for one owner. Every state change is
+    written to the registry, so any session, or a later process, can list and poll jobs;
+    jobs left queued or running by a previous process are marked failed on start.
+
+    Jobs run on threads: the heavy work here is NumPy, file I/O and compression, which
+    release the GIL, and threads share the recordings' memory maps and process caches.
+
+    Args:
+        db_path (str): SQLite registry file, or ":memory:"
+        workers (int): Jobs running at once across all owners
+        session_limit (int): Jobs running at once for one owner
+        queue_limit (int): Jobs waiting at once for one owner
+    """
+
+    def __init__(self, db_path, workers=JOB_WORKERS, session_limit=JOB_SESSION_LIMIT, queue_limit=JOB_QUEUE_LIMIT):
+        self.db_path = db_path
+        self.workers = workers
+        self.session_limit = session_limit
+        self.queue_limit = queue_limit
+        self.started = time.time()
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        if db_path != ":memory:":
+            self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._db.execute("UPDATE jobs SET status = ?, error = ?, finished = ? WHERE status IN (?, ?)",
+                         (FAILED, "Interrupted by a restart", time.time(), QUEUED, RUNNING))
+
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+        self._queues = OrderedDict()
+        self._running = {}
+        self._tasks = {}
+        self._active_keys = {}
+        self._last_progress = {}
+
+    def _execute(self, sql, params=()):
+        with self._lock:
+            return self._db.execute(sql, params)
+
+    def _update(self, job_id, **fields):
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        self._execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+    def submit(self, fn, *args, kind="job", label=None, owner=None, key=None, **kwargs):
+        """
+        Queue ``fn(context, *args, **kwargs)`` and return the job id at once
+
+        Args:
+            fn (callable): Work to run; receives a ``JobContext`` first
+            kind (str): Job type, e.g. "export" or "inference"
+            label (str): Description shown in job lists
+            owner (str): Submitting session; jobs are scheduled fairly across owners
+            key (str): Identity of the work; while a job with the same key is queued or
+                running, its id is returned instead of queueing a duplicate
+        """
+        with self._lock:
+            if key is not None and key in self._active_keys:
+                return self._active_keys[key]
+            if owner not in self._queues:
+                # Owners are kept least recently served first; a new one has never been served
+                self._queues[owner] = deque()
+                self._queues.move_to_end(owner, last=False)
+            queue = self._queues[owner]
+            if len(queue) >= self.queue_limit:
+                raise JobQueueFull(f"{len(queue)} jobs already waiting; cancel one or wait for it to start")
+
+            job_id = uuid.uuid4().hex
+            self._db.execute("INSERT INTO jobs (id, kind, label, owner, key, status, submitted) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                             (job_id, kind, label, owner, key, QUEUED, time.time()))
+            self._tasks[job_id] = (fn, args, kwargs, owner, key, threading.Event())
+            if key is not None:
+                self._active_keys[key] = job_id
+            queue.append(job_id)
+            self._dispatch()
+        return job_id
+
+    def _dispatch(self):
+        # Round-robin over owners: serve the least recently served one with work and a free slot
+        while sum(self._running.values()) < self.workers:
+            for owner, queue in self._queues.items():
+                if queue and self._running.get(owner, 0) < self.session_limit:
+                    break
+            else:
+                return
+            job_id = queue.popleft()
+            self._queues.move_to_end(owner)
+            self._running[owner] = self._running.get(owner, 0) + 1
+            self._pool.submit(self._run, job_id)
+
+    def _run(self, job_id):
+        fn, args, kwargs, owner, key, cancel = self._tasks[job_id]
+        try:
+            if cancel.is_set():
+                raise JobCancelled(job_id)
+            self._update(job_id, status=RUNNING, started=time.time())
+            result = fn(JobContext(self, job_id, cancel), *args, **kwargs)
+        except JobCancelled:
+            self._update(job_id, status=CANCELLED, finished=time.time())
+        except Exception as exc:
+            self._update(job_id, status=FAILED, finished=time.time(), error=f"{type(exc).__name__}: {exc}")
+        else:
+            self._update(job_id, status=DONE, progress=1.0, finished=time.time(),
+                         result=json.dumps(result, default=str))
+        finally:
+            with self._lock:
+                self._running[owner] -= 1
+                if not self._running[owner] and not self._queues.get(owner):
+                    del self._running[owner]
+                    self._queues.pop(owner, None)
+                self._tasks.pop(job_id, None)
+                self._last_progress.pop(job_id, None)
+                if key is not None and self._active_keys.get(key) == job_id:
+                    del self._active_keys[key]
+                self._dispatch()
+
+    def _set_progress(self, job_id, fraction):
+        # Throttled, so a job reporting every block does not turn into a stream of writes
+        now = time.monotonic()
+        if now - self._last_progress.get(job_id, 0.0) >= PROGRESS_INTERVAL or fraction >= 1.0:
+            self._last_progress[job_id] = now
+            self._update(job_id, progress=float(min(max(fraction, 0.0), 1.0)))
+
+    def cancel(self, job_id):
+        """
+        Cancel a job: queued jobs are dropped at once, running ones stop at their next progress report
+
+        Returns:
+            bool: Whether the job was still queued or running
+        """
+        with self._lock:
+            task = self._tasks.get(job_id)
+            if task is None:
+                return False
+            fn, args, kwargs, owner, key, cancel = task
+            cancel.set()
+            queue = self._queues.get(owner)
+            if queue is not None and job_id in queue:
+                queue.remove(job_id)
+                del self._tasks[job_id]
+                if key is not None and self._active_keys.get(key) == job_id:
+                    del self._active_keys[key]
+                self._update(job_id, status=CANCELLED, finished=time.time())
+        return True
+
+    @staticmethod
+    def _record(row):
+        if row is None:
+            return None
+        record = dict(row)
+        record["result"] = json.loads(record["result"]) if record["result"] else None
+        return record
+
+    def status(self, job_id):
+        """Registry record of one job as a dict, or None if unknown"""
+        return self._record(self._execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+
+    def latest(self, key):
+        """Most recent job submitted with ``key`` by this manager, or None"""
+        return self._record(self._execute("SELECT * FROM jobs WHERE key = ? AND submitted >= ? ORDER BY submitted DESC "
+                                          "LIMIT 1", (key, self.started)).fetchone())
+
+    def jobs(self, owner=None, limit=20):
+        """Most recent jobs, newest first, optionally of one owner"""
+        if owner is None:
+            rows = self._execute("SELECT * FROM jobs ORDER BY submitted DESC LIMIT ?", (limit,))
+        else:
+            rows = self._execute("SELECT * FROM jobs WHERE owner = ? ORDER BY submitted DESC LIMIT ?", (owner, limit))
+        return [self._record(row) for row in rows.fetchall()]
+
+    def stats(self):
+        """Queued and running counts across the pool"""
+        with self._lock:
+            return {"queued": sum(len(queue) for queue in self._queues.values()),
+                    "running": sum(self._running.values()), "workers": self.workers}
+
+    def prune(self, keep=200):
+        """Delete finished jobs beyond the ``keep`` most recent from the registry"""
+        self._execute("DELETE FROM jobs WHERE status IN (?, ?, ?) AND id NOT IN "
+                      "(SELECT id FROM jobs ORDER BY submitted DESC LIMIT ?)", (*FINAL_STATES, keep))
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            for job_id in list(self._tasks):
+                self.cancel(job_id)
+        self._pool.shutdown(wait=wait)
+        self._db.close()
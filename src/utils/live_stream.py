@@ -0,0 +1,176 @@
+import threading
+import time
+
+import numpy as np
+
+from utils.eeg_generator import generate_eeg_batch, recurring_artifacts
+
+# Seconds of history kept per channel by the live ring buffer
+LIVE_BUFFER_SECONDS = 60
+
+# Seconds of signal the simulated source produces per push
+LIVE_CHUNK_SECONDS = 0.1
+
+# Seconds without a reader after which the simulated source stops producing
+LIVE_IDLE_SECONDS = 120
+
+
+class RingBuffer:
+    """
+    Fixed-size multichannel sample buffer that overwrites its oldest samples
+
+    Storage is one preallocated (n_channels, capacity) array, so memory stays constant
+    however long the stream runs. Samples are addressed by their absolute index since
+    the stream started, which lets readers ask for just what arrived since their last read.
+    Safe for one writer thread and any number of reader threads.
+
+    Args:
+        n_channels (int): Number of channels
+        capacity (int): Samples kept per channel
+        dtype: Sample dtype, float32 by default
+    """
+
+    def __init__(self, n_channels, capacity, dtype=np.float32):
+        self._data = np.zeros((n_channels, capacity), dtype=dtype)
+        self.capacity = capacity
+        self.total = 0
+        self.timestamp = None
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self):
+        return self._data.nbytes
+
+    @property
+    def first(self):
+        """Absolute index of the oldest sample still held"""
+        return max(0, self.total - self.capacity)
+
+    def write(self, block, timestamp=None):
+        """
+        Append samples of shape (n_channels, n), keeping only the newest ``capacity``
+
+        Args:
+            block (np.ndarray): New samples
+            timestamp (float): Wall-clock acquisition time of the newest sample, for latency
+        """
+        n_new = block.shape[1]
+        block = block[:, -self.capacity:]
+        n = block.shape[1]
+        with self._lock:
+            # Older samples of an oversized block would be overwritten at once, so they are skipped
+            pos = (self.total + n_new - n) % self.capacity
+            head = min(n, self.capacity - pos)
+            self._data[:, pos:pos + head] = block[:, :head]
+            self._data[:, :n - head] = block[:, head:]
+            self.total += n_new
+            self.timestamp = time.time() if timestamp is None else timestamp
+
+    def read_since(self, index):
+        """
+        Copy of every held sample with absolute index >= ``index``
+
+        Returns:
+            tuple: (absolute index of the first returned sample, samples (n_channels, m),
+            acquisition timestamp of the newest sample)
+        """
+        with self._lock:
+            lo = max(index, self.first)
+            hi = self.total
+            start, stop = lo % self.capacity, hi % self.capacity
+            if hi <= lo:
+                samples = self._data[:, :0].copy()
+            elif start < stop:
+                samples = self._data[:, start:stop].copy()
+            else:
+                # The requested range wraps past the end of the storage
+                samples = np.concatenate([self._data[:, start:], self._data[:, :stop]], axis=1)
+            return lo, samples, self.timestamp
+
+    def read_latest(self, n):
+        """Copy of the newest ``n`` samples, as ``read_since``"""
+        return self.read_since(self.total - n)
+
+
+class SimulatedSource:
+    """
+    Background producer pushing synthetic EEG into a ``RingBuffer`` in real time
+
+    Every ``chunk_seconds`` the next block of the synthetic generator is written, with the
+    recurring F3 discharge once a minute, so the dashboard's live mode can be exercised
+    without an amplifier. The thread stops by itself when nobody has read the buffer for
+    ``idle_seconds``; ``start`` resumes it.
+
+    Args:
+        channels (list): Channel names
+        sample_rate (int): Samples per second
+        buffer_seconds (float): History kept in the ring buffer
+        chunk_seconds (float): Seconds produced per push
+        seed (int): Noise seed
+        idle_seconds (float): Stop after this long without a ``touch``
+    """
+
+    def __init__(self, channels, sample_rate=250, buffer_seconds=LIVE_BUFFER_SECONDS,
+                 chunk_seconds=LIVE_CHUNK_SECONDS, seed=None, idle_seconds=LIVE_IDLE_SECONDS):
+        self.channels = list(channels)
+        self.sample_rate = sample_rate
+        self.chunk_seconds = chunk_seconds
+        self.idle_seconds = idle_seconds
+        self.buffer = RingBuffer(len(self.channels), int(buffer_seconds * sample_rate))
+        self._rng = np.random.default_rng(seed)
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._last_touch = time.monotonic()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start producing if not already running"""
+        with self._lock:
+            self.touch()
+            if self.running:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="eeg-simulated-source", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def touch(self):
+        """Mark the stream as watched so the idle timeout does not stop it"""
+        self._last_touch = time.monotonic()
+
+    def _artifacts(self, start, end, every=60.0):
+        # Only the discharges overlapping this chunk, so the cost stays flat as the stream runs
+        block = np.floor(start / every) * every
+        artifacts = []
+        for artifact in recurring_artifacts(2 * every, every=every, offset=40.0):
+            artifact = dict(artifact, start=artifact["start"] + block, end=artifact["end"] + block)
+            if artifact["start"] < end and artifact["end"] > start:
+                artifacts.append(artifact)
+        return artifacts
+
+    def _run(self):
+        deadline = time.monotonic()
+        while not self._stop.is_set():
+            if time.monotonic() - self._last_touch > self.idle_seconds:
+                break
+
+            start = self.buffer.total / self.sample_rate
+            _, block = generate_eeg_batch(self.channels, self.chunk_seconds, sample_rate=self.sample_rate,
+                                          seed=self._rng, start=start,
+                                          artifacts=self._artifacts(start, start + self.chunk_seconds))
+            self.buffer.write(block, timestamp=time.time())
+
+            # Pace to wall-clock time; after a long stall resynchronize instead of bursting
+            deadline += self.chunk_seconds
+            delay = deadline - time.monotonic()
+            if delay < -1.0:
+                deadline = time.monotonic()
+            self._stop.wait(max(0.0, delay))
@@ -0,0 +1,513 @@
+import re
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+# Registry columns and their NumPy storage dtypes
+FIELDS = {
+    "patient_id": object,
+    "status": object,
+    "age": np.int16,
+    "sex": object,
+    "medication": object,
+    "eeg_finding": object,
+    "prior_seizure_history": bool,
+    "structural_lesion": bool,
+    "genetic_factors": bool,
+    "sleep_deprivation": bool,
+}
+
+# Free-text columns whose words are searchable
+TEXT_FIELDS = ("status", "sex", "medication", "eeg_finding")
+
+# Boolean clinical attributes, searchable by the words of their name as in the clinical variables chart
+FLAG_FIELDS = {
+    "prior_seizure_history": "prior seizure history",
+    "structural_lesion": "structural lesion",
+    "genetic_factors": "genetic factors",
+    "sleep_deprivation": "sleep deprivation",
+}
+
+# Score of one query token by how it matched; a record's score is the sum over tokens
+ID_EXACT_SCORE = 100.0
+ID_PREFIX_SCORE = 50.0
+ID_SEGMENT_SCORE = 40.0
+ID_FUZZY_SCORE = 20.0
+TERM_EXACT_SCORE = 10.0
+TERM_PREFIX_SCORE = 5.0
+TERM_FUZZY_SCORE = 2.0
+
+# Minimum trigram Jaccard similarity for a misspelled word to match a term or an ID
+FUZZY_THRESHOLD = 0.5
+
+# IDs added since the last merge into the sorted ID array; searched by a linear scan
+ID_DELTA_LIMIT = 4096
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    """Lower-case alphanumeric words of ``text``"""
+    return _TOKEN.findall(str(text).lower())
+
+
+def normalize_id(patient_id):
+    """Search key of a patient ID: its lower-case alphanumeric characters, the normalisation queries get"""
+    return "".join(tokenize(patient_id))
+
+
+def _id_keys(patient_id):
+    """
+    (key, is_segment) pairs an ID is indexed under: its normalised whole, then the suffixes
+    starting at each later word, so "MRN-00A1" is found by "mrn-00a1", "MRN00" and "00a1"
+    """
+    words = tokenize(patient_id)
+    return [("".join(words[i:]), i > 0) for i in range(max(len(words), 1))]
+
+
+# Normalised keys are ASCII; trigram codes number the space and the 36 key characters
+_GRAM_BASE = 37
+
+
+def _char_codes(keys):
+    """(n, width) codes of a fixed-width array of normalised keys: 0 for padding, 1-10 digits, 11-36 letters"""
+    chars = np.ascontiguousarray(keys).view(np.uint32).reshape(len(keys), -1).astype(np.int32)
+    return np.where(chars >= ord("a"), chars - ord("a") + 11, np.where(chars > 0, chars - ord("0") + 1, 0))
+
+
+def _gram_codes(keys):
+    """
+    Distinct trigrams of each normalised key, as integer codes
+
+    The trigrams are those of ``trigrams``: codes of the key padded with two spaces in
+    front and one behind.
+
+    Returns:
+        tuple: (uint16 codes, int64 index into ``keys``), one pair per distinct trigram of each key
+    """
+    keys = np.asarray(keys, dtype=str)
+    if len(keys) == 0:
+        return np.empty(0, dtype=np.uint16), np.empty(0, dtype=np.int64)
+    width = keys.dtype.itemsize // 4
+    padded = np.zeros((len(keys), width + 3), dtype=np.int32)
+    if width:
+        padded[:, 2:2 + width] = _char_codes(keys)
+    grams = (padded[:, :-2] * _GRAM_BASE + padded[:, 1:-1]) * _GRAM_BASE + padded[:, 2:]
+    valid = np.arange(width + 1)[None, :] <= np.char.str_len(keys)[:, None]
+    codes = grams[valid].astype(np.uint16)
+    index = np.broadcast_to(np.arange(len(keys))[:, None], grams.shape)[valid]
+    # Sorting by code, 16-bit so a stable radix sort, brings each key's repeated trigrams together
+    order = np.argsort(codes, kind="stable")
+    codes, index = codes[order], index[order]
+    distinct = np.r_[True, (codes[1:] != codes[:-1]) | (index[1:] != index[:-1])]
+    return codes[distinct], index[distinct]
+
+
+def trigrams(word):
+    """Character trigrams of a word padded with spaces, so prefixes and short words have trigrams too"""
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _prefix_range(sorted_values, prefix):
+    """
+    [lo, hi) of the entries of a sorted fixed-width string array that start with ``prefix``
+
+    Keys are cast to the array's own dtype; a wider key would make NumPy cast the whole
+    array on every lookup.
+    """
+    width = sorted_values.dtype.itemsize // 4
+    if len(prefix) > width or len(sorted_values) == 0:
+        return 0, 0
+    lo = np.searchsorted(sorted_values, np.array(prefix, dtype=sorted_values.dtype), side="left")
+    upper = np.array(prefix + "\uffff" * (width - len(prefix)), dtype=sorted_values.dtype)
+    return int(lo), int(np.searchsorted(sorted_values, upper, side="right"))
+
+
+class PatientRegistry:
+    """
+    In-memory patient table with a prefix index on IDs and a trigram index on attributes
+
+    Columns are growable NumPy arrays. Patient IDs are searched by their normalised key,
+    lower-case alphanumeric like the query, in a sorted array of keys and of the suffixes
+    starting at each of their words, with a trigram index for misspelled IDs; recent
+    additions wait in a small unsorted buffer that is merged in once it fills. Every word
+    of the text columns and flag names is a vocabulary term with a posting list of rows;
+    terms are found exactly, by prefix over the sorted vocabulary, or fuzzily through a
+    trigram index, so "levetir" and "levtiracetam" both match.
+    The vocabulary stays small however many patients there are, so each query costs a
+    few vectorized passes over a dense per-row score array.
+
+    Updates and removals tombstone the old row; updates append the new version.
+    """
+
+    def __init__(self):
+        self.size = 0
+        self._columns = {name: np.empty(0, dtype=dtype) for name, dtype in FIELDS.items()}
+        self._deleted = np.empty(0, dtype=bool)
+
+        self._id_sorted = np.empty(0, dtype=str)
+        self._id_rows = np.empty(0, dtype=np.int64)
+        self._id_segment = np.empty(0, dtype=bool)
+        self._id_delta = []
+        self._gram_codes = np.empty(0, dtype=np.uint16)
+        self._gram_rows = np.empty(0, dtype=np.int64)
+        self._gram_counts = np.empty(0, dtype=np.int16)
+
+        self._term_ids = {}
+        self._postings = []
+        self._posting_cache = {}
+        self._trigram_terms = {}
+        self._sorted_terms = None
+
+    def __len__(self):
+        return int(self.size - np.count_nonzero(self._deleted[:self.size]))
+
+    # Storage
+
+    def _reserve(self, extra):
+        capacity = len(self._deleted)
+        if self.size + extra <= capacity:
+            return
+        capacity = max(2 * capacity, self.size + extra, 1024)
+        for name, column in self._columns.items():
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            self._columns[name] = grown
+        deleted = np.zeros(capacity, dtype=bool)
+        deleted[:self.size] = self._deleted[:self.size]
+        self._deleted = deleted
+        counts = np.zeros(capacity, dtype=np.int16)
+        counts[:len(self._gram_counts)] = self._gram_counts
+        self._gram_counts = counts
+
+    def _term(self, term):
+        term_id = self._term_ids.get(term)
+        if term_id is None:
+            term_id = self._term_ids[term] = len(self._postings)
+            self._postings.append([])
+            for gram in trigrams(term):
+                self._trigram_terms.setdefault(gram, set()).add(term_id)
+            self._sorted_terms = None
+        return term_id
+
+    def _post(self, term, rows):
+        term_id = self._term(term)
+        self._postings[term_id].append(rows)
+        self._posting_cache.pop(term_id, None)
+
+    def _rows_of(self, term_id):
+        rows = self._posting_cache.get(term_id)
+        if rows is None:
+            chunks = self._postings[term_id]
+            rows = chunks[0] if len(chunks) == 1 else np.concatenate(chunks)
+            self._posting_cache[term_id] = rows
+        return rows
+
+    def _merge_ids(self):
+        """Fold the buffered IDs into the sorted key array and the trigram index, each with one O(n) insert"""
+        if not self._id_delta:
+            return
+        rows = np.array(self._id_delta, dtype=np.int64)
+        ids = self._columns["patient_id"][rows].astype(str)
+        keys = np.char.lower(ids)
+        # IDs that are already one lower-case alphanumeric word are their own key; others go through _id_keys
+        codes = keys.view(np.uint32).reshape(len(keys), -1)
+        simple = (((codes >= ord("0")) & (codes <= ord("9"))) | ((codes >= ord("a")) & (codes <= ord("z")))
+                  | (codes == 0)).all(axis=1) & (np.char.str_len(keys) > 0)
+        whole, key_rows, segments = keys, rows[simple], np.zeros(int(simple.sum()), dtype=bool)
+        if not simple.all():
+            whole = keys.astype(object)
+            entries = [(rows[i], key, is_segment) for i in np.flatnonzero(~simple) for key, is_segment in _id_keys(ids[i])]
+            for i in np.flatnonzero(~simple):
+                whole[i] = normalize_id(ids[i])
+            extra_rows, extra_keys, extra_segments = zip(*entries)
+            keys = np.concatenate([keys[simple], np.array(extra_keys, dtype=str)])
+            key_rows = np.concatenate([key_rows, np.array(extra_rows, dtype=np.int64)])
+            segments = np.concatenate([segments, np.array(extra_segments, dtype=bool)])
+
+        order = np.argsort(keys, kind="stable")
+        keys, key_rows, segments = keys[order], key_rows[order], segments[order]
+        positions = np.searchsorted(self._id_sorted, keys, side="right")
+        self._id_sorted = np.insert(self._id_sorted.astype(np.result_type(self._id_sorted, keys)), positions, keys)
+        self._id_rows = np.insert(self._id_rows, positions, key_rows)
+        self._id_segment = np.insert(self._id_segment, positions, segments)
+
+        # Whole keys in row order, so each trigram's rows come out ascending, and stay so as later rows are appended
+        gram_codes, index = _gram_codes(whole.astype(str))
+        gram_rows = rows[index]
+        self._gram_counts[:self.size] += np.bincount(gram_rows, minlength=self.size)[:self.size].astype(np.int16)
+        positions = np.searchsorted(self._gram_codes, gram_codes, side="right")
+        self._gram_codes = np.insert(self._gram_codes, positions, gram_codes)
+        self._gram_rows = np.insert(self._gram_rows, positions, gram_rows)
+        self._id_delta = []
+
+    def add(self, records):
+        """
+        Append patient records, indexing them as they arrive
+
+        Text columns are grouped by distinct value, so each value is tokenized once and a
+        bulk load costs a few NumPy passes per column rather than work per record.
+
+        Args:
+            records (pd.DataFrame | dict | list): Columns of ``FIELDS``; missing ones get defaults
+        """
+        frame = pd.DataFrame(records if not isinstance(records, dict) else [records])
+        n = len(frame)
+        if n == 0:
+            return
+        first = self.size
+        self._reserve(n)
+        for name, dtype in FIELDS.items():
+            if name in frame:
+                values = frame[name].to_numpy()
+            else:
+                values = np.zeros(n, dtype=dtype) if dtype is not object else np.full(n, "", dtype=object)
+            if name == "patient_id" or dtype is object:
+                values = values.astype(str).astype(object)
+            self._columns[name][first:first + n] = values
+        self._deleted[first:first + n] = False
+        self.size += n
+
+        for name in TEXT_FIELDS:
+            values, inverse = np.unique(self._columns[name][first:first + n].astype(str), return_inverse=True)
+            order = np.argsort(inverse, kind="stable")
+            bounds = np.concatenate([[0], np.cumsum(np.bincount(inverse, minlength=len(values)))])
+            for i, value in enumerate(values):
+                rows = (first + order[bounds[i]:bounds[i + 1]]).astype(np.int64)
+                for term in set(tokenize(value)):
+                    self._post(term, rows)
+        for name, label in FLAG_FIELDS.items():
+            rows = first + np.flatnonzero(self._columns[name][first:first + n]).astype(np.int64)
+            if len(rows):
+                for term in tokenize(label):
+                    self._post(term, rows)
+
+        self._id_delta.extend(range(first, first + n))
+        if len(self._id_delta) > ID_DELTA_LIMIT:
+            self._merge_ids()
+
+    def _find(self, patient_id):
+        """Row of the live record for ``patient_id``, or None"""
+        patient_id = str(patient_id)
+        lo, hi = _prefix_range(self._id_sorted, normalize_id(patient_id))
+        rows = [r for r in self._id_rows[lo:hi] if self._columns["patient_id"][r] == patient_id]
+        rows += [r for r in self._id_delta if self._columns["patient_id"][r] == patient_id]
+        live = [r for r in rows if not self._deleted[r]]
+        return max(live) if live else None
+
+    def get(self, patient_id):
+        """The record for ``patient_id`` as a dict, or None"""
+        row = self._find(patient_id)
+        return None if row is None else self._record(row)
+
+    def remove(self, patient_id):
+        row = self._find(patient_id)
+        if row is not None:
+            self._deleted[row] = True
+
+    def update(self, patient_id, **fields):
+        """Replace some fields of a patient's record; the old version is tombstoned"""
+        row = self._find(patient_id)
+        if row is None:
+            raise KeyError(f"Unknown patient: {patient_id}")
+        record = self._record(row)
+        record.update(fields, patient_id=str(patient_id))
+        self._deleted[row] = True
+        self.add(record)
+
+    def _record(self, row):
+        return {name: column[row].item() if hasattr(column[row], "item") else column[row]
+                for name, column in self._columns.items()}
+
+    # Search
+
+    def _match_ids(self, key, scores):
+        """
+        Score IDs against a normalised key: exactly or by prefix of the whole ID, or by prefix
+        of one of its later words; only when none matches that way, by trigram similarity,
+        so a mistyped ID is still found without slowing down the lookups that succeed
+
+        Returns:
+            bool: Whether any ID matched
+        """
+        lo, hi = _prefix_range(self._id_sorted, key)
+        rows = self._id_rows[lo:hi]
+        keys = self._id_sorted[lo:hi]
+        # Shorter IDs rank first among prefix matches, so typing narrows towards the exact ID
+        extra = 0.1 * (np.char.str_len(keys) - len(key))
+        prefix_scores = np.where(self._id_segment[lo:hi], ID_SEGMENT_SCORE - extra,
+                                 np.where(keys == key, ID_EXACT_SCORE, ID_PREFIX_SCORE - extra))
+        np.maximum.at(scores, rows, prefix_scores.astype(scores.dtype))
+        found = hi > lo
+
+        for row in self._id_delta:
+            for id_key, is_segment in _id_keys(self._columns["patient_id"][row]):
+                if id_key.startswith(key):
+                    score = (ID_SEGMENT_SCORE if is_segment else ID_PREFIX_SCORE) - 0.1 * (len(id_key) - len(key))
+                    scores[row] = max(scores[row], ID_EXACT_SCORE if id_key == key and not is_segment else score)
+                    found = True
+
+        if not found and len(key) >= 3:
+            found = self._match_ids_fuzzy(key, scores)
+        return found
+
+    def _match_ids_fuzzy(self, key, scores):
+        """Score IDs whose normalised key has a trigram Jaccard similarity of at least ``FUZZY_THRESHOLD``"""
+        grams = trigrams(key)
+        query_codes, _ = _gram_codes([key])
+        starts = np.searchsorted(self._gram_codes, query_codes, side="left")
+        ends = np.searchsorted(self._gram_codes, query_codes, side="right")
+        # A similar ID shares at least ceil(threshold * n) of the query's n trigrams, so it has one
+        # of the n - ceil(threshold * n) + 1 rarest: only those lists are read to find candidates
+        order = np.argsort(ends - starts, kind="stable")
+        rarest = order[:len(grams) - int(np.ceil(FUZZY_THRESHOLD * len(grams))) + 1]
+        candidates = np.unique(np.concatenate([self._gram_rows[starts[i]:ends[i]] for i in rarest]))
+        # Rows are ascending within each trigram's list, so the other lists are checked by binary search
+        shared = np.zeros(len(candidates), dtype=np.int32)
+        for lo, hi in zip(starts, ends):
+            if hi > lo:
+                rows = self._gram_rows[lo:hi]
+                shared += rows[np.minimum(np.searchsorted(rows, candidates), len(rows) - 1)] == candidates
+        similarity = shared / (len(grams) + self._gram_counts[candidates] - shared)
+        similar = similarity >= FUZZY_THRESHOLD
+        scores[candidates[similar]] = np.maximum(scores[candidates[similar]], ID_FUZZY_SCORE * similarity[similar])
+
+        found = bool(similar.any())
+        for row in self._id_delta:
+            id_key = normalize_id(self._columns["patient_id"][row])
+            similarity = len(grams & trigrams(id_key)) / len(grams | trigrams(id_key))
+            if similarity >= FUZZY_THRESHOLD:
+                scores[row] = max(scores[row], ID_FUZZY_SCORE * similarity)
+                found = True
+        return found
+
+    def _match_terms(self, token, scores):
+        if self._sorted_terms is None:
+            self._sorted_terms = np.array(sorted(self._term_ids), dtype=str)
+        terms = self._sorted_terms
+        lo, hi = _prefix_range(terms, token)
+        matches = {self._term_ids[term]: TERM_PREFIX_SCORE for term in terms[lo:hi]}
+        if token in self._term_ids:
+            matches[self._term_ids[token]] = TERM_EXACT_SCORE
+
+        # Misspellings: terms sharing most of the token's trigrams
+        if len(token) >= 3:
+            grams = trigrams(token)
+            shared = {}
+            for gram in grams:
+                for term_id in self._trigram_terms.get(gram, ()):
+                    shared[term_id] = shared.get(term_id, 0) + 1
+            names = {term_id: term for term, term_id in self._term_ids.items() if term_id in shared}
+            for term_id, count in shared.items():
+                similarity = count / len(grams | trigrams(names[term_id]))
+                if similarity >= FUZZY_THRESHOLD and term_id not in matches:
+                    matches[term_id] = TERM_FUZZY_SCORE * similarity
+
+        # Written from weakest to strongest match, so each row ends up with its best score
+        for term_id, score in sorted(matches.items(), key=lambda item: item[1]):
+            scores[self._rows_of(term_id)] = score
+
+    def search(self, query, k=10):
+        """
+        Ranked patients matching every word of ``query``
+
+        Each word may match a patient ID or an attribute word exactly, by prefix or fuzzily;
+        scores add up across words and ties keep insertion order. A query of several words
+        is also matched as one ID, so "MRN-00A1" finds the ID it spells whatever its case
+        and punctuation.
+
+        Args:
+            query (str): Free text, e.g. "2879", "levetir female" or "structural lesion"
+            k (int): Maximum number of results
+
+        Returns:
+            tuple: (list of record dicts best first, total number of matching patients)
+        """
+        tokens = tokenize(query)
+        if not tokens or self.size == 0:
+            return [], 0
+
+        total = np.zeros(self.size, dtype=np.float32)
+        alive = ~self._deleted[:self.size]
+        for token in tokens:
+            scores = np.zeros(self.size, dtype=np.float32)
+            # Terms first: they overwrite rows, whereas ID matches keep the better score
+            self._match_terms(token, scores)
+            self._match_ids(token, scores)
+            alive &= scores > 0
+            total += scores
+        whole = np.zeros(self.size, dtype=np.float32) if len(tokens) > 1 else None
+        if whole is not None and self._match_ids("".join(tokens), whole):
+            whole[self._deleted[:self.size]] = 0
+            total = np.maximum(np.where(alive, total, 0), whole)
+            alive |= whole > 0
+
+        rows = np.flatnonzero(alive)
+        if len(rows) > k:
+            top = np.argpartition(-total[rows], k - 1)[:k]
+            rows = np.sort(rows[top])
+        rows = rows[np.argsort(-total[rows], kind="stable")]
+        return [self._record(row) for row in rows[:k]], int(np.count_nonzero(alive))
+
+    # Bulk loading
+
+    @classmethod
+    def from_frame(cls, frame):
+        registry = cls()
+        registry.add(frame)
+        registry._merge_ids()
+        return registry
+
+    @classmethod
+    def from_sqlite(cls, path, table="patients", chunk_rows=200_000):
+        """Bulk-load a registry from a SQLite table with ``FIELDS`` columns, in chunks"""
+        registry = cls()
+        with sqlite3.connect(path) as connection:
+            for chunk in pd.read_sql_query(f"SELECT * FROM {table}", connection, chunksize=chunk_rows):
+                registry.add(chunk)
+        registry._merge_ids()
+        return registry
+
+    @classmethod
+    def from_parquet(cls, path):
+        """Bulk-load a registry from a Parquet file with ``FIELDS`` columns (needs pyarrow or fastparquet)"""
+        return cls.from_frame(pd.read_parquet(path, columns=[name for name in FIELDS]))
+
+
+def synthetic_patients(n, seed=None, include=None):
+    """
+    Synthetic registry rows with the attributes shown on the dashboard
+
+    Args:
+        n (int): Number of patients
+        seed (int): Random seed
+        include (list): Extra records appended as-is, e.g. the dashboard's own patient
+
+    Returns:
+        pd.DataFrame: One row per patient
+    """
+    rng = np.random.default_rng(seed)
+    statuses = np.array(["Post-seizure monitoring", "Routine EEG", "Pre-surgical evaluation", "ICU continuous EEG",
+                         "Discharged", "Ambulatory monitoring"], dtype=object)
+    medications = np.array(["Levetiracetam", "Valproate", "Lamotrigine", "Carbamazepine", "Lacosamide",
+                            "Phenytoin", "None"], dtype=object)
+    findings = np.array(["F3 spike-and-wave", "Temporal sharp waves", "Generalized slowing", "Normal",
+                         "Focal slowing", "Photoparoxysmal response"], dtype=object)
+    frame = pd.DataFrame({
+        "patient_id": (10000 + rng.permutation(n)).astype(str),
+        "status": statuses[rng.integers(0, len(statuses), n)],
+        "age": rng.integers(1, 95, n).astype(np.int16),
+        "sex": np.array(["Female", "Male"], dtype=object)[rng.integers(0, 2, n)],
+        "medication": medications[rng.integers(0, len(medications), n)],
+        "eeg_finding": findings[rng.integers(0, len(findings), n)],
+        "prior_seizure_history": rng.random(n) < 0.4,
+        "structural_lesion": rng.random(n) < 0.15,
+        "genetic_factors": rng.random(n) < 0.1,
+        "sleep_deprivation": rng.random(n) < 0.2,
+    })
+    if include:
+        frame = pd.concat([frame[~frame["patient_id"].isin([r["patient_id"] for r in include])],
+                           pd.DataFrame(include)], ignore_index=True)
+    return frame
@@ -0,0 +1,245 @@
+import json
+import os
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from utils.attention import build_attention_map, regions_from_events
+from utils.edf_reader import EDFReader
+from utils.recording_store import RecordingReader, is_recording
+from utils.spectral import BANDS, band_powers, relative_band_powers
+
+# Directory under DATA_PATH holding the per-patient artifacts and the progress manifest
+ARTIFACTS_DIR = "artifacts"
+MANIFEST_FILE = "manifest.json"
+ARTIFACT_VERSION = 1
+
+# Seconds of signal processed per block, so memory per worker stays bounded on long recordings
+BLOCK_SECONDS = 300
+
+
+def recording_name(path):
+    """Display name of a recording: its directory name or EDF file stem"""
+    return os.path.splitext(os.path.basename(os.path.normpath(path)))[0]
+
+
+def recording_key(root, path):
+    """
+    Artifact and manifest key of a recording: its path relative to ``root``, separators replaced
+
+    The extension is kept, so ``edf/a/night1.edf`` and ``edf/b/night1.edf`` or a
+    ``patient_1`` directory and a ``patient_1.edf`` file next to it never share artifacts.
+    """
+    return os.path.relpath(os.path.normpath(path), root).replace(os.sep, "__")
+
+
+def artifact_path(root, path):
+    return os.path.join(root, ARTIFACTS_DIR, recording_key(root, path) + ".npz")
+
+
+def discover_recordings(root):
+    """Recording directories and EDF files anywhere under ``root``, in a stable order"""
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        if os.path.basename(dirpath) == ARTIFACTS_DIR:
+            dirnames[:] = []
+            continue
+        if is_recording(dirpath):
+            found.append(dirpath)
+            dirnames[:] = []
+            continue
+        found.extend(os.path.join(dirpath, name) for name in filenames if name.lower().endswith(".edf"))
+    return sorted(found)
+
+
+def source_signature(path):
+    """Size and modification time of the recording's sample data, to detect changes since the last run"""
+    data_file = os.path.join(path, "samples.raw") if os.path.isdir(path) else path
+    stat = os.stat(data_file)
+    return [stat.st_size, int(stat.st_mtime)]
+
+
+def _open(path):
+    return RecordingReader(path) if os.path.isdir(path) else EDFReader(path)
+
+
+def compute_artifacts(path, out_path, bin_width=0.2, block_seconds=BLOCK_SECONDS):
+    """
+    Compute and write the analysis artifacts of one recording
+
+    Band powers are computed block by block with a margin of neighbouring samples, so the
+    result is identical to a single pass over the whole recording. Runs in a worker process.
+
+    The NPZ holds ``band_powers`` (relative, float16, (n_bands, n_channels, n_bins)),
+    ``attention`` (float16, (n_channels, n_bins)) and per-channel ``summary`` features
+    (mean relative band power, RMS, line length per second, mean attention and fraction of
+    high-attention bins), plus the metadata needed to interpret them.
+
+    Args:
+        path (str): Recording directory or .edf file
+        out_path (str): Destination .npz file
+        bin_width (float): Attention bin width in seconds
+        block_seconds (float): Seconds read and transformed at a time
+
+    Returns:
+        dict: Stage timings in seconds and the recording's shape
+    """
+    timings = {}
+    start = time.perf_counter()
+    reader = _open(path)
+    sample_rate = reader.sample_rate
+    n_channels = len(reader.channels)
+    hop = int(round(bin_width * sample_rate))
+    n_bins = reader.n_samples // hop
+    margin = -(-int(round(sample_rate)) // hop) * hop
+    block = max(1, int(block_seconds * sample_rate) // hop) * hop
+
+    powers = np.empty((len(BANDS), n_channels, n_bins), dtype=np.float16)
+    sum_squares = np.zeros(n_channels)
+    line_length = np.zeros(n_channels)
+    previous = None
+    timings["read"] = timings["band_powers"] = 0.0
+    for lo in range(0, n_bins * hop, block):
+        hi = min(lo + block, n_bins * hop)
+        ext_lo, ext_hi = max(0, lo - margin), min(reader.n_samples, hi + margin)
+
+        tick = time.perf_counter()
+        samples = np.asarray(reader.read_samples(ext_lo, ext_hi), dtype=np.float32)
+        timings["read"] += time.perf_counter() - tick
+
+        tick = time.perf_counter()
+        ext_powers = relative_band_powers(band_powers(samples, sample_rate, hop=bin_width))
+        skip = (lo - ext_lo) // hop
+        powers[:, :, lo // hop:hi // hop] = ext_powers[:, :, skip:skip + (hi - lo) // hop]
+        timings["band_powers"] += time.perf_counter() - tick
+
+        core = samples[:, lo - ext_lo:hi - ext_lo]
+        sum_squares += np.square(core, dtype=np.float64).sum(axis=1)
+        line_length += np.abs(np.diff(core, axis=1)).sum(axis=1)
+        if previous is not None:
+            line_length += np.abs(core[:, 0] - previous)
+        previous = core[:, -1]
+
+    tick = time.perf_counter()
+    seed = zlib.crc32(recording_name(path).encode())
+    attention = build_attention_map(list(reader.channels), n_bins * bin_width, bin_width=bin_width, seed=seed,
+                                    regions=regions_from_events(reader.annotations), dtype=np.float16)
+    timings["attention"] = time.perf_counter() - tick
+
+    tick = time.perf_counter()
+    n_used = max(1, n_bins * hop)
+    summary = {
+        "band_power": powers.astype(np.float32).mean(axis=2),
+        "rms": np.sqrt(sum_squares / n_used).astype(np.float32),
+        "line_length": (line_length / (n_used / sample_rate)).astype(np.float32),
+        "attention_mean": attention.astype(np.float32).mean(axis=1),
+        "attention_high": (attention >= 0.7).mean(axis=1).astype(np.float32),
+    }
+    timings["summary"] = time.perf_counter() - tick
+
+    tick = time.perf_counter()
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    tmp_path = out_path + ".tmp.npz"
+    np.savez(
+        tmp_path,
+        version=ARTIFACT_VERSION,
+        channels=np.array(reader.channels),
+        bands=np.array(list(BANDS)),
+        sample_rate=sample_rate,
+        bin_width=bin_width,
+        duration=reader.duration,
+        band_powers=powers,
+        attention=attention,
+        **{f"summary_{name}": value for name, value in summary.items()},
+    )
+    os.replace(tmp_path, out_path)
+    timings["write"] = time.perf_counter() - tick
+    timings["total"] = time.perf_counter() - start
+
+    if hasattr(reader, "close"):
+        reader.close()
+    return {"timings": timings, "channels": n_channels, "seconds": n_bins * bin_width}
+
+
+def load_manifest(root):
+    manifest_path = os.path.join(root, ARTIFACTS_DIR, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path, "r") as f:
+        return json.load(f)
+
+
+def _save_manifest(root, manifest):
+    # Write then rename so an interrupted run never leaves a truncated manifest
+    manifest_path = os.path.join(root, ARTIFACTS_DIR, MANIFEST_FILE)
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    with open(manifest_path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(manifest_path + ".tmp", manifest_path)
+
+
+def pending_recordings(root, manifest, force=False):
+    """Recordings under ``root`` with no up-to-date artifact in ``manifest``"""
+    pending = []
+    for path in discover_recordings(root):
+        entry = manifest.get(recording_key(root, path))
+        done = (entry is not None and entry.get("status") == "done"
+                and entry.get("signature") == source_signature(path)
+                and entry.get("version") == ARTIFACT_VERSION
+                and os.path.exists(artifact_path(root, path)))
+        if force or not done:
+            pending.append(path)
+    return pending
+
+
+def run_precompute(root, workers=None, force=False, bin_width=0.2, log=print):
+    """
+    Compute artifacts for every recording under ``root`` that does not have current ones
+
+    Recordings are spread over a process pool, one task per recording. The manifest is
+    rewritten as each task finishes, so an interrupted run resumes where it stopped and
+    recordings whose samples have not changed are skipped.
+
+    Args:
+        root (str): Data directory, usually ``DATA_PATH``
+        workers (int): Worker processes; defaults to every core
+        force (bool): Recompute even up-to-date artifacts
+        bin_width (float): Attention bin width in seconds
+        log (callable): Receives one progress line per finished task
+
+    Returns:
+        dict: The updated manifest, keyed by ``recording_key``
+    """
+    manifest = load_manifest(root)
+    pending = pending_recordings(root, manifest, force=force)
+    workers = workers or os.cpu_count() or 1
+    log(f"{len(pending)} recording(s) to process with {workers} worker(s)")
+    if not pending:
+        return manifest
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(compute_artifacts, path, artifact_path(root, path), bin_width): path
+                   for path in pending}
+        for done, future in enumerate(as_completed(futures), 1):
+            path = futures[future]
+            key = recording_key(root, path)
+            entry = {"source": os.path.relpath(path, root), "artifact": os.path.relpath(artifact_path(root, path), root),
+                     "signature": source_signature(path), "version": ARTIFACT_VERSION}
+            try:
+                result = future.result()
+            except Exception as exc:
+                entry.update(status="failed", error=f"{type(exc).__name__}: {exc}")
+                log(f"[{done}/{len(pending)}] {key}: failed ({entry['error']})")
+            else:
+                entry.update(status="done", timings=result["timings"], channels=result["channels"],
+                             seconds=result["seconds"])
+                stages = ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in result["timings"].items())
+                log(f"[{done}/{len(pending)}] {key}: {stages}")
+            manifest[key] = entry
+            _save_manifest(root, manifest)
+
+    log(f"finished in {time.perf_counter() - start:.1f} s")
+    return manifest
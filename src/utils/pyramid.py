@@ -0,0 +1,210 @@
+import json
+import os
+import threading
+
+import numpy as np
+
+# Samples per bucket at level 0, and how many buckets of one level form a bucket of the next
+BASE_BUCKET = 16
+FACTOR = 4
+
+# Statistics stored per bucket and channel, in file order
+STATS = ("min", "max", "mean")
+
+PYRAMID_HEADER = "pyramid.json"
+
+# Raw samples reduced per step while building level 0
+BUILD_CHUNK_SAMPLES = 1 << 18
+
+
+def pyramid_path(recording_path):
+    """Directory holding the pyramid of a recording directory or an .edf file"""
+    if os.path.isdir(recording_path):
+        return os.path.join(recording_path, "pyramid")
+    return recording_path + ".pyramid"
+
+
+def _reduce(stats, factor):
+    """Merge every ``factor`` consecutive buckets of a (n, 3, n_channels) stats array"""
+    grouped = stats.reshape(-1, factor, len(STATS), stats.shape[2])
+    merged = np.empty((grouped.shape[0], len(STATS), stats.shape[2]), dtype=np.float32)
+    merged[:, 0] = grouped[:, :, 0].min(axis=1)
+    merged[:, 1] = grouped[:, :, 1].max(axis=1)
+    merged[:, 2] = grouped[:, :, 2].mean(axis=1)
+    return merged
+
+
+def _bucket_stats(samples, bucket):
+    """Min/max/mean of each complete ``bucket``-sample bucket of a (n_channels, n) block"""
+    n_channels, n = samples.shape
+    buckets = np.asarray(samples[:, :n - n % bucket], dtype=np.float32).reshape(n_channels, -1, bucket)
+    stats = np.empty((buckets.shape[1], len(STATS), n_channels), dtype=np.float32)
+    stats[:, 0] = buckets.min(axis=2).T
+    stats[:, 1] = buckets.max(axis=2).T
+    stats[:, 2] = buckets.mean(axis=2).T
+    return stats
+
+
+class PyramidIndex:
+    """
+    Multi-level min/max/mean summary of every channel of a recording
+
+    Level ``k`` holds one bucket per ``BASE_BUCKET * FACTOR**k`` samples, stored as an
+    append-only float32 file of shape (n_buckets, 3, n_channels) next to the recording.
+    Only complete buckets are stored; ``update`` extends every level from where it
+    stopped, so appending data to the recording costs time proportional to the new data.
+
+    Args:
+        path (str): Pyramid directory, see ``pyramid_path``
+        n_channels (int): Number of channels in the recording
+        sample_rate (float): Samples per second of the recording
+    """
+
+    def __init__(self, path, n_channels, sample_rate, base_bucket=BASE_BUCKET, factor=FACTOR):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        header_file = os.path.join(path, PYRAMID_HEADER)
+        if os.path.exists(header_file):
+            with open(header_file, "r") as f:
+                self.header = json.load(f)
+        else:
+            self.header = {"base_bucket": base_bucket, "factor": factor, "n_channels": n_channels,
+                           "sample_rate": sample_rate, "source_samples": 0, "levels": []}
+        self.n_channels = n_channels
+        self.sample_rate = sample_rate
+        self._maps = {}
+        self._lock = threading.Lock()
+
+    @property
+    def levels(self):
+        return self.header["levels"]
+
+    def bucket_samples(self, level):
+        return self.header["base_bucket"] * self.header["factor"] ** level
+
+    def _level_file(self, level):
+        return os.path.join(self.path, f"level_{level}.raw")
+
+    def _save_header(self):
+        tmp = os.path.join(self.path, PYRAMID_HEADER + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(self.header, f, indent=2)
+        os.replace(tmp, os.path.join(self.path, PYRAMID_HEADER))
+
+    def level_stats(self, level):
+        """Memory-mapped (n_buckets, 3, n_channels) stats of a level"""
+        n_buckets = self.levels[level]["n_buckets"]
+        cached = self._maps.get(level)
+        if cached is None or cached.shape[0] != n_buckets:
+            if n_buckets == 0:
+                return np.empty((0, len(STATS), self.n_channels), dtype=np.float32)
+            cached = np.memmap(self._level_file(level), dtype="<f4", mode="r",
+                               shape=(n_buckets, len(STATS), self.n_channels))
+            self._maps[level] = cached
+        return cached
+
+    def _append(self, level, stats):
+        if level == len(self.levels):
+            self.levels.append({"n_buckets": 0})
+            open(self._level_file(level), "wb").close()
+        # The header is saved last, so rows past its count are left over from an interrupted update
+        row_bytes = len(STATS) * self.n_channels * 4
+        with open(self._level_file(level), "r+b") as f:
+            f.seek(self.levels[level]["n_buckets"] * row_bytes)
+            f.write(np.ascontiguousarray(stats, dtype="<f4").tobytes())
+            f.truncate()
+        self.levels[level]["n_buckets"] += len(stats)
+
+    def update(self, reader):
+        """
+        Extend the pyramid with samples appended to ``reader`` since the last update
+
+        Args:
+            reader: RecordingReader or EDFReader over the recording
+
+        Returns:
+            int: Number of new level-0 buckets
+        """
+        with self._lock:
+            return self._update(reader)
+
+    def _update(self, reader):
+        reader.refresh()
+        base = self.header["base_bucket"]
+        factor = self.header["factor"]
+        done = (self.levels[0]["n_buckets"] if self.levels else 0) * base
+        target = reader.n_samples - reader.n_samples % base
+        if target <= done and self.levels:
+            return 0
+
+        # Level 0 straight from the samples, a bounded chunk at a time
+        step = BUILD_CHUNK_SAMPLES - BUILD_CHUNK_SAMPLES % base
+        added = 0
+        for lo in range(done, target, step):
+            hi = min(lo + step, target)
+            stats = _bucket_stats(reader.read_samples(lo, hi), base)
+            self._append(0, stats)
+            added += len(stats)
+        if not self.levels:
+            self._append(0, np.empty((0, len(STATS), self.n_channels), dtype=np.float32))
+
+        # Each higher level from the complete groups of the level below it
+        level = 0
+        while self.levels[level]["n_buckets"] >= factor:
+            below = self.level_stats(level)
+            have = self.levels[level + 1]["n_buckets"] if level + 1 < len(self.levels) else 0
+            complete = below.shape[0] // factor
+            if complete > have:
+                self._append(level + 1, _reduce(np.asarray(below[have * factor:complete * factor]), factor))
+            level += 1
+
+        self.header["source_samples"] = target
+        self._save_header()
+        return added
+
+    def choose_level(self, n_samples, width_px):
+        """
+        Coarsest level that still has at least ``width_px`` buckets across ``n_samples``
+
+        Returns:
+            int | None: Level index, or None if raw samples are needed
+        """
+        chosen = None
+        for level in range(len(self.levels)):
+            if n_samples / self.bucket_samples(level) >= width_px:
+                chosen = level
+        return chosen
+
+    def envelope(self, lo, hi, width_px):
+        """
+        Min/max envelope of samples [lo, hi) from the coarsest level that fills ``width_px``
+
+        Args:
+            lo (int): First sample
+            hi (int): End sample (exclusive)
+            width_px (int): Rendered plot width in pixels
+
+        Returns:
+            tuple | None: (x seconds, y) each of shape (n_channels, 2 * n_buckets), with each
+            bucket's minimum at its start and maximum at its midpoint; None if raw samples
+            should be plotted instead
+        """
+        level = self.choose_level(hi - lo, width_px)
+        if level is None:
+            return None
+
+        bucket = self.bucket_samples(level)
+        stats = self.level_stats(level)
+        first = lo // bucket
+        last = min(-(-hi // bucket), stats.shape[0])
+        window = np.asarray(stats[first:last])
+
+        starts = (first + np.arange(window.shape[0])) * bucket / self.sample_rate
+        x = np.empty(2 * len(starts))
+        x[0::2] = starts
+        x[1::2] = starts + bucket / (2 * self.sample_rate)
+        y = np.empty((self.n_channels, 2 * len(starts)), dtype=np.float32)
+        y[:, 0::2] = window[:, 0].T
+        y[:, 1::2] = window[:, 1].T
+        return np.broadcast_to(x, y.shape), y
+
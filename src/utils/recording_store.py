@@ -0,0 +1,274 @@
+import json
+import os
+
+import numpy as np
+
+from utils.eeg_generator import generate_eeg_batch
+
+# On-disk layout of a recording directory
+HEADER_FILE = "header.json"
+DATA_FILE = "samples.raw"
+FORMAT_NAME = "neuroai-raw"
+FORMAT_VERSION = 1
+
+SUPPORTED_DTYPES = ("float32", "int16")
+
+
+def _read_header(path):
+    with open(os.path.join(path, HEADER_FILE), "r") as f:
+        header = json.load(f)
+    if header.get("format") != FORMAT_NAME:
+        raise ValueError(f"Not a {FORMAT_NAME} recording: {path}")
+    return header
+
+
+def _write_header(path, header):
+    # Write then rename so readers never see a half-written header
+    tmp_path = os.path.join(path, HEADER_FILE + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(header, f, indent=2)
+    os.replace(tmp_path, os.path.join(path, HEADER_FILE))
+
+
+def is_recording(path):
+    """True if ``path`` is a recording directory written by this module"""
+    return os.path.isfile(os.path.join(path, HEADER_FILE)) and os.path.isfile(os.path.join(path, DATA_FILE))
+
+
+class RecordingWriter:
+    """
+    Append-only writer for a memory-mappable EEG recording
+
+    Samples are stored sample-major (one row of all channels per time step) so that
+    appending never rewrites existing data and any time window is one contiguous byte
+    range. Opening an existing recording continues it.
+
+    Args:
+        path (str): Recording directory
+        channels (list): Channel names
+        sample_rate (float): Samples per second
+        dtype (str): Storage dtype, "float32" or "int16"
+        scale (float): Physical units per int16 step; ignored for float32
+        annotations (list): Optional event dicts (``kind``, ``channel``, ``start``, ``end``)
+    """
+
+    def __init__(self, path, channels, sample_rate, dtype="float32", scale=1.0, annotations=None):
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(f"dtype must be one of {SUPPORTED_DTYPES}, got {dtype}")
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+
+        if is_recording(path):
+            self.header = _read_header(path)
+            if self.header["channels"] != list(channels) or self.header["sample_rate"] != sample_rate:
+                raise ValueError(f"Existing recording at {path} has different channels or sample rate")
+        else:
+            self.header = {
+                "format": FORMAT_NAME,
+                "version": FORMAT_VERSION,
+                "channels": list(channels),
+                "sample_rate": sample_rate,
+                "dtype": dtype,
+                "scale": 1.0 if dtype == "float32" else float(scale),
+                "layout": "sample-major",
+                "n_samples": 0,
+                "annotations": list(annotations or []),
+            }
+            open(os.path.join(path, DATA_FILE), "wb").close()
+            _write_header(path, self.header)
+
+        self._file = open(os.path.join(path, DATA_FILE), "ab")
+
+    @property
+    def n_samples(self):
+        return self.header["n_samples"]
+
+    def append(self, block):
+        """
+        Append a block of physical-unit samples
+
+        Args:
+            block (np.ndarray): Samples of shape (n_channels, n)
+        """
+        block = np.asarray(block)
+        if block.shape[0] != len(self.header["channels"]):
+            raise ValueError(f"Expected {len(self.header['channels'])} channels, got {block.shape[0]}")
+
+        if self.header["dtype"] == "int16":
+            raw = np.clip(np.rint(block / self.header["scale"]), -32768, 32767).astype("<i2")
+        else:
+            raw = block.astype("<f4", copy=False)
+
+        # Transposed copy gives the sample-major byte order on disk
+        self._file.write(np.ascontiguousarray(raw.T).tobytes())
+        self._file.flush()
+        self.header["n_samples"] += block.shape[1]
+        _write_header(self.path, self.header)
+
+    def add_annotations(self, annotations):
+        """Record events such as injected artifacts in the header"""
+        self.header["annotations"].extend(annotations)
+        _write_header(self.path, self.header)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class RecordingReader:
+    """
+    Windowed, constant-memory reader over a recording directory
+
+    The sample file is memory-mapped, so opening a multi-hour recording costs nothing
+    and a window read only touches the pages it covers.
+
+    Args:
+        path (str): Recording directory
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._mmap = None
+        self._mapped_samples = -1
+        self.refresh()
+
+    def refresh(self):
+        """Re-read the header and re-map the sample file to pick up appended data"""
+        self.header = _read_header(self.path)
+        self.channels = self.header["channels"]
+        self.sample_rate = self.header["sample_rate"]
+        self.scale = self.header["scale"]
+        self.dtype = np.dtype("<f4" if self.header["dtype"] == "float32" else "<i2")
+
+        # Derive the length from the file itself so a concurrent append is never over-read
+        row_bytes = len(self.channels) * self.dtype.itemsize
+        n_samples = os.path.getsize(os.path.join(self.path, DATA_FILE)) // row_bytes
+        n_samples = min(n_samples, self.header["n_samples"])
+
+        if n_samples != self._mapped_samples:
+            self._mmap = None
+            if n_samples:
+                self._mmap = np.memmap(os.path.join(self.path, DATA_FILE), dtype=self.dtype, mode="r",
+                                       shape=(n_samples, len(self.channels)))
+            self._mapped_samples = n_samples
+        self.n_samples = n_samples
+
+    @property
+    def duration(self):
+        return self.n_samples / self.sample_rate
+
+    @property
+    def annotations(self):
+        return self.header.get("annotations", [])
+
+    def annotations_in(self, start, end):
+        """Annotations overlapping the window [start, end) in seconds"""
+        return [a for a in self.annotations if a["start"] < end and a["end"] > start]
+
+    def sample_range(self, start, duration):
+        """Clamp a window in seconds to sample indices [lo, hi)"""
+        lo = min(max(0, int(round(start * self.sample_rate))), self.n_samples)
+        hi = min(self.n_samples, lo + int(round(duration * self.sample_rate)))
+        return lo, hi
+
+    def read_window(self, start, duration, scaled=True):
+        """
+        Read the window [start, start + duration) seconds of every channel
+
+        For float32 recordings, or with ``scaled=False``, the returned samples are a
+        read-only view into the memory map and nothing is copied; int16 recordings are
+        converted to physical units only for the requested window.
+
+        Args:
+            start (float): Window start in seconds
+            duration (float): Window length in seconds
+            scaled (bool): Convert int16 samples to physical units
+
+        Returns:
+            tuple: (time array in seconds, samples of shape (n_channels, n))
+        """
+        lo, hi = self.sample_range(start, duration)
+        return np.arange(lo, hi) / self.sample_rate, self.read_samples(lo, hi, scaled=scaled)
+
+    def read_samples(self, lo, hi, scaled=True):
+        """Samples [lo, hi) of every channel as (n_channels, n); a memory-map view unless int16 is scaled"""
+        if self._mmap is None or hi <= lo:
+            return np.empty((len(self.channels), 0), dtype=np.float32)
+
+        window = self._mmap[lo:hi].T
+        if scaled and self.dtype.kind == "i":
+            window = window.astype(np.float32) * np.float32(self.scale)
+        return window
+
+
+def write_recording(path, data, channels, sample_rate, dtype="float32", scale=None, annotations=None):
+    """
+    Write a complete in-memory recording and return a reader for it
+
+    Args:
+        path (str): Recording directory; an existing recording there is replaced
+        data (np.ndarray): Samples of shape (n_channels, n_samples) in physical units
+        channels (list): Channel names
+        sample_rate (float): Samples per second
+        dtype (str): Storage dtype, "float32" or "int16"
+        scale (float): Physical units per int16 step; defaults to full-range of ``data``
+        annotations (list): Optional event dicts stored in the header
+
+    Returns:
+        RecordingReader: Reader over the new recording
+    """
+    for name in (HEADER_FILE, DATA_FILE):
+        if os.path.exists(os.path.join(path, name)):
+            os.remove(os.path.join(path, name))
+    if scale is None:
+        scale = max(float(np.abs(data).max()) / 32767, 1e-12) if dtype == "int16" else 1.0
+
+    with RecordingWriter(path, channels, sample_rate, dtype=dtype, scale=scale, annotations=annotations) as writer:
+        writer.append(data)
+    return RecordingReader(path)
+
+
+def convert_synthetic_recording(path, channels, seconds, sample_rate=250, seed=None, artifacts=None,
+                                dtype="float32", scale=None, block_seconds=60):
+    """
+    Write the synthetic generator's output to a recording, one block at a time
+
+    Blocks are generated with a shared random generator and absolute start times, so the
+    result is one continuous recording while memory stays bounded by ``block_seconds``.
+
+    Args:
+        path (str): Recording directory; an existing recording there is replaced
+        channels (list): Channel names
+        seconds (float): Total duration
+        sample_rate (int): Samples per second
+        seed (int): Noise seed
+        artifacts (list): Artifact dicts for ``generate_eeg_batch``; stored as annotations
+        dtype (str): Storage dtype, "float32" or "int16"
+        scale (float): Physical units per int16 step; defaults to 4 units full scale
+        block_seconds (float): Seconds generated per block
+
+    Returns:
+        RecordingReader: Reader over the new recording
+    """
+    for name in (HEADER_FILE, DATA_FILE):
+        if os.path.exists(os.path.join(path, name)):
+            os.remove(os.path.join(path, name))
+    if scale is None:
+        scale = 4.0 / 32767 if dtype == "int16" else 1.0
+
+    rng = np.random.default_rng(seed)
+    artifacts = artifacts or []
+    with RecordingWriter(path, channels, sample_rate, dtype=dtype, scale=scale, annotations=artifacts) as writer:
+        start = 0.0
+        while start < seconds:
+            length = min(block_seconds, seconds - start)
+            _, block = generate_eeg_batch(channels, length, sample_rate=sample_rate, seed=rng,
+                                          artifacts=artifacts, start=start)
+            writer.append(block)
+            start += length
+    return RecordingReader(path)
@@ -0,0 +1,127 @@
+import numpy as np
+
+# Upper bound on highlighted regions drawn per channel; closer regions are merged first
+MAX_REGIONS_PER_CHANNEL = 20
+
+
+def detect_regions(attention, threshold, bin_width=0.2, start=0.0):
+    """
+    Above-threshold runs of every channel of an attention map, found without per-bin Python work
+
+    Each row is padded with a False bin on both sides, so the difference of the padded
+    mask is +1 where a run starts and -1 one past where it ends; ``np.nonzero`` returns
+    both in row-major order, so the n-th start and n-th end belong to the same run.
+
+    Args:
+        attention (np.ndarray): Scores of shape (n_channels, n_bins)
+        threshold (float): Bins scoring at least this are inside a region
+        bin_width (float): Width of each bin in seconds
+        start (float): Absolute time of the first bin
+
+    Returns:
+        tuple: (channel row, start, end) arrays, sorted by channel then start, times in seconds
+    """
+    n_channels, n_bins = attention.shape
+    padded = np.zeros((n_channels, n_bins + 2), dtype=np.int8)
+    np.greater_equal(attention, threshold, out=padded[:, 1:-1].view(bool))
+    edges = np.diff(padded, axis=1)
+    rows, first = np.nonzero(edges == 1)
+    _, last = np.nonzero(edges == -1)
+    return rows, start + first * bin_width, start + last * bin_width
+
+
+def merge_regions(rows, starts, ends, min_gap=0.0, max_per_row=MAX_REGIONS_PER_CHANNEL):
+    """
+    Merge regions of the same channel closer than ``min_gap``, then the closest ones until each
+    channel has at most ``max_per_row``
+
+    Regions must be sorted by row then start and not overlap within a row, as
+    ``detect_regions`` returns them.
+
+    Returns:
+        tuple: Merged (row, start, end) arrays in the same order
+    """
+    if len(rows) < 2:
+        return rows, starts, ends
+    gaps = starts[1:] - ends[:-1]
+    breaks = (rows[1:] != rows[:-1]) | (gaps >= min_gap)
+
+    # Rows still over budget keep only their widest gaps as breaks
+    counts = np.bincount(rows[np.r_[True, breaks]])
+    for row in np.flatnonzero(counts > max_per_row):
+        lo, hi = np.searchsorted(rows, [row, row + 1])
+        candidates = lo + np.flatnonzero(breaks[lo:hi - 1])
+        keep = candidates[np.argsort(gaps[candidates], kind="stable")[::-1][:max_per_row - 1]]
+        breaks[candidates] = False
+        breaks[keep] = True
+
+    first = np.flatnonzero(np.r_[True, breaks])
+    return rows[first], starts[first], np.maximum.reduceat(ends, first)
+
+
+class RegionIndex:
+    """
+    Sorted-array interval index of highlighted regions, per channel
+
+    Regions are kept sorted by channel then start, with the offset of each channel's
+    slice. Within a channel regions do not overlap, so their ends are sorted too, and the
+    regions overlapping a time window are one contiguous slice found with two binary
+    searches: O(log n) per channel however long the recording.
+
+    Args:
+        channels (list): Channel names, indexed by the row arrays
+        rows (np.ndarray): Channel row of each region
+        starts (np.ndarray): Region starts in seconds
+        ends (np.ndarray): Region ends in seconds
+    """
+
+    def __init__(self, channels, rows, starts, ends):
+        order = np.lexsort((starts, rows))
+        self.channels = list(channels)
+        self.rows = np.asarray(rows, dtype=np.int64)[order]
+        self.starts = np.asarray(starts, dtype=np.float64)[order]
+        self.ends = np.asarray(ends, dtype=np.float64)[order]
+        self.offsets = np.searchsorted(self.rows, np.arange(len(self.channels) + 1))
+
+    @classmethod
+    def from_attention(cls, attention, channels, threshold, bin_width=0.2, start=0.0):
+        """Index of the above-threshold regions of an attention map; see ``detect_regions``"""
+        return cls(channels, *detect_regions(attention, threshold, bin_width=bin_width, start=start))
+
+    def __len__(self):
+        return len(self.rows)
+
+    def query(self, t0, t1, channel=None):
+        """
+        Regions overlapping ``[t0, t1)``, clipped to it
+
+        Args:
+            channel (str): Only this channel's regions; all channels when None
+
+        Returns:
+            tuple: (row, start, end) arrays sorted by channel then start
+        """
+        rows = range(len(self.channels)) if channel is None else [self.channels.index(channel)]
+        parts = []
+        for row in rows:
+            lo, hi = self.offsets[row], self.offsets[row + 1]
+            first = lo + np.searchsorted(self.ends[lo:hi], t0, side="right")
+            last = lo + np.searchsorted(self.starts[lo:hi], t1, side="left")
+            if first < last:
+                parts.append(slice(first, last))
+        if not parts:
+            empty = np.empty(0)
+            return empty.astype(np.int64), empty, empty
+        idx = np.concatenate([np.arange(part.start, part.stop) for part in parts])
+        return self.rows[idx], np.maximum(self.starts[idx], t0), np.minimum(self.ends[idx], t1)
+
+    def highlights(self, t0, t1, min_gap=0.0, max_per_channel=MAX_REGIONS_PER_CHANNEL):
+        """
+        Regions overlapping ``[t0, t1)`` as highlight dicts, merged so each channel has a bounded count
+
+        Returns:
+            list: Dicts with ``channel``, ``start`` and ``end`` in seconds
+        """
+        rows, starts, ends = merge_regions(*self.query(t0, t1), min_gap=min_gap, max_per_row=max_per_channel)
+        return [{"channel": self.channels[row], "start": float(start), "end": float(end)}
+                for row, start, end in zip(rows, starts, ends)]
@@ -0,0 +1,348 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from utils.spectral import BANDS, band_powers, relative_band_powers
+
+# Options of the "Model Type" selector
+MODEL_TYPES = ("Transformer", "CNN-LSTM", "XGBoost", "Ensemble")
+
+# Per-window EEG features, each robustly z-scored against the patient's own recording
+WINDOW_FEATURES = tuple(BANDS) + ("line_length", "line_length_peak", "log_rms")
+
+# Patient-level features from the registry record
+CLINICAL_FEATURES = ("age", "prior_seizure_history", "structural_lesion", "genetic_factors",
+                     "sleep_deprivation", "levetiracetam")
+
+FEATURES = WINDOW_FEATURES + CLINICAL_FEATURES
+
+# Largest feature magnitude in robust standard deviations; artifacts beyond it are clipped
+FEATURE_CLIP = 5.0
+
+# Seconds of EEG per scored window
+WINDOW_SECONDS = 10.0
+
+# Hours ahead covered by the forecast
+FORECAST_HOURS = 24
+
+# Bootstrap resamples behind every confidence interval
+N_BOOTSTRAP = 2000
+
+# Log-odds of the reference risk score each model stands in for; positive weights raise risk
+RISK_BIAS = -3.5
+RISK_WEIGHTS = {
+    "delta": 0.35, "theta": 0.15, "alpha": -0.2, "beta": 0.0, "gamma": 0.1,
+    "line_length": 0.3, "line_length_peak": 0.45, "log_rms": 0.15,
+    "age": 0.1, "prior_seizure_history": 0.9, "structural_lesion": 0.5, "genetic_factors": 0.3,
+    "sleep_deprivation": 0.6, "levetiracetam": -0.4,
+}
+
+# Hours for the current EEG state to lose half its effect on the forecast, and the circadian swing in log-odds
+STATE_HALF_LIFE_HOURS = 6.0
+CIRCADIAN_AMPLITUDE = 0.35
+CIRCADIAN_PEAK_HOUR = 5.0
+
+# Patients scored per block; bounds the sequence-model temporaries
+PATIENT_CHUNK = 128
+
+
+def _robust_z(values, axis=-1):
+    median = np.median(values, axis=axis, keepdims=True)
+    spread = 1.4826 * np.median(np.abs(values - median), axis=axis, keepdims=True)
+    return (values - median) / (spread + 1e-6)
+
+
+def window_features(samples, sample_rate, window_seconds=WINDOW_SECONDS):
+    """
+    EEG features of consecutive windows, in ``WINDOW_FEATURES`` order
+
+    Relative band powers are averaged over channels; line length and RMS are z-scored per
+    channel against the span's median and MAD before taking the channel mean (and, for
+    ``line_length_peak``, the maximum). Every feature is then z-scored the same way across
+    windows, so features read as deviations from the patient's own background whatever
+    the amplifier gain.
+
+    Args:
+        samples (np.ndarray): Signal of shape (n_channels, n_samples)
+        sample_rate (float): Samples per second
+        window_seconds (float): Window length
+
+    Returns:
+        np.ndarray: float32 features of shape (n_windows, len(WINDOW_FEATURES))
+    """
+    samples = np.asarray(samples, dtype=np.float32)
+    n_channels = samples.shape[0]
+    width = int(round(window_seconds * sample_rate))
+    n_windows = samples.shape[1] // width
+    if n_windows == 0:
+        return np.zeros((0, len(WINDOW_FEATURES)), dtype=np.float32)
+
+    windows = samples[:, :n_windows * width].reshape(n_channels, n_windows, width)
+    powers = relative_band_powers(band_powers(samples[:, :n_windows * width], sample_rate,
+                                              hop=window_seconds, window=window_seconds))
+    bands = _robust_z(powers.mean(axis=1))
+    line_length = _robust_z(np.log(np.abs(np.diff(windows, axis=2)).sum(axis=2) + 1e-6))
+    log_rms = _robust_z(np.log(np.sqrt(np.square(windows).mean(axis=2)) + 1e-6))
+    # Channel mean and maximum are re-centred too: the maximum of many channels sits above zero even at rest
+    features = np.column_stack([bands.T, _robust_z(line_length.mean(axis=0)), _robust_z(line_length.max(axis=0)),
+                                _robust_z(log_rms.mean(axis=0))])
+    return np.clip(features, -FEATURE_CLIP, FEATURE_CLIP).astype(np.float32)
+
+
+def clinical_features(record):
+    """Clinical feature vector, in ``CLINICAL_FEATURES`` order, from a patient registry record"""
+    record = record or {}
+    return np.array([
+        (float(record.get("age", 40)) - 40.0) / 20.0,
+        float(bool(record.get("prior_seizure_history"))),
+        float(bool(record.get("structural_lesion"))),
+        float(bool(record.get("genetic_factors"))),
+        float(bool(record.get("sleep_deprivation"))),
+        float("levetiracetam" in str(record.get("medication", "")).lower()),
+    ], dtype=np.float32)
+
+
+def _reference_logits(x):
+    """Log-odds of the reference linear risk score for inputs of shape (..., len(FEATURES))"""
+    return x @ np.array([RISK_WEIGHTS[name] for name in FEATURES], dtype=np.float32) + RISK_BIAS
+
+
+def _training_sequences(n_sequences, n_windows, rng):
+    """Synthetic patients whose window features drift slowly and burst occasionally, for fitting the stand-ins"""
+    n_window = len(WINDOW_FEATURES)
+    drift = rng.standard_normal((n_sequences, n_windows, n_window)).astype(np.float32)
+    for step in range(1, n_windows):
+        drift[:, step] = 0.8 * drift[:, step - 1] + 0.6 * drift[:, step]
+    bursts = (rng.random((n_sequences, n_windows, 1)) < 0.05) * rng.uniform(2, 6, (n_sequences, n_windows, 1))
+    clinical = np.concatenate([rng.standard_normal((n_sequences, 1)),
+                               rng.random((n_sequences, len(CLINICAL_FEATURES) - 1)) < 0.3], axis=1)
+    clinical = np.broadcast_to(clinical[:, None], (n_sequences, n_windows, clinical.shape[1]))
+    return np.concatenate([drift + bursts.astype(np.float32), clinical], axis=2).astype(np.float32)
+
+
+def _fit_readout(hidden, target, ridge=1e-2):
+    """Ridge-regression readout from hidden features (with a bias column) to target logits"""
+    hidden = np.concatenate([hidden.reshape(-1, hidden.shape[-1]), np.ones((hidden[..., 0].size, 1))], axis=1)
+    gram = hidden.T @ hidden + ridge * np.eye(hidden.shape[1])
+    return np.linalg.solve(gram, hidden.T @ target.reshape(-1)).astype(np.float32)
+
+
+def _readout(hidden, weights):
+    return hidden @ weights[:-1] + weights[-1]
+
+
+class TransformerScorer:
+    """
+    Causal single-layer self-attention over the last ``context`` windows of each patient
+
+    A CPU stand-in for a sequence transformer: random projections and attention weights
+    with a ridge-regression readout distilled from the reference risk score. Every window
+    attends over a sliding causal context built as a strided view, so a batch of patients
+    is a few tensor contractions.
+    """
+
+    def __init__(self, d_model=32, context=30, seed=0):
+        rng = np.random.default_rng(seed)
+        n_in = len(FEATURES)
+        self.context = context
+        self.embed = (rng.standard_normal((n_in, d_model)) / np.sqrt(n_in)).astype(np.float32)
+        self.query, self.key, self.value = (rng.standard_normal((3, d_model, d_model)) / np.sqrt(d_model)).astype(np.float32)
+        x = _training_sequences(256, 64, rng)
+        self.readout = _fit_readout(self._hidden(x), _reference_logits(x))
+
+    def _hidden(self, x):
+        h = np.tanh(x @ self.embed)
+        d = h.shape[-1]
+        padded = np.concatenate([np.repeat(h[:, :1], self.context - 1, axis=1), h], axis=1)
+        # (n, w, d, context) views: window w sees itself and the context - 1 windows before it
+        keys = sliding_window_view(padded @ self.key, self.context, axis=1)
+        values = sliding_window_view(padded @ self.value, self.context, axis=1)
+        scores = np.einsum("nwd,nwdc->nwc", h @ self.query, keys) / np.float32(np.sqrt(d))
+        scores -= scores.max(axis=-1, keepdims=True)
+        weights = np.exp(scores)
+        weights /= weights.sum(axis=-1, keepdims=True)
+        mixed = np.einsum("nwc,nwdc->nwd", weights, values)
+        return np.concatenate([h, np.tanh(mixed)], axis=-1)
+
+    def logits(self, x):
+        return _readout(self._hidden(x), self.readout)
+
+
+class CnnLstmScorer:
+    """
+    Causal 1-D convolution over windows followed by an LSTM, batched over patients
+
+    A CPU stand-in with random convolution and recurrent weights and a ridge readout
+    distilled from the reference risk score. The recurrence steps through windows once,
+    with every patient of the batch advanced by one matrix product per step.
+    """
+
+    def __init__(self, channels=32, hidden=32, kernel=5, seed=1):
+        rng = np.random.default_rng(seed)
+        n_in = len(FEATURES)
+        self.kernel = kernel
+        self.hidden = hidden
+        self.conv = (rng.standard_normal((kernel, n_in, channels)) / np.sqrt(kernel * n_in)).astype(np.float32)
+        self.gates = (rng.standard_normal((channels + hidden, 4 * hidden)) / np.sqrt(channels + hidden)).astype(np.float32)
+        x = _training_sequences(256, 64, rng)
+        self.readout = _fit_readout(self._hidden(x), _reference_logits(x))
+
+    def _hidden(self, x):
+        n, w, _ = x.shape
+        padded = np.concatenate([np.repeat(x[:, :1], self.kernel - 1, axis=1), x], axis=1)
+        conv = np.maximum(np.einsum("nwfk,kfc->nwc", sliding_window_view(padded, self.kernel, axis=1), self.conv), 0)
+        h = np.zeros((n, self.hidden), dtype=np.float32)
+        c = np.zeros((n, self.hidden), dtype=np.float32)
+        states = np.empty((n, w, self.hidden), dtype=np.float32)
+        for step in range(w):
+            gates = np.concatenate([conv[:, step], h], axis=1) @ self.gates
+            i, f, o = (1.0 / (1.0 + np.exp(-gates[:, :3 * self.hidden]))).reshape(n, 3, self.hidden).transpose(1, 0, 2)
+            c = f * c + i * np.tanh(gates[:, 3 * self.hidden:])
+            h = o * np.tanh(c)
+            states[:, step] = h
+        return np.concatenate([conv, states], axis=-1)
+
+    def logits(self, x):
+        return _readout(self._hidden(x), self.readout)
+
+
+class BoostedTreesScorer:
+    """
+    Gradient-boosted oblivious trees, an XGBoost-style stand-in evaluated without branching
+
+    Every tree splits on one (feature, threshold) per level, so a sample's leaf is the
+    bit pattern of ``depth`` comparisons. Scoring is ``depth`` vectorized comparisons and
+    one gather for all trees, windows and patients at once. Split features and thresholds are drawn at
+    random and leaf values boosted against the reference risk score.
+    """
+
+    def __init__(self, n_trees=200, depth=4, learning_rate=0.1, seed=2):
+        rng = np.random.default_rng(seed)
+        self.features = rng.integers(0, len(FEATURES), (n_trees, depth))
+        self.thresholds = rng.normal(0.0, 1.0, (n_trees, depth)).astype(np.float32)
+        # Binary clinical flags split at 0.5 whatever was drawn
+        flags = self.features >= len(WINDOW_FEATURES) + 1
+        self.thresholds[flags] = 0.5
+        self.leaves = np.zeros((n_trees, 1 << depth), dtype=np.float32)
+        self.bias = np.float32(RISK_BIAS)
+
+        x = _training_sequences(512, 32, rng).reshape(-1, len(FEATURES))
+        residual = _reference_logits(x) - self.bias
+        leaf_index = self._leaf_index(x)
+        for tree in range(n_trees):
+            sums = np.bincount(leaf_index[tree], weights=residual, minlength=1 << depth)
+            counts = np.bincount(leaf_index[tree], minlength=1 << depth)
+            self.leaves[tree] = learning_rate * sums / np.maximum(counts, 1)
+            residual -= self.leaves[tree, leaf_index[tree]]
+
+    def _leaf_index(self, x):
+        """Leaf of every sample in every tree, as (n_trees, n_samples)"""
+        # Feature-major rows, so each level gathers whole rows rather than scattered columns
+        rows = np.ascontiguousarray(x.reshape(-1, x.shape[-1]).T)
+        leaf_index = np.zeros((len(self.leaves), rows.shape[1]), dtype=np.int32)
+        for level in range(self.features.shape[1]):
+            leaf_index += (rows[self.features[:, level]] > self.thresholds[:, level, None]) * np.int32(1 << level)
+        return leaf_index
+
+    def logits(self, x):
+        flat = self._leaf_index(x) + (np.arange(len(self.leaves), dtype=np.int32) << self.features.shape[1])[:, None]
+        return self.bias + self.leaves.ravel()[flat].sum(axis=0).reshape(x.shape[:-1])
+
+
+class RiskEngine:
+    """
+    Seizure-risk scoring and 24 h forecasting for many patients and windows in one call
+
+    ``model_type`` picks the scorer; "Ensemble" averages the log-odds of the three
+    others. Each window's log-odds is the patient's EEG state at that time; the forecast
+    for ``h`` hours ahead decays it towards the patient's clinical baseline with a
+    ``STATE_HALF_LIFE_HOURS`` half-life and adds a circadian term.
+
+    Args:
+        model_type (str): One of ``MODEL_TYPES``
+    """
+
+    def __init__(self, model_type="Transformer"):
+        if model_type not in MODEL_TYPES:
+            raise ValueError(f"Unknown model type: {model_type}")
+        self.model_type = model_type
+        scorers = {"Transformer": TransformerScorer, "CNN-LSTM": CnnLstmScorer, "XGBoost": BoostedTreesScorer}
+        names = list(scorers) if model_type == "Ensemble" else [model_type]
+        self.scorers = [scorers[name]() for name in names]
+
+    def score(self, window_features, clinical):
+        """
+        Log-odds of every window of every patient
+
+        Args:
+            window_features (np.ndarray): (n_patients, n_windows, len(WINDOW_FEATURES))
+            clinical (np.ndarray): (n_patients, len(CLINICAL_FEATURES))
+
+        Returns:
+            np.ndarray: float32 log-odds of shape (n_patients, n_windows)
+        """
+        window_features = np.asarray(window_features, dtype=np.float32)
+        n_patients, n_windows, _ = window_features.shape
+        clinical = np.broadcast_to(np.asarray(clinical, dtype=np.float32)[:, None],
+                                   (n_patients, n_windows, len(CLINICAL_FEATURES)))
+        logits = np.empty((n_patients, n_windows), dtype=np.float32)
+        for lo in range(0, n_patients, PATIENT_CHUNK):
+            hi = min(lo + PATIENT_CHUNK, n_patients)
+            x = np.concatenate([window_features[lo:hi], clinical[lo:hi]], axis=2)
+            logits[lo:hi] = np.mean([scorer.logits(x) for scorer in self.scorers], axis=0)
+        return logits
+
+    def forecast_probabilities(self, window_features, clinical, hour_of_day=0.0, hours=FORECAST_HOURS):
+        """
+        Hourly seizure probability ahead of every window, as (n_patients, n_windows, hours)
+
+        The hour ``h`` entry is the probability of a seizure during hour ``h`` from now,
+        as predicted from that window alone.
+        """
+        clinical = np.asarray(clinical, dtype=np.float32)
+        state = self.score(window_features, clinical)
+        baseline = _reference_logits(np.concatenate(
+            [np.zeros((len(clinical), len(WINDOW_FEATURES)), dtype=np.float32), clinical], axis=1))
+        ahead = np.arange(hours, dtype=np.float32)
+        decay = 0.5 ** (ahead / STATE_HALF_LIFE_HOURS)
+        circadian = CIRCADIAN_AMPLITUDE * np.cos(2 * np.pi * (hour_of_day + ahead - CIRCADIAN_PEAK_HOUR) / 24)
+        logits = (baseline[:, None, None] + (state - baseline[:, None])[..., None] * decay + circadian)
+        return 1.0 / (1.0 + np.exp(-logits))
+
+    def forecast(self, window_features, clinical, level=0.7, hour_of_day=0.0, horizon_hours=6,
+                 n_bootstrap=N_BOOTSTRAP, seed=0):
+        """
+        24 h risk forecast with bootstrap confidence intervals for every patient
+
+        The point forecast averages the per-window forecasts. The windows are resampled
+        with replacement ``n_bootstrap`` times: one ``bincount`` over all draws gives the
+        window counts of every resample, and one matrix product of those counts with the
+        per-window forecasts gives every bootstrap mean for every patient and hour at once.
+
+        Args:
+            window_features (np.ndarray): (n_patients, n_windows, len(WINDOW_FEATURES))
+            clinical (np.ndarray): (n_patients, len(CLINICAL_FEATURES))
+            level (float): Two-sided confidence level, e.g. 0.7 for the 15th-85th percentiles
+            hour_of_day (float): Clock hour of the last window, for the circadian term
+            horizon_hours (int): Hours summarized as the probability of any seizure
+            n_bootstrap (int): Bootstrap resamples
+            seed (int): Seed for the resampling
+
+        Returns:
+            dict: ``risk``, ``lower``, ``upper`` of shape (n_patients, FORECAST_HOURS), and
+                ``horizon`` (n_patients, 3) with the probability of a seizure within
+                ``horizon_hours`` and its interval
+        """
+        probs = self.forecast_probabilities(window_features, clinical, hour_of_day)
+        n_windows = probs.shape[1]
+        draws = np.random.default_rng(seed).integers(0, n_windows, (n_bootstrap, n_windows))
+        draws += n_windows * np.arange(n_bootstrap)[:, None]
+        counts = np.bincount(draws.ravel(), minlength=n_bootstrap * n_windows).reshape(n_bootstrap, n_windows)
+        boot = (counts.astype(np.float32) @ probs) / n_windows
+        boot_horizon = 1.0 - np.prod(1.0 - boot[..., :horizon_hours], axis=-1)
+        tails = [50.0 * (1.0 - level), 50.0 * (1.0 + level)]
+        lower, upper = np.percentile(boot, tails, axis=1)
+        risk = probs.mean(axis=1)
+        horizon = 1.0 - np.prod(1.0 - risk[:, :horizon_hours], axis=-1)
+        horizon_lower, horizon_upper = np.percentile(boot_horizon, tails, axis=1)
+        return {"risk": risk, "lower": lower, "upper": upper,
+                "horizon": np.column_stack([horizon, horizon_lower, horizon_upper])}
@@ -0,0 +1,189 @@
+import numpy as np
+
+# Names of the fixed-length embedding dimensions, independent of the recording's channel count
+EMBEDDING_FEATURES = (
+    [f"{band}_mean" for band in ("delta", "theta", "alpha", "beta", "gamma")]
+    + [f"{band}_spread" for band in ("delta", "theta", "alpha", "beta", "gamma")]
+    + ["log_rms_mean", "log_rms_spread", "log_line_length_mean", "log_line_length_spread",
+       "attention_mean", "attention_high_mean", "attention_high_max"]
+)
+EMBEDDING_DIM = len(EMBEDDING_FEATURES)
+
+# Cohort size above which "auto" search switches from exact to LSH
+EXACT_SEARCH_LIMIT = 50_000
+
+
+def embedding_from_summary(summary):
+    """
+    Fixed-length embedding of a recording from its per-channel summary features
+
+    Channel-wise features are reduced to their mean and spread across channels, so
+    recordings with different montages map into the same space.
+
+    Args:
+        summary (dict): ``band_power`` (n_bands, n_channels), ``rms``, ``line_length``,
+            ``attention_mean`` and ``attention_high`` (n_channels,), as written by
+            ``utils.precompute``
+
+    Returns:
+        np.ndarray: float32 vector of length ``EMBEDDING_DIM``
+    """
+    band_power = np.asarray(summary["band_power"], dtype=np.float64)
+    log_rms = np.log(np.asarray(summary["rms"], dtype=np.float64) + 1e-6)
+    log_line_length = np.log(np.asarray(summary["line_length"], dtype=np.float64) + 1e-6)
+    attention_high = np.asarray(summary["attention_high"], dtype=np.float64)
+    return np.concatenate([
+        band_power.mean(axis=1), band_power.std(axis=1),
+        [log_rms.mean(), log_rms.std(), log_line_length.mean(), log_line_length.std(),
+         float(np.mean(summary["attention_mean"])), attention_high.mean(), attention_high.max()],
+    ]).astype(np.float32)
+
+
+def synthetic_embeddings(n, n_clusters=64, seed=None, dim=EMBEDDING_DIM, centre=None, spread=1.0):
+    """
+    Clustered random embeddings with numeric case IDs from 10000, for demos and benchmarks
+
+    Args:
+        n (int): Number of cases
+        n_clusters (int): Number of cluster centres
+        seed (int): Random seed
+        dim (int): Embedding length
+        centre (np.ndarray): Optional point the cohort is scattered around
+        spread (float | np.ndarray): Scale of the cohort around ``centre``
+
+    Returns:
+        tuple: (ids of shape (n,), embeddings of shape (n, dim))
+    """
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((n_clusters, dim)).astype(np.float32)
+    members = rng.integers(0, n_clusters, n)
+    vectors = centres[members] + 0.35 * rng.standard_normal((n, dim), dtype=np.float32)
+    if centre is not None:
+        vectors = (np.asarray(centre) + np.asarray(spread) * vectors).astype(np.float32)
+    ids = 10000 + rng.permutation(n)
+    return ids.astype(str), vectors
+
+
+class SimilarityIndex:
+    """
+    Cosine top-k index over case embeddings, exact or random-projection LSH
+
+    Embeddings are standardized per dimension, so features on different scales weigh
+    equally, then L2-normalized; cosine similarity is then a matrix product. Exact search
+    scores every case in one batched matmul. LSH search hashes cases with ``n_tables``
+    sets of ``n_bits`` random hyperplanes, looks up the query's bucket and its one-bit
+    neighbours in each table with ``searchsorted`` over sorted codes, and reranks the
+    candidates exactly. Cases can be added at any time; hash tables are rebuilt lazily.
+
+    Args:
+        dim (int): Embedding length
+        n_tables (int): LSH hash tables
+        n_bits (int): Hyperplanes per table; more bits give smaller buckets, faster and lower recall
+        seed (int): Seed for the hyperplanes
+    """
+
+    def __init__(self, dim=EMBEDDING_DIM, n_tables=8, n_bits=16, seed=0):
+        self.dim = dim
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.ids = np.empty(0, dtype=str)
+        self._raw = np.empty((0, dim), dtype=np.float32)
+        self._vectors = None
+        self._tables = None
+        planes = np.random.default_rng(seed).standard_normal((n_tables * n_bits, dim)).astype(np.float32)
+        self._planes = planes
+        self._weights = (1 << np.arange(n_bits, dtype=np.int64))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, ids, embeddings):
+        """Append cases; standardization and hash tables are refreshed on the next search"""
+        embeddings = np.asarray(embeddings, dtype=np.float32).reshape(-1, self.dim)
+        self.ids = np.concatenate([self.ids, np.asarray(ids).astype(str)])
+        self._raw = np.concatenate([self._raw, embeddings])
+        self._vectors = None
+        self._tables = None
+
+    def _normalize(self, embeddings):
+        unit = (embeddings - self._mean) / self._scale
+        return unit / np.maximum(np.linalg.norm(unit, axis=-1, keepdims=True), 1e-12)
+
+    def _prepare(self):
+        if self._vectors is None:
+            self._mean = self._raw.mean(axis=0)
+            self._scale = np.maximum(self._raw.std(axis=0), 1e-6)
+            self._vectors = self._normalize(self._raw)
+        return self._vectors
+
+    def build(self):
+        """Standardize the cases and build the hash tables now rather than on the first search"""
+        self._build_tables()
+        return self
+
+    def _codes(self, vectors):
+        """Hash codes of shape (n, n_tables)"""
+        bits = (vectors @ self._planes.T > 0).reshape(len(vectors), self.n_tables, self.n_bits)
+        return bits.astype(np.int64) @ self._weights
+
+    def _build_tables(self):
+        if self._tables is None:
+            codes = self._codes(self._prepare())
+            order = np.argsort(codes, axis=0, kind="stable")
+            self._tables = (np.take_along_axis(codes, order, axis=0), order)
+        return self._tables
+
+    def _top_k(self, scores, k):
+        k = min(k, scores.shape[-1])
+        top = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+        top_scores = np.take_along_axis(scores, top, axis=-1)
+        order = np.argsort(-top_scores, axis=-1)
+        return np.take_along_axis(top, order, axis=-1), np.take_along_axis(top_scores, order, axis=-1)
+
+    def search(self, queries, k=10, mode="auto"):
+        """
+        Top-k most similar cases for each query embedding
+
+        Args:
+            queries (np.ndarray): One embedding or a batch of shape (m, dim)
+            k (int): Results per query
+            mode (str): "exact", "lsh", or "auto" (LSH above ``EXACT_SEARCH_LIMIT`` cases)
+
+        Returns:
+            tuple: (ids, cosine similarities), each of shape (m, k), best first
+        """
+        queries = np.asarray(queries, dtype=np.float32).reshape(-1, self.dim)
+        if len(self) == 0:
+            return np.empty((len(queries), 0), dtype=str), np.empty((len(queries), 0), dtype=np.float32)
+        vectors = self._prepare()
+        queries = self._normalize(queries)
+        if mode == "auto":
+            mode = "lsh" if len(self) > EXACT_SEARCH_LIMIT else "exact"
+
+        if mode == "exact":
+            rows, scores = self._top_k(queries @ vectors.T, k)
+            return self.ids[rows], scores
+
+        codes, order = self._build_tables()
+        probes = self._codes(queries)
+        flips = np.concatenate([[0], self._weights])
+        ids, sims = [], []
+        for query, probe in zip(queries, probes):
+            # The query's bucket and every bucket one bit away, in every table, gathered without a Python loop
+            keys = probe[:, None] ^ flips
+            lo = np.stack([np.searchsorted(codes[:, t], keys[t], side="left") for t in range(self.n_tables)])
+            hi = np.stack([np.searchsorted(codes[:, t], keys[t], side="right") for t in range(self.n_tables)])
+            lengths = (hi - lo).ravel()
+            starts = np.repeat(lo.ravel() - np.cumsum(lengths) + lengths, lengths)
+            positions = starts + np.arange(lengths.sum())
+            columns = np.repeat(np.arange(self.n_tables), lengths.reshape(self.n_tables, -1).sum(axis=1))
+            hit = np.zeros(len(self), dtype=bool)
+            hit[order[positions, columns]] = True
+            candidates = np.flatnonzero(hit)
+            if len(candidates) < min(k, len(self)):
+                # Too few neighbours hashed nearby; fall back to scoring every case
+                candidates = np.arange(len(self))
+            rows, scores = self._top_k(vectors[candidates] @ query, k)
+            ids.append(self.ids[candidates[rows]])
+            sims.append(scores)
+        return np.stack(ids), np.stack(sims)
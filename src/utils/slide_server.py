@@ -0,0 +1,242 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import posixpath
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, unquote
+
+# Production build of the react-slides app, from ``npm run build``
+DIST_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "react-slides", "dist"))
+
+# Port the slide decks are served on, from the ``SLIDES_PORT`` setting; the Vite dev server used the same one
+DEFAULT_PORT = 3000
+
+# Vite names built assets with a content hash, e.g. assets/index-3f9a1c2b.js, so they can be cached forever
+HASHED_ASSET = re.compile(r"^assets/.+-[A-Za-z0-9_-]{8,}\.[a-z0-9]+$")
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+
+# Text-like files worth compressing; images and fonts are already compressed
+COMPRESSIBLE = (".html", ".js", ".mjs", ".css", ".json", ".svg", ".txt", ".map")
+
+# Vite's build manifest, mapping each source module to its hashed chunk and stylesheets
+MANIFEST_FILE = ".vite/manifest.json"
+
+# Deck modules, by naming convention: the route /k99r00 renders src/grants/k99r00-slide-deck.tsx
+DECK_MODULE = re.compile(r"^src/grants/(.+)-slide-deck\.tsx$")
+
+_ASSET_REF = re.compile(r'(?:src|href)="/?(assets/[^"]+)"')
+
+
+class StaticFile:
+    """One built file held in memory with its gzip form, ETag and cache policy"""
+
+    def __init__(self, name, body):
+        self.body = body
+        self.content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        if self.content_type.startswith("text/") or self.content_type in ("application/javascript", "application/json"):
+            self.content_type += "; charset=utf-8"
+        self.etag = '"' + hashlib.sha256(self.body).hexdigest()[:16] + '"'
+        self.cache_control = IMMUTABLE_CACHE if HASHED_ASSET.match(name) else REVALIDATE_CACHE
+        self.gzipped = None
+        if name.endswith(COMPRESSIBLE) and len(self.body) > 1024:
+            compressed = gzip.compress(self.body, compresslevel=9, mtime=0)
+            if len(compressed) < len(self.body):
+                self.gzipped = compressed
+
+
+class SlideSite:
+    """
+    Every file of a built site, loaded and compressed once and reloaded when the build changes
+
+    Paths without an extension that match no file get ``index.html``, so client-side routes
+    such as /k99r00 load the single-page app. A deck route gets a copy of ``index.html``
+    that also preloads the deck's chunk and stylesheets, so they download alongside the
+    entry script instead of after it has run.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.files = {}
+        self.routes = {}
+        self.version = None
+        self._lock = threading.Lock()
+        self.refresh()
+
+    def _index_mtime(self):
+        index = os.path.join(self.root, "index.html")
+        return os.path.getmtime(index) if os.path.exists(index) else None
+
+    def refresh(self):
+        """Reload the files if ``index.html`` has changed since the last load"""
+        version = self._index_mtime()
+        if version == self.version:
+            return
+        files = {}
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                name = os.path.relpath(path, self.root).replace(os.sep, "/")
+                with open(path, "rb") as f:
+                    files[name] = StaticFile(name, f.read())
+        routes = {}
+        if "index.html" in files:
+            index = files["index.html"].body.decode("utf-8")
+            for route, (scripts, styles) in self._deck_chunks(files).items():
+                links = "".join(f'<link rel="modulepreload" crossorigin href="/{name}">' for name in scripts)
+                links += "".join(f'<link rel="stylesheet" crossorigin href="/{name}">' for name in styles)
+                routes[route] = StaticFile("index.html", index.replace("</head>", links + "</head>", 1).encode("utf-8"))
+        with self._lock:
+            self.files, self.routes, self.version = files, routes, version
+
+    @staticmethod
+    def _deck_chunks(files):
+        """Scripts and stylesheets of each deck route, with the chunks they import, from the build manifest"""
+        if MANIFEST_FILE not in files:
+            return {}
+        manifest = json.loads(files[MANIFEST_FILE].body)
+
+        def collect(key, scripts, styles):
+            chunk = manifest.get(key)
+            if chunk is None or chunk.get("isEntry") or chunk["file"] in scripts:
+                return
+            scripts.append(chunk["file"])
+            styles.extend(name for name in chunk.get("css", []) if name not in styles)
+            for imported in chunk.get("imports", []):
+                collect(imported, scripts, styles)
+
+        chunks = {}
+        for key in manifest:
+            match = DECK_MODULE.match(key)
+            if match:
+                scripts, styles = [], []
+                collect(key, scripts, styles)
+                chunks[match.group(1)] = (scripts, styles)
+        return chunks
+
+    @property
+    def available(self):
+        return "index.html" in self.files
+
+    def lookup(self, url_path):
+        name = posixpath.normpath(unquote(url_path)).lstrip("/")
+        if name in ("", "."):
+            name = "index.html"
+        static = self.files.get(name)
+        if static is None and not posixpath.splitext(name)[1]:
+            static = self.routes.get(name.split("/")[0], self.files.get("index.html"))
+        return static
+
+    def assets(self, route=None):
+        """Scripts and stylesheets the page of a route loads up front"""
+        page = self.routes.get(route) or self.files.get("index.html")
+        if page is None:
+            return []
+        return sorted(set(_ASSET_REF.findall(page.body.decode("utf-8", "replace"))))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    site = None
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as separate writes; with Nagle's algorithm the body waits for a delayed ACK
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, head_only):
+        static = self.site.lookup(urlsplit(self.path).path)
+        if static is None:
+            self.send_error(404)
+            return
+        if self.headers.get("If-None-Match") == static.etag:
+            self.send_response(304)
+            self.send_header("ETag", static.etag)
+            self.send_header("Cache-Control", static.cache_control)
+            self.end_headers()
+            return
+
+        body = static.body
+        self.send_response(200)
+        if static.gzipped is not None:
+            self.send_header("Vary", "Accept-Encoding")
+            if "gzip" in self.headers.get("Accept-Encoding", ""):
+                body = static.gzipped
+                self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Type", static.content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", static.etag)
+        self.send_header("Cache-Control", static.cache_control)
+        self.end_headers()
+        if not head_only:
+            self.wfile.write(body)
+
+    def do_GET(self):
+        self._send(head_only=False)
+
+    def do_HEAD(self):
+        self._send(head_only=True)
+
+
+class SlideServer:
+    """
+    Static server for the react-slides production build, on a thread of the dashboard process
+
+    Replaces the Vite dev server: files are served from memory, gzip-compressed when the
+    client accepts it, hashed assets with a one-year immutable cache and everything else
+    revalidated by ETag. The page of a deck preloads that deck's chunk, and once shown it
+    fetches the other decks while idle, so switching decks downloads only the new page.
+
+    Args:
+        root (str): Built site directory
+        host (str): Interface to listen on
+        port (int): Port to listen on; 0 picks a free one
+    """
+
+    def __init__(self, root=DIST_DIR, host="0.0.0.0", port=DEFAULT_PORT):
+        self.site = SlideSite(root)
+        handler = type("SlideHandler", (_Handler,), {"site": self.site})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="slide-server", daemon=True)
+        self._thread.start()
+
+    def url(self, route="", base=None):
+        """Address of a route for the browser; ``base`` overrides ``http://localhost:<port>``, e.g. behind a proxy"""
+        return f"{(base or f'http://localhost:{self.port}').rstrip('/')}/{route}"
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+# Running servers by (root, port); created under the lock so two sessions never both bind the port
+_servers = {}
+_servers_lock = threading.Lock()
+
+
+def _slide_server(root, port):
+    with _servers_lock:
+        server = _servers.get((root, port))
+        if server is None:
+            server = _servers[(root, port)] = SlideServer(root, port=port)
+        return server
+
+
+def slide_server():
+    """
+    Server for the built grant slide decks, started once per process on ``SLIDES_PORT`` (default 3000)
+
+    Returns None when react-slides has not been built with ``npm run build``. Raises OSError
+    when the port is taken, e.g. by a Vite dev server still running.
+    """
+    if not os.path.exists(os.path.join(DIST_DIR, "index.html")):
+        return None
+    server = _slide_server(DIST_DIR, int(os.environ.get("SLIDES_PORT", DEFAULT_PORT)))
+    server.site.refresh()
+    return server
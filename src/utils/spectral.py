@@ -0,0 +1,86 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Classical EEG frequency bands in Hz, [low, high)
+BANDS = {
+    "delta": (0.5, 4.0),
+    "theta": (4.0, 8.0),
+    "alpha": (8.0, 13.0),
+    "beta": (13.0, 30.0),
+    "gamma": (30.0, 45.0),
+}
+
+# Number of window samples transformed per rfft batch; bounds the frame and spectrum temporaries
+CHUNK_ELEMENTS = 1 << 23
+
+
+def band_matrix(n_fft, sample_rate, bands=BANDS):
+    """
+    (n_freqs, n_bands) matrix summing rfft bins into bands
+
+    Each column holds the frequency resolution on the bins inside its band, so multiplying
+    a power spectral density by it integrates the PSD over every band at once.
+    """
+    freqs = np.fft.rfftfreq(n_fft, d=1.0 / sample_rate)
+    matrix = np.zeros((len(freqs), len(bands)), dtype=np.float32)
+    for column, (low, high) in enumerate(bands.values()):
+        matrix[(freqs >= low) & (freqs < high), column] = sample_rate / n_fft
+    return matrix
+
+
+def band_powers(eeg_data, sample_rate, hop=0.2, window=1.0, bands=BANDS, dtype=np.float32):
+    """
+    Band powers of every channel over sliding windows aligned with the attention bins
+
+    Window ``k`` is centred on the middle of bin ``k`` (``[k * hop, (k + 1) * hop)``), with
+    the recording edges reflected, so the result has exactly one column per attention bin
+    and can be overlaid on the heatmap. Windows are a strided view of the signal, so they
+    are never copied before the Hann taper; each batch of windows goes through one
+    ``np.fft.rfft`` call and one matrix product with ``band_matrix``.
+
+    Args:
+        eeg_data (np.ndarray): Samples of shape (n_channels, n_samples)
+        sample_rate (float): Samples per second
+        hop (float): Seconds between windows, the attention bin width
+        window (float): Window length in seconds; sets the frequency resolution
+        bands (dict): Band name -> (low, high) in Hz
+        dtype: Output dtype
+
+    Returns:
+        np.ndarray: Band powers of shape (n_bands, n_channels, n_windows), in signal units squared
+    """
+    hop_samples = int(round(hop * sample_rate))
+    win_samples = int(round(window * sample_rate))
+    n_channels, n_samples = eeg_data.shape
+    n_windows = n_samples // hop_samples
+    powers = np.empty((len(bands), n_channels, n_windows), dtype=dtype)
+    if n_windows == 0:
+        return powers
+
+    # Reflect-pad so the first and last windows are centred on their bins
+    left = (win_samples - hop_samples) // 2
+    right = max(0, (n_windows - 1) * hop_samples + win_samples - left - n_samples)
+    padded = np.pad(np.asarray(eeg_data, dtype=np.float32), ((0, 0), (left, right)), mode="reflect")
+    frames = sliding_window_view(padded, win_samples, axis=1)[:, ::hop_samples][:, :n_windows]
+
+    # Hann taper with Welch's density scaling; one-sided spectrum doubles all but DC and Nyquist
+    taper = np.hanning(win_samples).astype(np.float32)
+    scale = np.full(win_samples // 2 + 1, 2.0 / (sample_rate * np.sum(taper ** 2)), dtype=np.float32)
+    scale[0] /= 2
+    if win_samples % 2 == 0:
+        scale[-1] /= 2
+    matrix = band_matrix(win_samples, sample_rate, bands) * scale[:, None]
+
+    step = max(1, CHUNK_ELEMENTS // (n_channels * win_samples))
+    for lo in range(0, n_windows, step):
+        hi = min(lo + step, n_windows)
+        spectrum = np.fft.rfft(frames[:, lo:hi] * taper, axis=-1)
+        psd = spectrum.real ** 2 + spectrum.imag ** 2
+        powers[:, :, lo:hi] = np.moveaxis(psd.astype(np.float32) @ matrix, -1, 0)
+    return powers
+
+
+def relative_band_powers(powers):
+    """Each band's share of the total power across bands, per channel and window"""
+    total = powers.sum(axis=0, keepdims=True)
+    return powers / np.where(total > 0, total, 1)
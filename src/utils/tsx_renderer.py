@@ -1,26 +1,175 @@
 import streamlit as st
 import streamlit.components.v1 as components
+import hashlib
 import os
 import json
+import shutil
+import subprocess
+import tempfile
 
-def render_tsx_component(tsx_file_path):
+from utils.cache import lru_cached
+
+# The react-slides project; its node_modules provide esbuild (a Vite dependency), React and Tailwind
+SLIDES_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "react-slides"))
+
+# Compiled bundles, named by deck and content hash
+BUNDLE_CACHE_DIR = os.path.join(SLIDES_DIR, ".bundle-cache")
+
+# Bump to invalidate every cached bundle when the build recipe changes
+BUNDLE_VERSION = 1
+
+# Seconds a single esbuild or Tailwind run may take
+BUILD_TIMEOUT = 120
+
+# Entry module rendering a deck's default export with the production React it is bundled with
+_ENTRY = """import React from "react";
+import {{ createRoot }} from "react-dom/client";
+import Deck from {path};
+createRoot(document.getElementById("root")).render(React.createElement(Deck));
+"""
+
+# Tailwind v4 through the project's PostCSS plugin, limited to the classes one deck uses
+_TAILWIND = """
+const postcss = require("postcss");
+const tailwind = require("@tailwindcss/postcss");
+const [from, source] = process.argv.slice(1);
+const css = `@import "tailwindcss" source(none);\\n@source ${JSON.stringify(source)};\\n`;
+postcss([tailwind({ optimize: { minify: true } })]).process(css, { from })
+  .then((result) => process.stdout.write(result.css))
+  .catch((error) => { console.error(error.message); process.exit(1); });
+"""
+
+
+class BundleError(RuntimeError):
+    """Raised when a deck cannot be compiled, e.g. because react-slides has no node_modules"""
+
+
+def _esbuild():
+    local = os.path.join(SLIDES_DIR, "node_modules", ".bin", "esbuild")
+    return local if os.path.exists(local) else shutil.which("esbuild")
+
+
+def _run(args, stdin=None):
+    try:
+        result = subprocess.run(args, input=stdin, cwd=SLIDES_DIR, capture_output=True, text=True,
+                                timeout=BUILD_TIMEOUT)
+    except (OSError, subprocess.TimeoutExpired) as exc:
+        raise BundleError(f"{os.path.basename(args[0])} failed: {exc}") from exc
+    if result.returncode != 0:
+        raise BundleError(f"{os.path.basename(args[0])} failed: {result.stderr.strip()[-2000:]}")
+    return result.stdout
+
+
+def bundle_key(tsx_file_path):
     """
-    Renders a TSX React component in Streamlit using streamlit.components.v1
+    Content hash of a deck and of the toolchain that compiles it
 
-    This function takes a path to a TSX file and renders it in the Streamlit app.
-    It uses a simple HTML wrapper with React and ReactDOM loaded from CDN.
+    The lock file pins React, esbuild and Tailwind, so upgrading any of them, or editing
+    the deck, gives a new key and a fresh bundle.
+    """
+    digest = hashlib.sha256(f"v{BUNDLE_VERSION}".encode())
+    with open(tsx_file_path, "rb") as f:
+        digest.update(f.read())
+    lock_file = os.path.join(SLIDES_DIR, "package-lock.json")
+    if os.path.exists(lock_file):
+        with open(lock_file, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
 
-    Args:
-        tsx_file_path (str): Path to the TSX file to render
+
+def _write_atomic(path, text):
+    # A temp name of its own, so builds of the same deck in other sessions never write into it
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=os.path.dirname(path),
+                                     prefix=os.path.basename(path) + ".", suffix=".tmp", delete=False) as f:
+        f.write(text)
+    os.replace(f.name, path)
+
+
+def _stale_bundles(stem, key):
+    """Cached JS and CSS files of other versions of a deck; temp files of running builds are left alone"""
+    for name in os.listdir(BUNDLE_CACHE_DIR):
+        if not name.startswith(stem + "."):
+            continue
+        other, ext = os.path.splitext(name[len(stem) + 1:])
+        if ext in (".js", ".css") and "." not in other and other != key:
+            yield os.path.join(BUNDLE_CACHE_DIR, name)
+
+
+def build_bundle(tsx_file_path):
+    """
+    Minified JS and CSS of a deck, compiled once per content hash and kept on disk
+
+    The deck is bundled by esbuild with production React into one IIFE that mounts it
+    on ``#root``, and its Tailwind classes are compiled into a minified stylesheet, so
+    the page needs no CDN and no in-browser transpilation. Bundles of older versions of
+    the deck are deleted.
 
     Returns:
-        None: The component is rendered directly in the Streamlit app
+        tuple: (js, css) source text
+
+    Raises:
+        BundleError: When esbuild, React or Tailwind are not installed under react-slides
     """
-    # Check if file exists
-    if not os.path.exists(tsx_file_path):
-        st.error(f"TSX file not found: {tsx_file_path}")
-        return
+    stem = os.path.splitext(os.path.basename(tsx_file_path))[0]
+    key = bundle_key(tsx_file_path)
+    js_path = os.path.join(BUNDLE_CACHE_DIR, f"{stem}.{key}.js")
+    css_path = os.path.join(BUNDLE_CACHE_DIR, f"{stem}.{key}.css")
+
+    if not (os.path.exists(js_path) and os.path.exists(css_path)):
+        esbuild = _esbuild()
+        if esbuild is None:
+            raise BundleError("esbuild not found; run 'npm install' in react-slides")
+        os.makedirs(BUNDLE_CACHE_DIR, exist_ok=True)
+        source = os.path.abspath(tsx_file_path)
+        js = _run([esbuild, "--bundle", "--minify", "--format=iife", "--target=es2018", "--legal-comments=none",
+                   "--loader=js", "--sourcefile=entry.js", f"--resolve-dir={SLIDES_DIR}",
+                   '--define:process.env.NODE_ENV="production"'],
+                  stdin=_ENTRY.format(path=json.dumps(source)))
+        css = _run(["node", "-e", _TAILWIND, "--", os.path.join(SLIDES_DIR, "src", "index.css"), source])
+        for stale in _stale_bundles(stem, key):
+            try:
+                os.remove(stale)
+            except FileNotFoundError:
+                # Another session's build of the deck removed it first
+                pass
+        _write_atomic(js_path, js)
+        _write_atomic(css_path, css)
+
+    with open(js_path, encoding="utf-8") as f:
+        js = f.read()
+    with open(css_path, encoding="utf-8") as f:
+        css = f.read()
+    return js, css
+
+
+@lru_cached(maxsize=8, name="tsx_bundles")
+def _bundle_html(tsx_file_path, mtime_ns, size):
+    js, css = build_bundle(tsx_file_path)
+    # A closing tag inside the bundle's strings would end the inline script early
+    js = js.replace("</script", "<\\/script")
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<style>body {{ margin: 0; padding: 0; }}</style>
+<style>{css}</style>
+</head>
+<body>
+<div id="root"></div>
+<script>{js}</script>
+</body>
+</html>"""
 
+
+def bundle_html(tsx_file_path):
+    """Self-contained HTML page of a compiled deck, cached in memory until the file changes"""
+    stat = os.stat(tsx_file_path)
+    return _bundle_html(os.path.abspath(tsx_file_path), stat.st_mtime_ns, stat.st_size)
+
+
+def _babel_html(tsx_file_path):
+    """Page transpiling the deck in the browser, for when react-slides has not been installed"""
     # Get the component name from the file path
     file_name = os.path.basename(tsx_file_path)
     component_name = os.path.splitext(file_name)[0].replace('-', '')
@@ -38,14 +187,14 @@ def render_tsx_component(tsx_file_path):
         tsx_content = f.read()
 
     # Create HTML with React and Tailwind CSS
-    html_content = f"""
+    return f"""
     <!DOCTYPE html>
     <html>
     <head>
         <meta charset="UTF-8">
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <script src="https://unpkg.com/react@17/umd/react.development.js"></script>
-        <script src="https://unpkg.com/react-dom@17/umd/react-dom.development.js"></script>
+        <script src="https://unpkg.com/react@17/umd/react.production.min.js"></script>
+        <script src="https://unpkg.com/react-dom@17/umd/react-dom.production.min.js"></script>
         <script src="https://unpkg.com/@babel/standalone/babel.min.js"></script>
         <script src="https://cdn.tailwindcss.com"></script>
         <style>
@@ -67,5 +216,32 @@ def render_tsx_component(tsx_file_path):
     </html>
     """
 
+
+def render_tsx_component(tsx_file_path):
+    """
+    Renders a TSX React component in Streamlit using streamlit.components.v1
+
+    The component is precompiled with production React into a minified bundle, cached
+    on disk by content hash and in memory by modification time, and inlined into the
+    page, so it renders without CDN access or in-browser transpilation. Without the
+    react-slides toolchain it falls back to transpiling in the browser from CDN scripts.
+
+    Args:
+        tsx_file_path (str): Path to the TSX file to render
+
+    Returns:
+        None: The component is rendered directly in the Streamlit app
+    """
+    # Check if file exists
+    if not os.path.exists(tsx_file_path):
+        st.error(f"TSX file not found: {tsx_file_path}")
+        return
+
+    try:
+        html_content = bundle_html(tsx_file_path)
+    except BundleError as exc:
+        st.caption(f"Slide bundle unavailable ({exc}); transpiling in the browser instead.")
+        html_content = _babel_html(tsx_file_path)
+
     # Render the HTML using streamlit.components.v1
     components.html(html_content, height=800, scrolling=True)
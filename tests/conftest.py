@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Make the dashboard's utils and panels packages importable, as the app does from src
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
@@ -0,0 +1,74 @@
+import json
+import os
+import time
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from utils.edf_reader import write_edf
+from utils.eeg_generator import generate_eeg_batch
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """An empty DATA_PATH, with the app run from src as run_dashboard.sh does"""
+    monkeypatch.setenv("DATA_PATH", str(tmp_path))
+    monkeypatch.chdir(SRC_DIR)
+    return tmp_path
+
+
+def test_edf_recording_renders_a_window(data_dir):
+    channels = ['Fp1', 'Fp2', 'C3', 'C4']
+    (data_dir / "edf").mkdir()
+    _, data = generate_eeg_batch(channels, 120, seed=3)
+    write_edf(str(data_dir / "edf" / "short.edf"), data, channels, 250)
+
+    at = AppTest.from_file(os.path.join(SRC_DIR, "app.py"), default_timeout=300)
+    at.run()
+    recording = next(box for box in at.selectbox if box.label == "Recording")
+    assert os.path.join("edf", "short.edf") in recording.options
+    recording.set_value(os.path.join("edf", "short.edf")).run()
+
+    assert not at.exception, [e.value for e in at.exception]
+    eeg = [chart for chart in at.get("plotly_chart") if '"Fp1"' in chart.proto.spec]
+    assert eeg, "no EEG chart rendered for the EDF recording"
+
+
+def _heatmap(at):
+    """Spec of the attention map, the only chart coloured by attention score"""
+    return next(chart.proto.spec for chart in at.get("plotly_chart") if "Attention Score" in chart.proto.spec)
+
+
+def _highlights(at):
+    """Highlight shapes of the EEG chart, the one chart with a trace per channel"""
+    spec = next(chart.proto.spec for chart in at.get("plotly_chart") if '"name":"Fp1"' in chart.proto.spec)
+    return json.loads(spec)["layout"].get("shapes", [])
+
+
+def _wait_for_jobs(kind, timeout=300):
+    from utils.dashboard_data import job_manager
+    from utils.jobs import FINAL_STATES
+
+    deadline = time.time() + timeout
+    while any(job["kind"] == kind and job["status"] not in FINAL_STATES for job in job_manager().jobs(limit=50)):
+        assert time.time() < deadline, f"{kind} jobs still running"
+        time.sleep(0.5)
+
+
+def test_attention_map_switches_to_the_model_once_its_job_finishes(data_dir):
+    at = AppTest.from_file(os.path.join(SRC_DIR, "app.py"), default_timeout=300)
+    at.run()
+    next(box for box in at.selectbox if box.label == "Time Window").set_value("Last 30 minutes").run()
+    fallback = _heatmap(at)
+
+    _wait_for_jobs("inference")
+    at.run()
+    assert not at.exception, [e.value for e in at.exception]
+    fresh = AppTest.from_file(os.path.join(SRC_DIR, "app.py"), default_timeout=300)
+    fresh.run()
+    next(box for box in fresh.selectbox if box.label == "Time Window").set_value("Last 30 minutes").run()
+    assert _heatmap(at) != fallback
+    assert _heatmap(at) == _heatmap(fresh)
+    assert _highlights(at) == _highlights(fresh)
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.correlation import COHORT_FEATURES, STATISTICS, CohortFile, CorrelationAccumulator, synthetic_cohort_chunks
+
+
+def _rows(n, seed):
+    return np.concatenate(list(synthetic_cohort_chunks(n, 500, seed=seed)))
+
+
+def _write(path, rows, mode="w", header=True):
+    pd.DataFrame(rows, columns=COHORT_FEATURES).assign(Notes="x").to_csv(path, mode=mode, header=header, index=False)
+
+
+def _full(rows, edges_from):
+    """Accumulator over every row at once, with the bin edges the file's first chunk fixed"""
+    accumulator = edges_from.copy_layout()
+    return accumulator.update(rows)
+
+
+@pytest.fixture
+def cohort(tmp_path):
+    path = tmp_path / "cohort_features.csv"
+    rows = _rows(2000, seed=0)
+    _write(path, rows)
+    cohort = CohortFile(str(path), chunk_bytes=16 << 10)
+    assert cohort.update() == len(rows)
+    return path, rows, cohort
+
+
+def test_appended_rows_are_folded_in(cohort):
+    path, rows, cohort = cohort
+    offset = cohort.offset
+    new = _rows(300, seed=1)
+    _write(path, new, mode="a", header=False)
+
+    assert cohort.update() == len(new)
+    assert cohort.rebuilds == 0 and cohort.offset > offset
+    expected = _full(np.concatenate([rows, new]), cohort.accumulator)
+    for statistic in STATISTICS:
+        matrix, count = cohort.matrix(statistic)
+        assert count == len(rows) + len(new)
+        np.testing.assert_allclose(matrix, expected.matrix(statistic), atol=1e-9)
+
+
+def test_unchanged_file_reads_nothing(cohort):
+    _, _, cohort = cohort
+    assert cohort.update() == 0
+
+
+def test_partial_line_waits_for_its_newline(cohort):
+    path, rows, cohort = cohort
+    with open(path, "a") as f:
+        f.write("50,1,3")
+    assert cohort.update() == 0
+    with open(path, "a") as f:
+        f.write(",0,0.8,2.5,x\n")
+    assert cohort.update() == 1
+    assert cohort.count == len(rows) + 1
+
+
+def test_rewritten_file_is_rebuilt(cohort):
+    path, _, cohort = cohort
+    rows = _rows(2500, seed=2)
+    _write(path, rows)
+    assert cohort.update() == len(rows)
+    assert cohort.rebuilds == 1 and cohort.count == len(rows)
+    np.testing.assert_allclose(cohort.matrix("Pearson Correlation")[0],
+                               CorrelationAccumulator().update(rows).pearson(), atol=1e-9)
@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from utils.edf_reader import EDFReader, write_edf
+from utils.eeg_generator import generate_eeg_batch, recurring_artifacts
+
+CHANNELS = ['Fp1', 'Fp2', 'F3', 'F4']
+
+
+@pytest.fixture
+def edf_plus(tmp_path):
+    """A 10-minute EDF+ file with recurring artifact annotations, and the data and events written"""
+    events = recurring_artifacts(600, every=60.0)
+    _, data = generate_eeg_batch(CHANNELS, 600, seed=1, artifacts=events)
+    path = str(tmp_path / "round_trip.edf")
+    write_edf(path, data, CHANNELS, 250, annotations=events)
+    return path, data, events
+
+
+def test_round_trip_within_one_quantization_step(edf_plus):
+    path, data, _ = edf_plus
+    with EDFReader(path) as reader:
+        assert reader.channels == CHANNELS
+        assert reader.sample_rate == 250
+        assert reader.is_edf_plus
+        _, decoded = reader.read_window(0, reader.duration)
+        steps = np.array([s["gain"] for s in reader.signals[:len(CHANNELS)]])[:, None]
+        assert decoded.shape == data.shape
+        assert (np.abs(decoded - data) / steps).max() <= 1.0
+
+
+def test_streamed_blocks_match_window(edf_plus):
+    path, _, _ = edf_plus
+    with EDFReader(path) as reader:
+        _, decoded = reader.read_window(0, reader.duration)
+        streamed = np.concatenate([block for _, block in reader.iter_blocks(block_seconds=7)], axis=1)
+        assert np.array_equal(streamed, decoded)
+
+
+def test_annotations_survive(edf_plus):
+    path, _, events = edf_plus
+    with EDFReader(path) as reader:
+        assert [a["start"] for a in reader.annotations] == [e["start"] for e in events]
+        assert [a["kind"] for a in reader.annotations] == [e["kind"] for e in events]
+
+
+def test_plain_edf_has_no_annotations(tmp_path):
+    _, data = generate_eeg_batch(CHANNELS, 20, seed=2)
+    path = str(tmp_path / "plain.edf")
+    write_edf(path, data, CHANNELS, 250)
+    with EDFReader(path) as reader:
+        assert not reader.is_edf_plus
+        assert reader.annotations == []
+        assert reader.n_samples == data.shape[1]
+
+
+def test_sample_range_clamps_to_the_recording(edf_plus):
+    path, data, _ = edf_plus
+    with EDFReader(path) as reader:
+        n = data.shape[1]
+        assert reader.sample_range(10, 2) == (2500, 3000)
+        assert reader.sample_range(-5, 2) == (0, 500)
+        assert reader.sample_range(reader.duration - 1, 10) == (n - 250, n)
+        assert reader.sample_range(reader.duration + 5, 10) == (n, n)
+        assert reader.read_samples(*reader.sample_range(reader.duration + 5, 10)).shape == (len(CHANNELS), 0)
+
+
+@pytest.fixture
+def edf_discontinuous(tmp_path):
+    """An EDF+D file of two 10 s segments, the second starting at 30 s, and the data written"""
+    _, data = generate_eeg_batch(CHANNELS, 20, seed=3)
+    path = str(tmp_path / "gapped.edf")
+    write_edf(path, data, CHANNELS, 250, record_onsets=[*range(10), *range(30, 40)])
+    return path, data
+
+
+def test_discontinuous_windows_follow_record_onsets(edf_discontinuous):
+    path, data = edf_discontinuous
+    with EDFReader(path) as reader:
+        assert reader.is_discontinuous
+        assert reader.duration == 40
+        assert reader.sample_range(5, 2) == (1250, 1750)
+        assert reader.sample_range(32, 2) == (3000, 3500)
+        # A window running into the gap stops at it; one starting in the gap begins after it
+        assert reader.sample_range(8, 10) == (2000, 2500)
+        assert reader.sample_range(20, 12) == (2500, 3000)
+        times, samples = reader.read_window(30.5, 1)
+        assert times[0] == 30.5 and times[-1] == 31.5 - 1 / 250
+        assert samples.shape == (len(CHANNELS), 250)
+        blocks = list(reader.iter_blocks(block_seconds=5, start=32.5, stop=38))
+        assert [onset for onset, _ in blocks] == [32.0, 37.0]
+        assert sum(block.shape[1] for _, block in blocks) == 6 * 250
+
+
+def test_unscaled_samples_are_stored_values(edf_discontinuous):
+    path, _ = edf_discontinuous
+    with EDFReader(path) as reader:
+        _, digital = reader.read_window(32, 2, scaled=False)
+        _, physical = reader.read_window(32, 2)
+        assert digital.dtype == np.int16
+        gains = np.array([s["gain"] for s in reader.signals[:len(CHANNELS)]], dtype=np.float32)[:, None]
+        offsets = np.array([s["offset"] for s in reader.signals[:len(CHANNELS)]], dtype=np.float32)[:, None]
+        assert np.allclose(digital * gains + offsets, physical, atol=1e-3)
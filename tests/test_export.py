@@ -0,0 +1,18 @@
+import importlib.util
+
+from utils import export
+from utils.export import EXPORT_FORMATS, EXPORT_REQUIREMENTS, available_export_formats
+
+
+def test_formats_without_their_package_are_not_offered(monkeypatch):
+    monkeypatch.setitem(EXPORT_REQUIREMENTS, "DICOM", "no_such_package_for_dicom")
+    formats = available_export_formats()
+    assert "DICOM" not in formats
+    assert {"CSV", "JSON", "NPZ", "PDF Report"} <= set(formats)
+
+
+def test_every_format_is_offered_when_its_package_is_installed():
+    expected = [name for name in EXPORT_FORMATS
+                if importlib.util.find_spec(EXPORT_REQUIREMENTS.get(name, "json")) is not None]
+    assert available_export_formats() == expected
+    assert set(EXPORT_REQUIREMENTS) <= set(EXPORT_FORMATS) == set(export._WRITERS)
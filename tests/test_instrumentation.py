@@ -0,0 +1,26 @@
+import tracemalloc
+
+import numpy as np
+
+from utils.instrumentation import reset, section_stats, timed
+
+
+def test_nested_sections_keep_the_outer_memory_peak():
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        reset()
+        with timed("test.outer"):
+            buffer = np.ones(4_000_000, dtype=np.uint8)
+            del buffer
+            with timed("test.inner"):
+                pass
+    finally:
+        if started:
+            tracemalloc.stop()
+
+    stats = {row["section"]: row for row in section_stats()}
+    assert stats["test.outer"]["peak_mb"] >= 4
+    assert "peak_mb" not in stats["test.inner"]
+    reset()
@@ -0,0 +1,55 @@
+import pandas as pd
+import pytest
+
+from utils.patient_registry import PatientRegistry, synthetic_patients
+
+IDS = ["MRN-00A1", "MRN-00A12", "mrn-00b7", "ab.1234", "28791"]
+
+
+@pytest.fixture
+def registry():
+    frame = pd.concat([synthetic_patients(2000, seed=0), synthetic_patients(len(IDS), seed=1).assign(patient_id=IDS)],
+                      ignore_index=True)
+    return PatientRegistry.from_frame(frame)
+
+
+def _ids(registry, query):
+    records, _ = registry.search(query)
+    return [record["patient_id"] for record in records]
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("MRN-00A1", "MRN-00A1"),
+    ("mrn-00a1", "MRN-00A1"),
+    ("mrn00a1", "MRN-00A1"),
+    ("MRN-00B7", "mrn-00b7"),
+    ("AB.1234", "ab.1234"),
+    ("28791", "28791"),
+])
+def test_exact_id_ranks_first_whatever_the_case_and_punctuation(registry, query, expected):
+    assert _ids(registry, query)[0] == expected
+
+
+def test_id_prefix_and_later_word_prefix(registry):
+    assert _ids(registry, "MRN-00") == ["MRN-00A1", "mrn-00b7", "MRN-00A12"]
+    assert _ids(registry, "00a") == ["MRN-00A1", "MRN-00A12"]
+    assert _ids(registry, "1234") == ["ab.1234"]
+
+
+def test_mistyped_id_matches_by_trigrams(registry):
+    assert _ids(registry, "mrn-00a2")[0] in ("MRN-00A1", "MRN-00A12")
+    assert "ab.1234" in _ids(registry, "ab1235")
+
+
+def test_ids_added_after_loading_are_found(registry):
+    registry.add({"patient_id": "XY-77Z", "status": "Discharged"})
+    assert _ids(registry, "xy-77z") == ["XY-77Z"]
+    assert _ids(registry, "77Z") == ["XY-77Z"]
+    assert registry.get("XY-77Z")["status"] == "Discharged"
+
+
+def test_get_and_update_use_the_stored_id(registry):
+    registry.update("MRN-00A1", age=40)
+    assert registry.get("MRN-00A1")["age"] == 40
+    assert registry.get("mrn-00a1") is None
+    assert _ids(registry, "MRN-00A1")[0] == "MRN-00A1"
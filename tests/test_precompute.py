@@ -0,0 +1,39 @@
+import os
+
+import numpy as np
+
+from utils.edf_reader import write_edf
+from utils.eeg_generator import generate_eeg_batch
+from utils.precompute import artifact_path, discover_recordings, load_manifest, recording_key, run_precompute
+from utils.recording_store import convert_synthetic_recording
+
+CHANNELS = ['Fp1', 'Fp2', 'F3', 'F4']
+
+
+def _write(path, seed):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    _, data = generate_eeg_batch(CHANNELS, 60, seed=seed)
+    write_edf(path, data, CHANNELS, 250)
+
+
+def test_same_named_recordings_keep_separate_artifacts(tmp_path):
+    root = str(tmp_path)
+    _write(os.path.join(root, "edf", "a", "night1.edf"), seed=1)
+    _write(os.path.join(root, "edf", "b", "night1.edf"), seed=2)
+    _write(os.path.join(root, "patient_1.edf"), seed=3)
+    convert_synthetic_recording(os.path.join(root, "patient_1"), CHANNELS, 60, seed=4)
+
+    paths = discover_recordings(root)
+    assert len(paths) == 4
+    assert len({recording_key(root, path) for path in paths}) == 4
+    assert len({artifact_path(root, path) for path in paths}) == 4
+
+    manifest = run_precompute(root, workers=1, log=lambda line: None)
+    assert sorted(manifest) == sorted(recording_key(root, path) for path in paths)
+    assert all(entry["status"] == "done" for entry in manifest.values())
+    powers = [np.load(artifact_path(root, path))["band_powers"] for path in paths]
+    assert not any(np.array_equal(powers[0], other) for other in powers[1:])
+
+    assert load_manifest(root) == manifest
+    run_precompute(root, workers=1, log=lambda line: None)
+    assert load_manifest(root) == manifest
@@ -0,0 +1,32 @@
+import os
+
+import numpy as np
+
+from utils.eeg_generator import generate_eeg_batch
+from utils.pyramid import PyramidIndex
+from utils.recording_store import write_recording
+
+CHANNELS = ['Fp1', 'Fp2', 'F3', 'F4']
+
+
+def test_update_overwrites_rows_left_by_an_interrupted_update(tmp_path):
+    _, data = generate_eeg_batch(CHANNELS, 120, seed=5)
+    half = write_recording(str(tmp_path / "half"), data[:, :data.shape[1] // 2], CHANNELS, 250)
+    full = write_recording(str(tmp_path / "full"), data, CHANNELS, 250)
+
+    resumed = PyramidIndex(str(tmp_path / "resumed"), len(CHANNELS), 250)
+    resumed.update(half)
+    # An update that wrote level rows but died before saving the header
+    for level in range(len(resumed.levels)):
+        with open(os.path.join(resumed.path, f"level_{level}.raw"), "ab") as f:
+            f.write(np.full((7, 3, len(CHANNELS)), np.nan, dtype="<f4").tobytes())
+    resumed = PyramidIndex(resumed.path, len(CHANNELS), 250)
+    resumed.update(full)
+
+    fresh = PyramidIndex(str(tmp_path / "fresh"), len(CHANNELS), 250)
+    fresh.update(full)
+    assert resumed.levels == fresh.levels
+    for level in range(len(fresh.levels)):
+        assert np.array_equal(resumed.level_stats(level), fresh.level_stats(level))
+        assert (os.path.getsize(os.path.join(resumed.path, f"level_{level}.raw"))
+                == os.path.getsize(os.path.join(fresh.path, f"level_{level}.raw")))
@@ -0,0 +1,39 @@
+import socket
+import threading
+import urllib.request
+
+from utils.slide_server import _slide_server
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_concurrent_sessions_share_one_server(tmp_path):
+    (tmp_path / "index.html").write_text("<html><head></head><body>slides</body></html>")
+    port = _free_port()
+    barrier = threading.Barrier(8)
+    servers, errors = [], []
+
+    def start():
+        barrier.wait()
+        try:
+            servers.append(_slide_server(str(tmp_path), port))
+        except OSError as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=start) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    try:
+        assert errors == []
+        assert len({id(server) for server in servers}) == 1
+        with urllib.request.urlopen(servers[0].url("k99r00")) as response:
+            assert b"slides" in response.read()
+    finally:
+        servers[0].stop()
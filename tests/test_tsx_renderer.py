@@ -0,0 +1,22 @@
+import os
+
+from utils import tsx_renderer
+
+
+def test_stale_bundle_cleanup_spares_temp_files_and_other_decks(tmp_path, monkeypatch):
+    monkeypatch.setattr(tsx_renderer, "BUNDLE_CACHE_DIR", str(tmp_path))
+    names = ["deck.aaaa.js", "deck.aaaa.css", "deck.bbbb.js", "deck.bbbb.css", "deck.cccc.js.x1y2.tmp",
+             "deck-two.aaaa.js", "other.aaaa.css"]
+    for name in names:
+        (tmp_path / name).write_text("")
+    stale = sorted(os.path.basename(path) for path in tsx_renderer._stale_bundles("deck", "bbbb"))
+    assert stale == ["deck.aaaa.css", "deck.aaaa.js"]
+
+
+def test_atomic_writes_use_their_own_temp_file(tmp_path):
+    path = str(tmp_path / "deck.aaaa.js")
+    tsx_renderer._write_atomic(path, "first")
+    tsx_renderer._write_atomic(path, "second")
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == "second"
+    assert os.listdir(tmp_path) == ["deck.aaaa.js"]